@@ -3,8 +3,10 @@ StarGuard AI Mobile - Medicare Advantage Intelligence Platform
 Main application entry point with hamburger menu sidebar navigation
 """
 
+import asyncio
 import logging
 import os
+import time
 from pathlib import Path
 
 import pandas as pd
@@ -19,17 +21,33 @@ from starguard_core.auth import (
 )
 
 APP_NAME = "StarGuardMobile"
+from gap_data_layer import (
+    RankedGapFeedCalc,
+    SharedVersion,
+    forecast_snapshot_calc,
+    gap_snapshot_calc,
+)
+from gap_recommendation import (
+    API_KEY_MISSING_MSG,
+    build_gap_prompt,
+    describe_anthropic_error,
+    gap_rec_cache,
+    generate_batch_recommendations,
+    get_async_client,
+    stream_gap_recommendation,
+)
 from hedis_gap_ui import hedis_gap_panel
+from shared_data_cache import FORECASTS_KEY, GAPS_KEY, shared_cache
 from shiny import App, reactive, render, ui
 from star_rating_cache import (
     StarRatingCacheDB,
     cache_forecast,
-    fetch_cache_summary,
-    fetch_forecast_history,
-    fetch_latest_forecast,
-    star_label,
+    select_forecast_history,
+    select_latest_forecast,
+    summarize_forecast_snapshot,
 )
 from star_rating_cache_ui import star_rating_cache_panel
+from star_thresholds import star_label
 from utils.theme_config import get_mobile_css, get_mobile_meta, get_theme
 
 from cloud_status_badge import cloud_status_css, provenance_footer, starguard_mobile_badge
@@ -37,14 +55,20 @@ from hedis_gap_trail import (
     HedisGapDB,
     add_gap_suppression,
     close_hedis_gap,
-    fetch_gap_summary,
-    fetch_hedis_gaps,
     get_gap_suppressions,
-    push_hedis_gap,
     remove_gap_suppression,
+    select_gap_rows,
+    select_open_gap_records,
+    summarize_gap_snapshot,
+    update_gap_recommendations,
     write_gap_trail,
 )
 from hitl_admin_view import hitl_admin_panel
+from intervention_optimizer import (
+    PANEL_ROWS,
+    intervention_optimizer_panel,
+    intervention_optimizer_rows,
+)
 from pages.ai_validation import ai_validation_server, ai_validation_ui
 from pages.care_gap_workflow import care_gap_workflow_server, care_gap_workflow_ui
 from pages.executive_dashboard import executive_dashboard_server, executive_dashboard_ui
@@ -315,6 +339,14 @@ app_ui = ui.page_fluid(
                         if (ta) ta.value = v;
                         try { Shiny.setInputValue('gap_claude_rec', v); } catch(e) {}
                     });
+                    Shiny.addCustomMessageHandler('gap_rec_status', function(msg) {
+                        var el = document.getElementById('gap_rec_status');
+                        if (el) el.textContent = (msg && msg.value) || '';
+                    });
+                    Shiny.addCustomMessageHandler('gap_batch_progress', function(msg) {
+                        var el = document.getElementById('gap_batch_progress');
+                        if (el) el.textContent = (msg && msg.value) || '';
+                    });
                 }
             })();
         """),
@@ -375,6 +407,20 @@ def server(input, output, session):
     # ── HEDIS Gap Refresh (Google Sheets cloud) ───
     _gap_push_result = reactive.Value(None)
     _gap_close_result = reactive.Value(None)
+    # Gap data is shared by every session (shared_data_cache). Writes invalidate it;
+    # gap_version.changed() re-reads this session right after its own write, the
+    # shared poll picks up writes made in other sessions (one render per write).
+    gap_version = SharedVersion(GAPS_KEY)
+    gap_snapshot = gap_snapshot_calc(hedis_db, gap_version)
+    # Ranked open-gap feed for the intervention optimizer: one ranking per data
+    # version; this session's pushes/closes patch it instead of re-ranking
+    gap_feed = RankedGapFeedCalc(hedis_db, gap_version)
+
+    @reactive.effect
+    @reactive.event(input.btn_refresh_gaps)
+    def _refresh_gaps():
+        shared_cache.invalidate(GAPS_KEY)
+        gap_version.changed()
 
     @output
     @render.text
@@ -391,9 +437,7 @@ def server(input, output, session):
     def hedis_kpi_cards():
         if input.page_nav() != "hedisgaps":
             return ui.div()
-        input.btn_refresh_gaps()
-        input.btn_push_gap()
-        s = fetch_gap_summary(hedis_db)
+        s = summarize_gap_snapshot(gap_snapshot())
         if "error" in s:
             return ui.div(f"⚠ {s['error']}", style="color:#f87171;font-size:12px;")
         return ui.div(
@@ -425,58 +469,161 @@ def server(input, output, session):
             class_="kpi-row",
         )
 
+    # ── Claude gap recommendation (streamed, cancellable) ───
+    @reactive.extended_task
+    async def _gap_rec_stream(prompt):
+        started = time.perf_counter()
+        first_token_ms = None
+        rec = ""
+        try:
+            client = get_async_client(_ANTHROPIC_API_KEY)
+            async for rec in stream_gap_recommendation(prompt, client):
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                    await session.send_custom_message(
+                        "gap_rec_status", {"value": f"First token in {first_token_ms:,.0f} ms"}
+                    )
+                await session.send_custom_message("gap_set_rec", {"value": rec})
+        except asyncio.CancelledError:
+            await session.send_custom_message("gap_rec_status", {"value": "Generation cancelled"})
+            raise
+        except Exception as e:
+            log.error("Anthropic call failed: %r", e, exc_info=True)
+            await session.send_custom_message(
+                "gap_set_rec", {"value": f"Error: {describe_anthropic_error(e)}"}
+            )
+            await session.send_custom_message("gap_rec_status", {"value": ""})
+            return ""
+        if first_token_ms is not None:
+            elapsed = time.perf_counter() - started
+            gap_rec_cache.put(prompt, rec, latency_ms=elapsed * 1000)
+            await session.send_custom_message(
+                "gap_rec_status",
+                {"value": f"First token in {first_token_ms:,.0f} ms · done in {elapsed:.1f} s"},
+            )
+        return rec
+
     @reactive.effect
     @reactive.event(input.btn_generate_gap_rec)
-    def _generate_gap_rec():
+    async def _generate_gap_rec():
         if input.page_nav() != "hedisgaps":
             return
+        prompt = build_gap_prompt(
+            member_id=input.gap_member_id() or "N/A",
+            member_name=input.gap_member_name() or "N/A",
+            measure_code=input.gap_measure_code() or "N/A",
+            intervention=input.gap_intervention() or "Outreach",
+            star_impact=input.gap_star_impact() or 3,
+        )
+        cached = gap_rec_cache.get(prompt)
+        if cached is not None:
+            _gap_rec_stream.cancel()
+            ui.update_text_area("gap_claude_rec", value=cached)
+            st = gap_rec_cache.stats()
+            await session.send_custom_message(
+                "gap_rec_status",
+                {
+                    "value": f"⚡ Cached — hit rate {st['hit_rate']:.0%} "
+                    f"({st['hits']}/{st['hits'] + st['misses']}) · "
+                    f"~{st['saved_tokens']:,} tokens, {st['saved_seconds']:.1f} s saved"
+                },
+            )
+            return
+        if not _ANTHROPIC_API_KEY:
+            ui.update_text_area("gap_claude_rec", value=f"Error: {API_KEY_MISSING_MSG}")
+            return
         ui.update_text_area("gap_claude_rec", value="⏳ Claude is generating...")
-        try:
-            import anthropic
+        # Latest click wins — drop any stream still in flight before starting a new one
+        _gap_rec_stream.cancel()
+        _gap_rec_stream.invoke(prompt)
 
-            if not _ANTHROPIC_API_KEY:
-                ui.update_text_area(
-                    "gap_claude_rec",
-                    value="Error: ANTHROPIC_API_KEY not set. Add to .env or Space secrets.",
-                )
-                return
-
-            client = anthropic.Anthropic(api_key=_ANTHROPIC_API_KEY)
-            member_id = input.gap_member_id() or "N/A"
-            member_name = input.gap_member_name() or "N/A"
-            measure_code = input.gap_measure_code() or "N/A"
-            intervention = input.gap_intervention() or "Outreach"
-            star_impact = input.gap_star_impact() or 3
-            prompt = f"""Generate a concise care gap recommendation (2-4 sentences) for:
-Member: {member_id} — {member_name}
-HEDIS Measure: {measure_code}
-Intervention: {intervention}
-Star Impact: {star_impact}
-
-Write a practical, actionable recommendation for closing this gap. Return only the text, no preamble."""
-            resp = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}],
+    @reactive.effect
+    @reactive.event(input.page_nav)
+    def _cancel_gap_rec_on_leave():
+        if input.page_nav() != "hedisgaps":
+            _gap_rec_stream.cancel()
+
+    # ── Batch Claude recommendations for open gaps ───
+    @reactive.extended_task
+    async def _gap_batch_task(gaps):
+        async def _progress(p):
+            mark = "✅" if p["success"] else "❌"
+            await session.send_custom_message(
+                "gap_batch_progress",
+                {
+                    "value": f"{p['done']}/{p['total']} done · {p['failed']} failed "
+                    f"· last {mark} {p['gap_id']}"
+                },
+            )
+
+        results = await generate_batch_recommendations(
+            gaps, get_async_client(_ANTHROPIC_API_KEY), on_progress=_progress
+        )
+        recs = {r["gap_id"]: r["recommendation"] for r in results if r["success"]}
+        write = await asyncio.to_thread(update_gap_recommendations, hedis_db, recs)
+        return {"results": results, "write": write}
+
+    @reactive.effect
+    def _gap_batch_written():
+        if _gap_batch_task.status() == "success":
+            gap_version.changed()
+
+    @reactive.effect
+    @reactive.event(input.btn_batch_gap_rec)
+    async def _batch_gap_rec():
+        if input.page_nav() != "hedisgaps":
+            return
+        if not _ANTHROPIC_API_KEY:
+            await session.send_custom_message(
+                "gap_batch_progress", {"value": f"Error: {API_KEY_MISSING_MSG}"}
+            )
+            return
+        gaps = select_open_gap_records(
+            gap_snapshot(), filter_measure=input.gap_filter_measure() or "ALL"
+        )
+        if gaps.empty or "gap_id" not in gaps.columns:
+            await session.send_custom_message(
+                "gap_batch_progress", {"value": "No open gaps to generate for."}
             )
-            rec = resp.content[0].text.strip() if resp.content else ""
-            ui.update_text_area("gap_claude_rec", value=rec)
+            return
+        await session.send_custom_message(
+            "gap_batch_progress", {"value": f"⏳ 0/{len(gaps)} done"}
+        )
+        _gap_batch_task.invoke(gaps)
+
+    @output
+    @render.ui
+    def gap_batch_result():
+        if input.page_nav() != "hedisgaps":
+            return ui.div()
+        status = _gap_batch_task.status()
+        if status in ("initial", "running"):
+            return ui.div()
+        if status == "cancelled":
+            return ui.div("❌ Batch cancelled", class_="gap-push-error")
+        try:
+            out = _gap_batch_task.result()
         except Exception as e:
-            log.error("Anthropic call failed: %r", e, exc_info=True)
-            err_msg = str(e)
-            err_lower = err_msg.lower()
-            is_auth_error = type(e).__name__ == "AuthenticationError" and (
-                type(e).__module__ or ""
-            ).startswith("anthropic")
-            if is_auth_error or (
-                "api_key" in err_lower
-                and any(
-                    phrase in err_lower
-                    for phrase in ("must be set", "not set", "required", "provide an api key")
-                )
-            ):
-                err_msg = "ANTHROPIC_API_KEY not set. Add to .env or Space secrets."
-            ui.update_text_area("gap_claude_rec", value=f"Error: {err_msg}")
+            return ui.div(f"❌ {e}", class_="gap-push-error")
+        failed = [r for r in out["results"] if not r["success"]]
+        write = out["write"]
+        if not write.get("success"):
+            return ui.div(f"❌ Sheet update failed: {write.get('error', '')}", class_="gap-push-error")
+        cached = sum(1 for r in out["results"] if r["cached"])
+        return ui.div(
+            ui.div(
+                f"✅ {write['updated']} recommendations written ({cached} from cache)",
+                class_="gap-push-success",
+            ),
+            *[
+                ui.div(f"❌ {r['gap_id']}: {r['error']}", class_="gap-push-error")
+                for r in failed
+            ],
+            *[
+                ui.div(f"❌ {gid}: not found in sheet", class_="gap-push-error")
+                for gid in write.get("missing", [])
+            ],
+        )
 
     @reactive.effect
     @reactive.event(input.btn_push_gap)
@@ -501,7 +648,11 @@ Write a practical, actionable recommendation for closing this gap. Return only t
             "roi_estimate": input.gap_roi() or 0,
             "claude_recommendation": input.gap_claude_rec() or "",
         }
-        _gap_push_result.set(write_gap_trail(api_key, hedis_db, record, APP_NAME))
+        r = write_gap_trail(api_key, hedis_db, record, APP_NAME)
+        if r.get("success"):
+            gap_feed.pushed({**record, "gap_id": r["gap_id"], "measure_name": r["measure_name"]})
+        _gap_push_result.set(r)
+        gap_version.changed()
 
     @output
     @render.ui
@@ -521,12 +672,9 @@ Write a practical, actionable recommendation for closing this gap. Return only t
     @output
     @render.data_frame
     def hedis_gap_table():
-        input.btn_refresh_gaps()
-        input.btn_push_gap()
-        input.btn_close_gap()
         return render.DataGrid(
-            fetch_hedis_gaps(
-                hedis_db,
+            select_gap_rows(
+                gap_snapshot(),
                 n=15,
                 filter_status=input.gap_filter_status() or "ALL",
                 filter_measure=input.gap_filter_measure() or "ALL",
@@ -539,7 +687,10 @@ Write a practical, actionable recommendation for closing this gap. Return only t
     @reactive.event(input.btn_close_gap)
     def _close_gap():
         r = close_hedis_gap(hedis_db, input.gap_id_close() or "")
+        if r.get("success"):
+            gap_feed.closed(r["gap_id"])
         _gap_close_result.set(r)
+        gap_version.changed()
 
     @output
     @render.ui
@@ -553,6 +704,25 @@ Write a practical, actionable recommendation for closing this gap. Return only t
             return ui.div(f"✅ {r.get('gap_id', '')} → CLOSED", class_="gap-push-success")
         return ui.div(f"❌ {r.get('error', '')}", class_="gap-push-error")
 
+    # ── Intervention Portfolio Optimizer (ranked open gaps) ───
+    @output
+    @render.ui
+    def intervention_optimizer_table():
+        if input.page_nav() != "hedisgaps":
+            return ui.div()
+        return intervention_optimizer_rows(gap_feed(), PANEL_ROWS)
+
+    @output
+    @render.text
+    def intervention_optimizer_status():
+        if input.page_nav() != "hedisgaps":
+            return ""
+        feed = gap_feed()
+        if feed.error:
+            return ""
+        shown = min(PANEL_ROWS, len(feed.rows))
+        return f"Top {shown} of {feed.open_count} open gaps (suppression applied)"
+
     # ── HITL Admin - Gap Suppressions (Phase 2) ───
     _hitl_gap_add_result = reactive.Value(None)
     _hitl_gap_remove_result = reactive.Value(None)
@@ -638,6 +808,14 @@ Write a practical, actionable recommendation for closing this gap. Return only t
 
     # ── Star Rating Forecast Cache (Google Sheets) ───
     _cache_push_val = reactive.Value(None)
+    forecast_version = SharedVersion(FORECASTS_KEY)
+    forecast_snapshot = forecast_snapshot_calc(star_cache_db, forecast_version)
+
+    @reactive.effect
+    @reactive.event(input.btn_refresh_cache, input.btn_load_history)
+    def _refresh_forecasts():
+        shared_cache.invalidate(FORECASTS_KEY)
+        forecast_version.changed()
 
     @output
     @render.text
@@ -654,9 +832,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
     def cache_freshness_banner():
         if input.page_nav() != "starcache":
             return ui.div()
-        input.btn_refresh_cache()
-        input.btn_cache_forecast()
-        latest = fetch_latest_forecast(star_cache_db)
+        latest = select_latest_forecast(forecast_snapshot())
         if latest is None:
             return ui.div(
                 "📭 No forecasts cached yet — run your first forecast below.",
@@ -672,9 +848,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
     def forecast_hero_card():
         if input.page_nav() != "starcache":
             return ui.div()
-        input.btn_refresh_cache()
-        input.btn_cache_forecast()
-        latest = fetch_latest_forecast(star_cache_db)
+        latest = select_latest_forecast(forecast_snapshot())
         if latest is None:
             return ui.div()
         current = float(latest.get("current_star_rating", 0))
@@ -718,9 +892,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
     def star_cache_kpi_row():
         if input.page_nav() != "starcache":
             return ui.div()
-        input.btn_refresh_cache()
-        input.btn_cache_forecast()
-        s = fetch_cache_summary(star_cache_db)
+        s = summarize_forecast_snapshot(forecast_snapshot())
         if not s or "error" in s:
             return ui.div()
         delta_class = "star-kpi-delta-pos" if s.get("avg_delta", 0) >= 0 else "star-kpi-delta-neg"
@@ -781,6 +953,7 @@ Write a practical, actionable recommendation for closing this gap. Return only t
             "cached_by": "StarGuard AI — Robert Reichert",
         }
         _cache_push_val.set(cache_forecast(star_cache_db, forecast))
+        forecast_version.changed()
 
     @output
     @render.ui
@@ -803,11 +976,9 @@ Write a practical, actionable recommendation for closing this gap. Return only t
     def forecast_history_table():
         if input.page_nav() != "starcache":
             return render.DataGrid(pd.DataFrame(), width="100%", height="300px")
-        input.btn_load_history()
-        input.btn_cache_forecast()
         return render.DataGrid(
-            fetch_forecast_history(
-                star_cache_db, contract_id=input.fcst_filter_contract() or "", n=12
+            select_forecast_history(
+                forecast_snapshot(), contract_id=input.fcst_filter_contract() or "", n=12
             ),
             width="100%",
             height="300px",
@@ -833,7 +1004,10 @@ Write a practical, actionable recommendation for closing this gap. Return only t
             return ui.div(hedis_analyzer_ui(), id="hedis-analyzer-page")
         elif page == "hedisgaps":
             return ui.div(
-                suppression_banner(app_type="gap"), hedis_gap_panel(), id="hedis-gaps-cloud-page"
+                suppression_banner(app_type="gap"),
+                hedis_gap_panel(),
+                intervention_optimizer_panel(hedis_db),
+                id="hedis-gaps-cloud-page",
             )
         elif page == "adminview":
             return ui.div(
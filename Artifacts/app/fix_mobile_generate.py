@@ -73,26 +73,31 @@ SERVER_INSERT = '''
             return
         session.send_custom_message("gap_show_loading", {})
         try:
-            import anthropic
-            client = anthropic.Anthropic()
-            member_id = input.gap_member_id() or "N/A"
-            member_name = input.gap_member_name() or "N/A"
-            measure_code = input.gap_measure_code() or "N/A"
-            intervention = input.gap_intervention() or "Outreach"
-            star_impact = input.gap_star_impact() or 3
-            prompt = f"""Generate a concise care gap recommendation (2-4 sentences) for:
-Member: {member_id} — {member_name}
-HEDIS Measure: {measure_code}
-Intervention: {intervention}
-Star Impact: {star_impact}
-
-Write a practical, actionable recommendation for closing this gap. Return only the text, no preamble."""
-            resp = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}],
+            from gap_recommendation import (
+                GAP_REC_MAX_TOKENS,
+                GAP_REC_MODEL,
+                build_gap_prompt,
+                gap_rec_cache,
             )
-            rec = resp.content[0].text.strip() if resp.content else ""
+
+            prompt = build_gap_prompt(
+                member_id=input.gap_member_id() or "N/A",
+                member_name=input.gap_member_name() or "N/A",
+                measure_code=input.gap_measure_code() or "N/A",
+                intervention=input.gap_intervention() or "Outreach",
+                star_impact=input.gap_star_impact() or 3,
+            )
+            rec = gap_rec_cache.get(prompt)
+            if rec is None:
+                import anthropic
+                client = anthropic.Anthropic()
+                resp = client.messages.create(
+                    model=GAP_REC_MODEL,
+                    max_tokens=GAP_REC_MAX_TOKENS,
+                    messages=[{"role": "user", "content": prompt}],
+                )
+                rec = resp.content[0].text.strip() if resp.content else ""
+                gap_rec_cache.put(prompt, rec)
             ui.update_text_area("gap_claude_rec", value=rec)
         except Exception as e:
             err_msg = str(e)
@@ -0,0 +1,163 @@
+# gap_data_layer.py
+# ─────────────────────────────────────────────────────────────
+# Gap + Forecast Data Layer — one fetch per data change, all sessions
+# StarGuard Mobile | reichert-science-intelligence
+# Session calcs read the process-level shared_data_cache; writes in any
+# session bump its version and every session's poll refreshes reactively
+# RankedGapFeedCalc: intervention-optimizer feed, one ranking per version,
+# patched (not re-ranked) after this session's own pushes and closes
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+from collections.abc import Callable
+from typing import Any
+
+from shared_data_cache import FORECASTS_KEY, GAPS_KEY, SharedDataCache, shared_cache
+from shiny import reactive
+from star_rating_cache import StarRatingCacheDB, load_forecast_snapshot
+
+from hedis_gap_trail import HedisGapDB, load_gap_snapshot
+from intervention_optimizer import PANEL_ROWS, RankedGapFeed, ranked_gap_feed
+
+VERSION_POLL_SECONDS = 1.0
+
+
+class SharedVersion:
+    """
+    Session trigger for one shared-cache key.
+
+    Fires when another session invalidates `key` (checked every
+    interval_secs; the check is a dict lookup, so polling is effectively
+    free) and when this session calls changed() after its own write or
+    refresh. The version this session changed itself is recorded, so the
+    poll does not fire a second render for the same write.
+    interval_secs=None disables the timer; check() then runs on demand.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        cache: SharedDataCache = shared_cache,
+        interval_secs: float | None = VERSION_POLL_SECONDS,
+    ) -> None:
+        self._key = key
+        self._cache = cache
+        self._seen = cache.version(key)
+        self._others = reactive.Value(0)
+        self._local = reactive.Value(0)
+        if interval_secs is not None:
+
+            @reactive.effect
+            def _poll() -> None:
+                reactive.invalidate_later(interval_secs)
+                self.check()
+
+    def __call__(self) -> tuple[int, int]:
+        return self._others(), self._local()
+
+    def check(self) -> None:
+        """Fire if the shared version moved since this session last saw it."""
+        version = self._cache.version(self._key)
+        if version != self._seen:
+            self._seen = version
+            with reactive.isolate():
+                self._others.set(self._others() + 1)
+
+    def changed(self) -> None:
+        """This session wrote (or refreshed) the data: re-read once, now."""
+        self._seen = self._cache.version(self._key)
+        with reactive.isolate():
+            self._local.set(self._local() + 1)
+
+
+def gap_snapshot_calc(
+    db: HedisGapDB, *triggers: Callable[[], object], cache: SharedDataCache = shared_cache
+) -> Callable[[], dict[str, Any]]:
+    """
+    Session-scoped reactive.calc over the shared gap snapshot.
+    Re-evaluates when one of `triggers` fires (usually a SharedVersion);
+    every output reading it in the same flush shares one
+    evaluation, and every session shares one load per data version.
+    """
+
+    @reactive.calc
+    def _gap_snapshot() -> dict[str, Any]:
+        for trigger in triggers:
+            trigger()
+        snapshot: dict[str, Any] = cache.get(GAPS_KEY, lambda: load_gap_snapshot(db))
+        return snapshot
+
+    return _gap_snapshot
+
+
+def forecast_snapshot_calc(
+    db: StarRatingCacheDB, *triggers: Callable[[], object], cache: SharedDataCache = shared_cache
+) -> Callable[[], dict[str, Any]]:
+    """Star forecast counterpart of gap_snapshot_calc."""
+
+    @reactive.calc
+    def _forecast_snapshot() -> dict[str, Any]:
+        for trigger in triggers:
+            trigger()
+        snapshot: dict[str, Any] = cache.get(FORECASTS_KEY, lambda: load_forecast_snapshot(db))
+        return snapshot
+
+    return _forecast_snapshot
+
+
+class RankedGapFeedCalc:
+    """
+    Session-scoped reactive feed of ranked open gaps (intervention optimizer).
+
+    Reading it returns the shared RankedGapFeed for the current data version
+    (built once per version across sessions). After a successful write in
+    this session call pushed()/closed(): if that write is the only change
+    since the feed was built, the feed is patched and tagged with the new
+    version, so re-rendering skips both the reload and the re-ranking.
+    A close that would leave the panel short of rows while other gaps are
+    still open is not patched; the feed is re-ranked from the snapshot instead.
+    """
+
+    def __init__(
+        self, db: HedisGapDB, *triggers: Callable[[], object], cache: SharedDataCache = shared_cache
+    ) -> None:
+        self._cache = cache
+        self._patched: reactive.Value[RankedGapFeed | None] = reactive.Value(None)
+        self._last: RankedGapFeed | None = None
+
+        @reactive.calc
+        def _feed() -> RankedGapFeed:
+            for trigger in triggers:
+                trigger()
+            patched = self._patched()
+            version = cache.version(GAPS_KEY)
+            if patched is not None and patched.version == version:
+                feed = patched
+            else:
+                snapshot = cache.get(GAPS_KEY, lambda: load_gap_snapshot(db))
+                feed = ranked_gap_feed(snapshot, version)
+            self._last = feed
+            return feed
+
+        self._feed = _feed
+
+    def __call__(self) -> RankedGapFeed:
+        return self._feed()
+
+    def _patch(self, update: Callable[[RankedGapFeed, int], RankedGapFeed]) -> None:
+        last = self._last
+        version = self._cache.version(GAPS_KEY)
+        # Any other write since `last` was built means it must be rebuilt
+        if last is not None and version == last.version + 1:
+            feed = update(last, version)
+            # The feed only holds the top FEED_SIZE gaps, so it cannot backfill
+            if len(feed.rows) >= min(PANEL_ROWS, feed.open_count):
+                self._patched.set(feed)
+
+    def pushed(self, record: dict[str, Any]) -> None:
+        """Record a gap this session pushed (needs gap_id)."""
+        self._patch(lambda feed, version: feed.pushed(record, version))
+
+    def closed(self, gap_id: str) -> None:
+        """Record a gap this session closed."""
+        self._patch(lambda feed, version: feed.closed(gap_id, version))
@@ -0,0 +1,357 @@
+# gap_recommendation.py
+# ─────────────────────────────────────────────────────────────
+# Claude Gap Recommendation — shared async client + streaming
+# StarGuard Mobile | reichert-science-intelligence
+# One AsyncAnthropic client per process; text streamed as it arrives
+# Prompt-hash cache (TTL + LRU, memory + JSON on disk) skips repeat calls
+# Disk writes (new entries + hit recency) coalesced; flushed at exit
+# Batch mode: bounded-concurrency generation for a gap DataFrame
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import asyncio
+import atexit
+import hashlib
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import pandas as pd
+
+GAP_REC_MODEL = "claude-sonnet-4-20250514"
+GAP_REC_MAX_TOKENS = 300
+API_KEY_MISSING_MSG = "ANTHROPIC_API_KEY not set. Add to .env or Space secrets."
+
+_ASYNC_CLIENT: Any | None = None
+
+_REC_CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.environ.get("GAP_REC_CACHE_FILE", ".gap_rec_cache.json"),
+)
+_REC_CACHE_TTL_SECONDS = float(os.environ.get("GAP_REC_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+_REC_CACHE_MAX_ENTRIES = int(os.environ.get("GAP_REC_CACHE_MAX_ENTRIES", 2000))
+_REC_CACHE_FLUSH_SECONDS = float(os.environ.get("GAP_REC_CACHE_FLUSH_SECONDS", 5))
+BATCH_CONCURRENCY = int(os.environ.get("GAP_REC_BATCH_CONCURRENCY", 5))
+
+
+def build_gap_prompt(
+    member_id: str,
+    member_name: str,
+    measure_code: str,
+    intervention: str,
+    star_impact: Any,
+) -> str:
+    """Prompt for a single care gap recommendation (2–4 sentences)."""
+    return f"""Generate a concise care gap recommendation (2-4 sentences) for:
+Member: {member_id} — {member_name}
+HEDIS Measure: {measure_code}
+Intervention: {intervention}
+Star Impact: {star_impact}
+
+Write a practical, actionable recommendation for closing this gap. Return only the text, no preamble."""
+
+
+def get_async_client(api_key: str | None = None) -> Any:
+    """
+    Return the process-wide AsyncAnthropic client, creating it on first use.
+    Reusing one client keeps the HTTP connection pool warm across clicks.
+    """
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        import anthropic
+
+        _ASYNC_CLIENT = anthropic.AsyncAnthropic(
+            api_key=api_key or os.environ.get("ANTHROPIC_API_KEY")
+        )
+    return _ASYNC_CLIENT
+
+
+async def stream_gap_recommendation(prompt: str, client: Any | None = None) -> AsyncIterator[str]:
+    """
+    Stream a recommendation from Claude.
+    Yields the accumulated text after every delta, so callers can push it
+    straight into the textarea. Cancelling the consuming task closes the stream.
+    """
+    client = client or get_async_client()
+    text = ""
+    async with client.messages.stream(
+        model=GAP_REC_MODEL,
+        max_tokens=GAP_REC_MAX_TOKENS,
+        messages=[{"role": "user", "content": prompt}],
+    ) as stream:
+        async for delta in stream.text_stream:
+            text += delta
+            yield text.strip()
+
+
+def describe_anthropic_error(e: BaseException) -> str:
+    """User-facing message for a failed Claude call; auth problems collapse to one hint."""
+    err_msg = str(e)
+    err_lower = err_msg.lower()
+    is_auth_error = type(e).__name__ == "AuthenticationError" and (
+        type(e).__module__ or ""
+    ).startswith("anthropic")
+    if is_auth_error or (
+        "api_key" in err_lower
+        and any(
+            phrase in err_lower
+            for phrase in ("must be set", "not set", "required", "provide an api key")
+        )
+    ):
+        return API_KEY_MISSING_MSG
+    return err_msg
+
+
+# ─────────────────────────────────────────────────────────────
+# RECOMMENDATION CACHE
+# ─────────────────────────────────────────────────────────────
+
+
+def prompt_key(prompt: str, model: str = GAP_REC_MODEL, max_tokens: int = GAP_REC_MAX_TOKENS) -> str:
+    """Content address for a prompt: sha256 over model, token budget and prompt text."""
+    return hashlib.sha256(f"{model}\x1f{max_tokens}\x1f{prompt}".encode()).hexdigest()
+
+
+class RecommendationCache:
+    """
+    Prompt-hash keyed cache for Claude recommendations.
+    In-memory OrderedDict (LRU order) backed by a JSON file so entries
+    survive restarts. Entries older than ttl_seconds are treated as misses.
+    Hits and puts mark the store dirty; the file is rewritten at most once per
+    flush_seconds (plus flush() at exit), so hit recency survives restarts
+    without a full JSON rewrite per call.
+    Tracks hits, misses and the latency/tokens saved by hits.
+    """
+
+    def __init__(
+        self,
+        path: str | None = _REC_CACHE_FILE,
+        ttl_seconds: float = _REC_CACHE_TTL_SECONDS,
+        max_entries: int = _REC_CACHE_MAX_ENTRIES,
+        flush_seconds: float = _REC_CACHE_FLUSH_SECONDS,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.flush_seconds = flush_seconds
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self.saved_tokens = 0
+        self._entries: OrderedDict[str, dict[str, Any]] | None = None
+        self._dirty = False
+        self._flushed_at = float("-inf")
+
+    def _load(self) -> OrderedDict[str, dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+        entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    raw = json.load(f)
+                now = time.time()
+                for key, entry in sorted(raw.items(), key=lambda kv: kv[1].get("used", 0)):
+                    if now - entry.get("created", 0) < self.ttl_seconds:
+                        entries[key] = entry
+            except Exception:
+                entries = OrderedDict()
+        self._entries = entries
+        return entries
+
+    def _save(self) -> None:
+        self._flushed_at = time.monotonic()
+        self._dirty = False
+        if not self.path or self._entries is None:
+            return
+        try:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(dict(self._entries), f)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass  # disk store is best-effort; memory copy still serves hits
+
+    def _touch(self) -> None:
+        """Mark the store dirty; write through if the last write is flush_seconds old."""
+        self._dirty = True
+        if time.monotonic() - self._flushed_at >= self.flush_seconds:
+            self._save()
+
+    def flush(self) -> None:
+        """Write pending entries and hit recency to disk now."""
+        if self._dirty:
+            self._save()
+
+    def get(self, prompt: str) -> str | None:
+        """Return the cached recommendation for prompt, or None on miss/expiry."""
+        entries = self._load()
+        key = prompt_key(prompt)
+        entry = entries.get(key)
+        now = time.time()
+        if entry is None or now - entry["created"] >= self.ttl_seconds:
+            if entry is not None:
+                del entries[key]
+                self._touch()
+            self.misses += 1
+            return None
+        entry["used"] = now
+        entries.move_to_end(key)
+        self._touch()
+        self.hits += 1
+        self.saved_ms += entry.get("latency_ms", 0.0)
+        self.saved_tokens += entry.get("output_tokens", 0)
+        return str(entry["text"])
+
+    def put(self, prompt: str, text: str, latency_ms: float = 0.0) -> None:
+        """Store a recommendation; evicts least-recently-used entries past max_entries."""
+        if not text:
+            return
+        entries = self._load()
+        now = time.time()
+        key = prompt_key(prompt)
+        entries[key] = {
+            "text": text,
+            "created": now,
+            "used": now,
+            "latency_ms": round(latency_ms, 1),
+            # ~4 characters per token — estimate for savings reporting only
+            "output_tokens": max(1, len(text) // 4),
+        }
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        self._touch()
+
+    def clear(self) -> None:
+        self._entries = OrderedDict()
+        self._save()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._load()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_seconds": round(self.saved_ms / 1000, 1),
+            "saved_tokens": self.saved_tokens,
+        }
+
+
+gap_rec_cache = RecommendationCache()
+atexit.register(gap_rec_cache.flush)
+
+
+# ─────────────────────────────────────────────────────────────
+# BATCH GENERATION
+# ─────────────────────────────────────────────────────────────
+
+
+def _star_impact(value: Any) -> int:
+    """Whole-star impact as the single-gap form sends it; 3 when missing or not a number."""
+    try:
+        impact = float(value)
+    except (TypeError, ValueError):
+        return 3
+    return int(impact) if math.isfinite(impact) and impact else 3
+
+
+def gap_prompt_from_row(row: dict[str, Any]) -> str:
+    """
+    build_gap_prompt for a gap snapshot row; missing fields use the single-gap
+    defaults, so the same gap gets the same prompt (and cache key) either way.
+    """
+    return build_gap_prompt(
+        member_id=row.get("member_id") or "N/A",
+        member_name=row.get("member_name") or "N/A",
+        measure_code=row.get("measure_code") or "N/A",
+        intervention=row.get("intervention_type") or "Outreach",
+        star_impact=_star_impact(row.get("star_impact")),
+    )
+
+
+async def generate_recommendation(prompt: str, client: Any | None = None) -> str:
+    """Single non-streamed recommendation (batch path)."""
+    client = client or get_async_client()
+    resp = await client.messages.create(
+        model=GAP_REC_MODEL,
+        max_tokens=GAP_REC_MAX_TOKENS,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return resp.content[0].text.strip() if resp.content else ""
+
+
+async def generate_batch_recommendations(
+    gaps: pd.DataFrame,
+    client: Any | None = None,
+    concurrency: int = BATCH_CONCURRENCY,
+    on_progress: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    cache: RecommendationCache | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Generate recommendations for every row of a gap DataFrame.
+    At most `concurrency` Claude requests are in flight at once; cache hits
+    skip the call. One failed gap never aborts the batch.
+
+    Returns one result per gap in input order:
+        { gap_id, success, recommendation, error, cached }
+    on_progress receives { done, total, failed, gap_id, success, error } after each gap.
+    """
+    if gaps.empty or "gap_id" not in gaps.columns:
+        return []
+    cache = cache if cache is not None else gap_rec_cache
+    rows = gaps.to_dict("records")
+    total = len(rows)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    counts = {"done": 0, "failed": 0}
+
+    async def _one(row: dict[str, Any]) -> dict[str, Any]:
+        gap_id = str(row["gap_id"])
+        prompt = gap_prompt_from_row(row)
+        result: dict[str, Any] = {
+            "gap_id": gap_id,
+            "success": False,
+            "recommendation": "",
+            "error": None,
+            "cached": False,
+        }
+        cached = cache.get(prompt)
+        if cached is not None:
+            result.update(success=True, recommendation=cached, cached=True)
+        else:
+            async with sem:
+                started = time.perf_counter()
+                try:
+                    rec = await generate_recommendation(prompt, client)
+                    if not rec:
+                        raise ValueError("Empty response")
+                    cache.put(prompt, rec, latency_ms=(time.perf_counter() - started) * 1000)
+                    result.update(success=True, recommendation=rec)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    result["error"] = describe_anthropic_error(e)
+        counts["done"] += 1
+        counts["failed"] += 0 if result["success"] else 1
+        if on_progress is not None:
+            await on_progress(
+                {
+                    "done": counts["done"],
+                    "total": total,
+                    "failed": counts["failed"],
+                    "gap_id": gap_id,
+                    "success": result["success"],
+                    "error": result["error"],
+                }
+            )
+        return result
+
+    try:
+        return list(await asyncio.gather(*(_one(r) for r in rows)))
+    finally:
+        cache.flush()
@@ -15,6 +15,8 @@ from typing import Any
 import gspread
 import pandas as pd
 from google.oauth2.service_account import Credentials
+from measure_catalog import get_measure_catalog
+from shared_data_cache import GAPS_KEY, shared_cache
 
 try:
     from supabase import create_client
@@ -45,18 +47,13 @@ HEDIS_COLUMNS = [
 ]
 
 # ── Care Domain Map ───────────────────────────────────────────
-HEDIS_MEASURES = {
-    "CBP": ("Controlling Blood Pressure", "Effectiveness"),
-    "CDC": ("Diabetes Care", "Effectiveness"),
-    "W34": ("Well-Child Visits", "Effectiveness"),
-    "AWC": ("Annual Wellness Check", "Effectiveness"),
-    "FUH": ("Follow-Up After Hospitalization", "Effectiveness"),
-    "PCE": ("Pharmacotherapy for COPD", "Effectiveness"),
-    "MPM": ("Medication Management", "Effectiveness"),
-    "COA": ("Care of Older Adults", "Effectiveness"),
-    "GSD": ("Statin Use — Diabetes", "Effectiveness"),
-    "BCS": ("Breast Cancer Screening", "Effectiveness"),
-    "COL": ("Colorectal Cancer Screening", "Effectiveness"),
+# {code: (measure_name, care_domain)} — derived from the shared measure catalog
+_CATALOG = get_measure_catalog()
+HEDIS_MEASURES: dict[str, tuple[str, str]] = {
+    str(code): (str(name), str(domain))
+    for code, name, domain in zip(
+        _CATALOG.codes, _CATALOG.column("name"), _CATALOG.column("care_domain"), strict=True
+    )
 }
 
 
@@ -199,6 +196,7 @@ def push_hedis_gap(db: HedisGapDB, record: dict[str, Any]) -> dict[str, Any]:
             return {"success": False, "error": "Sheet not initialized"}
         db.sheet.append_row(row)
         db.record_count += 1
+        shared_cache.invalidate(GAPS_KEY)
 
         # Phase 1: Supabase parallel write (fire-and-forget)
         _push_gap_to_supabase(row)
@@ -275,6 +273,7 @@ def _save_gap_suppressions(rules: list[dict[str, Any]]) -> None:
     """Persist suppression rules to JSON."""
     global _GAP_SUPPRESSIONS_CACHE
     _GAP_SUPPRESSIONS_CACHE = rules
+    shared_cache.invalidate(GAPS_KEY)
     try:
         with open(_SUPPRESSION_FILE, "w", encoding="utf-8") as f:
             json.dump(rules, f, indent=2)
@@ -320,23 +319,43 @@ def apply_gap_suppression_filter(df: pd.DataFrame) -> pd.DataFrame:
     return df[~df["gap_id"].isin(suppressed_ids)].reset_index(drop=True)
 
 
-def fetch_hedis_gaps(
-    db: HedisGapDB, n: int = 15, filter_status: str = "ALL", filter_measure: str = "ALL"
-) -> pd.DataFrame:
+_GAP_DISPLAY_COLUMNS = [
+    "gap_id",
+    "member_id",
+    "measure_code",
+    "measure_name",
+    "gap_status",
+    "due_date",
+    "star_impact",
+    "roi_estimate",
+    "intervention_type",
+]
+
+
+def load_gap_snapshot(db: HedisGapDB) -> dict[str, Any]:
     """
-    Pull gap records with optional filters.
-    filter_status: ALL | OPEN | CLOSED | EXCLUDED
-    filter_measure: ALL | CBP | CDC | W34 | etc.
+    Read every gap record once. All gap views (KPI row, table, batch) derive
+    from this snapshot instead of hitting the sheet separately.
+    Returns: { records: DataFrame, error: str | None }
     """
     if not db.connected or db.sheet is None:
-        return pd.DataFrame(columns=HEDIS_COLUMNS)
-
+        return {"records": pd.DataFrame(columns=HEDIS_COLUMNS), "error": None}
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
-        if df.empty:
-            return df
+        return {"records": pd.DataFrame(db.sheet.get_all_records()), "error": None}
+    except Exception as e:
+        return {"records": pd.DataFrame(columns=HEDIS_COLUMNS), "error": str(e)}
+
 
+def select_gap_rows(
+    snapshot: dict[str, Any], n: int = 15, filter_status: str = "ALL", filter_measure: str = "ALL"
+) -> pd.DataFrame:
+    """Filter, sort and trim a gap snapshot for display (suppression applied)."""
+    if snapshot["error"]:
+        return pd.DataFrame({"Error": [snapshot["error"]]})
+    df: pd.DataFrame = snapshot["records"]
+    if df.empty:
+        return df
+    try:
         if filter_status != "ALL":
             df = df[df["gap_status"] == filter_status]
         if filter_measure != "ALL":
@@ -344,18 +363,7 @@ def fetch_hedis_gaps(
 
         df = df.sort_values("timestamp", ascending=False).head(n)
 
-        display_cols = [
-            "gap_id",
-            "member_id",
-            "measure_code",
-            "measure_name",
-            "gap_status",
-            "due_date",
-            "star_impact",
-            "roi_estimate",
-            "intervention_type",
-        ]
-        available = [c for c in display_cols if c in df.columns]
+        available = [c for c in _GAP_DISPLAY_COLUMNS if c in df.columns]
         out = df[available].reset_index(drop=True)
         # Phase 2: apply suppression filter
         out = apply_gap_suppression_filter(out)
@@ -365,19 +373,34 @@ def fetch_hedis_gaps(
         return pd.DataFrame({"Error": [str(e)]})
 
 
-def fetch_gap_summary(db: HedisGapDB) -> dict[str, Any]:
+def select_open_gap_records(snapshot: dict[str, Any], filter_measure: str = "ALL") -> pd.DataFrame:
+    """
+    Full OPEN, unsuppressed gap records for batch generation. Unlike
+    select_gap_rows this keeps every column (member_name included) so batch
+    prompts match the single-gap prompt and share its cache entries.
+    """
+    if snapshot["error"]:
+        return pd.DataFrame({"Error": [snapshot["error"]]})
+    df: pd.DataFrame = snapshot["records"]
+    if df.empty or "gap_status" not in df.columns:
+        return df.iloc[:0]
+    df = df[df["gap_status"] == "OPEN"]
+    if filter_measure != "ALL":
+        df = df[df["measure_code"] == filter_measure]
+    return apply_gap_suppression_filter(df.reset_index(drop=True))
+
+
+def summarize_gap_snapshot(snapshot: dict[str, Any]) -> dict[str, Any]:
     """
     Aggregate summary stats for the dashboard KPI row.
     Returns: { total, open, closed, avg_star_impact, total_roi }
     """
-    if not db.connected or db.sheet is None:
+    if snapshot["error"]:
+        return {"error": snapshot["error"]}
+    df: pd.DataFrame = snapshot["records"]
+    if df.empty:
         return {"total": 0, "open": 0, "closed": 0, "avg_star_impact": 0.0, "total_roi": 0.0}
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
-        if df.empty:
-            return {"total": 0, "open": 0, "closed": 0, "avg_star_impact": 0.0, "total_roi": 0.0}
-
         return {
             "total": len(df),
             "open": len(df[df["gap_status"] == "OPEN"]),
@@ -389,6 +412,27 @@ def fetch_gap_summary(db: HedisGapDB) -> dict[str, Any]:
         return {"error": str(e)}
 
 
+def fetch_hedis_gaps(
+    db: HedisGapDB, n: int = 15, filter_status: str = "ALL", filter_measure: str = "ALL"
+) -> pd.DataFrame:
+    """
+    Pull gap records with optional filters.
+    filter_status: ALL | OPEN | CLOSED | EXCLUDED
+    filter_measure: ALL | CBP | CDC | W34 | etc.
+    """
+    if not db.connected or db.sheet is None:
+        return pd.DataFrame(columns=HEDIS_COLUMNS)
+    return select_gap_rows(load_gap_snapshot(db), n, filter_status, filter_measure)
+
+
+def fetch_gap_summary(db: HedisGapDB) -> dict[str, Any]:
+    """
+    Aggregate summary stats for the dashboard KPI row.
+    Returns: { total, open, closed, avg_star_impact, total_roi }
+    """
+    return summarize_gap_snapshot(load_gap_snapshot(db))
+
+
 def close_hedis_gap(db: HedisGapDB, gap_id: str) -> dict[str, Any]:
     """Mark a gap as CLOSED by gap_id."""
     if not db.connected or db.sheet is None:
@@ -402,6 +446,40 @@ def close_hedis_gap(db: HedisGapDB, gap_id: str) -> dict[str, Any]:
         updated_col = HEDIS_COLUMNS.index("last_updated") + 1
         db.sheet.update_cell(cell.row, status_col, "CLOSED")
         db.sheet.update_cell(cell.row, updated_col, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        shared_cache.invalidate(GAPS_KEY)
         return {"success": True, "gap_id": gap_id, "status": "CLOSED"}
     except Exception as e:
         return {"success": False, "error": str(e)}
+
+
+def update_gap_recommendations(db: HedisGapDB, recommendations: dict[str, str]) -> dict[str, Any]:
+    """
+    Write claude_recommendation for many gaps in one Sheets batch_update.
+    recommendations: { gap_id: text }. Unknown gap_ids are reported, not raised.
+    Returns: { success, updated, missing, error }
+    """
+    if not db.connected or db.sheet is None:
+        return {"success": False, "updated": 0, "missing": [], "error": "Cloud disconnected"}
+    if not recommendations:
+        return {"success": True, "updated": 0, "missing": [], "error": None}
+    try:
+        gap_ids = db.sheet.col_values(HEDIS_COLUMNS.index("gap_id") + 1)
+        row_of = {gid: i for i, gid in enumerate(gap_ids, start=1) if i > 1}
+        rec_col = HEDIS_COLUMNS.index("claude_recommendation") + 1
+        updated_col = HEDIS_COLUMNS.index("last_updated") + 1
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        updates: list[dict[str, Any]] = []
+        missing: list[str] = []
+        for gap_id, text in recommendations.items():
+            row = row_of.get(gap_id)
+            if row is None:
+                missing.append(gap_id)
+                continue
+            updates.append({"range": gspread.utils.rowcol_to_a1(row, rec_col), "values": [[text[:500]]]})
+            updates.append({"range": gspread.utils.rowcol_to_a1(row, updated_col), "values": [[now]]})
+        if updates:
+            db.sheet.batch_update(updates)
+            shared_cache.invalidate(GAPS_KEY)
+        return {"success": True, "updated": len(updates) // 2, "missing": missing, "error": None}
+    except Exception as e:
+        return {"success": False, "updated": 0, "missing": [], "error": str(e)}
@@ -70,6 +70,9 @@ def hedis_gap_css() -> ui.tags.style:
             margin-bottom: 12px;
         }
         .sync-live { color: #10b981; font-weight: 700; }
+        .gap-rec-status {
+            font-size: 11px; color: #94a3b8; margin-left: 10px;
+        }
     """)
 
 
@@ -131,6 +134,7 @@ def hedis_gap_panel() -> ui.div:
                     class_="btn btn-outline-primary btn-sm mb-2",
                     style="background:#4A3E8F; color:#fff; border-color:#D4AF37;",
                 ),
+                ui.span(id="gap_rec_status", class_="gap-rec-status"),
                 class_="gap-generate-row",
             ),
             ui.input_text_area(
@@ -164,6 +168,18 @@ def hedis_gap_panel() -> ui.div:
                 col_widths=[6, 6],
             ),
             ui.output_data_frame("hedis_gap_table"),
+            ui.div(
+                ui.input_action_button(
+                    "btn_batch_gap_rec",
+                    "🤖 Generate for All Open Gaps",
+                    class_="btn btn-outline-primary btn-sm",
+                    style="background:#4A3E8F; color:#fff; border-color:#D4AF37;",
+                ),
+                ui.span(id="gap_batch_progress", class_="gap-rec-status"),
+                class_="gap-generate-row",
+                style="margin-top:10px;",
+            ),
+            ui.output_ui("gap_batch_result"),
         ),
         # ── Close Gap ──
         ui.card(
@@ -2,30 +2,88 @@
 # ─────────────────────────────────────────────────────────────
 # Phase 2: Intervention Portfolio Optimizer — StarGuard Mobile
 # Ranks gaps by ROI × Star Impact; suggests optimal intervention mix
+# top_priority_gaps(): O(n) top-k (argpartition) over a score column cached
+# on the gap snapshot, so it is recomputed only when a push/close reloads it
+# RankedGapFeed: open, unsuppressed top gaps built once per data version and
+# patched in O(k) by this session's pushes and closes
+# select_interventions(): budget- and coordinator-capacity-constrained gap
+# selection (vectorized greedy ratio; exact DP for small candidate sets)
 # Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
 # ─────────────────────────────────────────────────────────────
 
+from typing import Any
 
+import numpy as np
 import pandas as pd
 from shiny import ui
 
 try:
-    from hedis_gap_trail import HedisGapDB, apply_gap_suppression_filter, fetch_hedis_gaps
+    from hedis_gap_trail import (
+        HedisGapDB,
+        apply_gap_suppression_filter,
+        fetch_hedis_gaps,
+        get_gap_suppressions,
+    )
 except ImportError:
     HedisGapDB = None
     fetch_hedis_gaps = None
+
     def apply_gap_suppression_filter(df):
         return df
 
+    def get_gap_suppressions():
+        return []
+
 
 def intervention_optimizer_css() -> ui.tags.style:
     return ui.tags.style("""
         .intervention-optimizer { padding: 16px; }
         .optimizer-score { color: #D4AF37; font-weight: 700; }
         .optimizer-priority { color: #10b981; }
+        .optimizer-row {
+            display: flex; justify-content: space-between; gap: 8px;
+            padding: 6px 0; border-bottom: 1px solid rgba(148, 163, 184, 0.2);
+            font-size: 12px;
+        }
+        .optimizer-meta { color: #94a3b8; font-size: 11px; }
     """)
 
 
+# Default cost ($) and coordinator time (hours) per intervention type;
+# per-gap `intervention_cost` / `coordinator_hours` columns override them
+INTERVENTION_COSTS = {"Outreach": 40.0, "Clinical": 150.0, "Administrative": 15.0}
+COORDINATOR_HOURS = {"Outreach": 0.5, "Clinical": 1.0, "Administrative": 0.25}
+DEFAULT_INTERVENTION = "Outreach"
+# Exact DP grid: $ and hours per cell, and the largest problem solved exactly
+COST_UNIT = 5.0
+HOUR_UNIT = 0.25
+DP_MAX_ITEMS = 60
+DP_MAX_CELLS = 250_000
+# Ranked rows kept per feed version, and rows shown in the panel
+FEED_SIZE = 100
+PANEL_ROWS = 15
+FEED_COLUMNS = [
+    "gap_id",
+    "member_id",
+    "measure_code",
+    "measure_name",
+    "intervention_type",
+    "due_date",
+    "star_impact",
+    "roi_estimate",
+]
+
+
+def priority_values(df: pd.DataFrame) -> np.ndarray:
+    """Intervention priority per gap: (star_impact/5) * (1 + roi_estimate/1000)."""
+    star = pd.to_numeric(df["star_impact"], errors="coerce").fillna(3).to_numpy(np.float64)
+    if "roi_estimate" in df.columns:
+        roi = pd.to_numeric(df["roi_estimate"], errors="coerce").fillna(0).to_numpy(np.float64)
+    else:
+        roi = np.zeros(len(df))
+    return (star / 5.0) * (1.0 + roi / 1000.0)
+
+
 def compute_priority_scores(df: pd.DataFrame) -> pd.DataFrame:
     """
     Compute intervention priority: (star_impact/5) * (1 + roi_estimate/1000)
@@ -34,12 +92,292 @@ def compute_priority_scores(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty or "star_impact" not in df.columns:
         return df
     df = df.copy()
-    star = pd.to_numeric(df["star_impact"], errors="coerce").fillna(3)
-    roi = pd.to_numeric(df.get("roi_estimate", 0), errors="coerce").fillna(0)
-    df["priority_score"] = (star / 5.0) * (1.0 + roi / 1000.0)
+    df["priority_score"] = priority_values(df)
     return df.sort_values("priority_score", ascending=False)
 
 
+def snapshot_priority_scores(snapshot: dict[str, Any]) -> np.ndarray:
+    """
+    Priority score per row of a gap snapshot (load_gap_snapshot), computed
+    once and kept on the snapshot. Pushes and closes invalidate the shared
+    snapshot, so the next load starts without scores.
+    """
+    scores = snapshot.get("priority_score")
+    if scores is None:
+        records: pd.DataFrame = snapshot["records"]
+        if records.empty or "star_impact" not in records.columns:
+            scores = np.zeros(len(records))
+        else:
+            scores = priority_values(records)
+        scores.flags.writeable = False
+        snapshot["priority_score"] = scores
+    return scores
+
+
+def top_priority_gaps(
+    df: pd.DataFrame,
+    k: int = 15,
+    scores: np.ndarray | None = None,
+    mask: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """
+    The k highest-priority rows of df, best first, with a priority_score
+    column. np.argpartition selects them in O(n) and only those k rows are
+    sorted and copied. scores: precomputed priority_values(df); mask: rows
+    eligible for ranking (e.g. open and not suppressed).
+    """
+    if df.empty or "star_impact" not in df.columns or k <= 0:
+        return df.iloc[:0]
+    scores = priority_values(df) if scores is None else scores
+    candidates = np.arange(len(df)) if mask is None else np.flatnonzero(mask)
+    if len(candidates) > k:
+        part = np.argpartition(-scores[candidates], k - 1)[:k]
+        candidates = candidates[part]
+    top = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return df.take(top).assign(priority_score=scores[top])
+
+
+class RankedGapFeed:
+    """
+    Open, unsuppressed gaps ranked by priority for one gap-data version.
+
+    from_snapshot() ranks the table once (top FEED_SIZE by argpartition over
+    the snapshot's cached scores). pushed()/closed() return a patched feed
+    for this session's own writes in O(k), without re-scoring the table.
+    Feeds are immutable; `version` is the shared-cache version they reflect.
+    """
+
+    def __init__(
+        self,
+        rows: pd.DataFrame,
+        open_ids: frozenset[str],
+        version: int,
+        error: str | None = None,
+        size: int = FEED_SIZE,
+        added: frozenset[str] = frozenset(),
+        removed: frozenset[str] = frozenset(),
+    ) -> None:
+        self.rows = rows
+        self.version = version
+        self.error = error
+        self.size = size
+        self._open_ids = open_ids
+        self._added = added
+        self._removed = removed
+
+    @classmethod
+    def from_snapshot(
+        cls, snapshot: dict[str, Any], version: int, size: int = FEED_SIZE
+    ) -> "RankedGapFeed":
+        records: pd.DataFrame = snapshot["records"]
+        if snapshot["error"] or records.empty or "star_impact" not in records.columns:
+            empty = pd.DataFrame(columns=[*FEED_COLUMNS, "priority_score"])
+            return cls(empty, frozenset(), version, snapshot["error"], size)
+        eligible = np.ones(len(records), dtype=bool)
+        if "gap_status" in records.columns:
+            eligible &= (records["gap_status"] == "OPEN").to_numpy()
+        if "gap_id" in records.columns:
+            suppressed = {r["gap_id"] for r in get_gap_suppressions()}
+            if suppressed:
+                eligible &= ~records["gap_id"].isin(suppressed).to_numpy()
+            open_ids = frozenset(records["gap_id"].astype(str).to_numpy()[eligible])
+        else:
+            open_ids = frozenset(str(i) for i in np.flatnonzero(eligible))
+        top = top_priority_gaps(records, size, snapshot_priority_scores(snapshot), eligible)
+        columns = [c for c in FEED_COLUMNS if c in top.columns]
+        return cls(
+            top[[*columns, "priority_score"]].reset_index(drop=True), open_ids, version, None, size
+        )
+
+    @property
+    def open_count(self) -> int:
+        return len(self._open_ids) + len(self._added) - len(self._removed)
+
+    def top(self, k: int = PANEL_ROWS) -> pd.DataFrame:
+        return self.rows.head(k)
+
+    def is_open(self, gap_id: str) -> bool:
+        return (gap_id in self._open_ids or gap_id in self._added) and gap_id not in self._removed
+
+    def _patched(
+        self, rows: pd.DataFrame, version: int, **overlay: frozenset[str]
+    ) -> "RankedGapFeed":
+        return RankedGapFeed(
+            rows,
+            self._open_ids,
+            version,
+            self.error,
+            self.size,
+            overlay.get("added", self._added),
+            overlay.get("removed", self._removed),
+        )
+
+    def pushed(self, record: dict[str, Any], version: int) -> "RankedGapFeed":
+        """Feed after a gap push (record needs gap_id); only OPEN gaps are ranked."""
+        if str(record.get("gap_status", "OPEN")) != "OPEN":
+            return self._patched(self.rows, version)
+        row = pd.DataFrame([{c: record.get(c, "") for c in FEED_COLUMNS}])
+        row["priority_score"] = priority_values(row)
+        rows = self.rows
+        if len(rows) < self.size or row["priority_score"].iat[0] > rows["priority_score"].iat[-1]:
+            rows = pd.concat([rows, row], ignore_index=True)
+            rows = rows.iloc[np.argsort(-rows["priority_score"].to_numpy(), kind="stable")]
+            rows = rows.head(self.size).reset_index(drop=True)
+        return self._patched(rows, version, added=self._added | {str(record["gap_id"])})
+
+    def closed(self, gap_id: str, version: int) -> "RankedGapFeed":
+        """Feed after a gap close."""
+        if not self.is_open(gap_id):
+            return self._patched(self.rows, version)
+        rows = self.rows[self.rows["gap_id"].astype(str) != gap_id].reset_index(drop=True)
+        return self._patched(rows, version, removed=self._removed | {gap_id})
+
+
+def ranked_gap_feed(snapshot: dict[str, Any], version: int) -> RankedGapFeed:
+    """RankedGapFeed for a gap snapshot, built once and kept on the snapshot."""
+    feed = snapshot.get("ranked_feed")
+    if feed is None:
+        feed = RankedGapFeed.from_snapshot(snapshot, version)
+        snapshot["ranked_feed"] = feed
+    return feed
+
+
+def _per_gap(df: pd.DataFrame, column: str, by_type: dict[str, float]) -> np.ndarray:
+    """Per-gap column if present, else the intervention type's default."""
+    kind = (
+        df["intervention_type"].astype(str)
+        if "intervention_type" in df.columns
+        else pd.Series(DEFAULT_INTERVENTION, index=df.index)
+    )
+    default = kind.map(by_type).fillna(by_type[DEFAULT_INTERVENTION])
+    if column in df.columns:
+        default = pd.to_numeric(df[column], errors="coerce").fillna(default)
+    return np.maximum(default.to_numpy(np.float64), 0.0)
+
+
+def intervention_costs(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """(cost $, coordinator hours) per gap."""
+    return (
+        _per_gap(df, "intervention_cost", INTERVENTION_COSTS),
+        _per_gap(df, "coordinator_hours", COORDINATOR_HOURS),
+    )
+
+
+def _greedy_select(
+    value: np.ndarray, cost: np.ndarray, hours: np.ndarray, budget: float, capacity: float
+) -> np.ndarray:
+    """
+    Greedy by value per unit of normalized resource use (cost/budget +
+    hours/capacity). Each round takes the longest ratio-ordered prefix that
+    fits (cumsum), drops the item that broke it, and repeats on what still fits.
+    """
+    if budget <= 0 or capacity <= 0:
+        return np.empty(0, np.int64)
+    weight = cost / budget + hours / capacity
+    ratio = np.divide(value, weight, out=np.full(len(value), np.inf), where=weight > 0)
+    order = np.argsort(-ratio, kind="stable")
+    cand = order[value[order] > 0]
+    chosen = []
+    rem_cost, rem_hours = budget, capacity
+    while len(cand):
+        cand = cand[(cost[cand] <= rem_cost) & (hours[cand] <= rem_hours)]
+        if not len(cand):
+            break
+        cum_cost = np.cumsum(cost[cand])
+        cum_hours = np.cumsum(hours[cand])
+        ok = (cum_cost <= rem_cost) & (cum_hours <= rem_hours)
+        k = len(ok) if ok.all() else int(np.argmin(ok))
+        chosen.append(cand[:k])
+        rem_cost -= cum_cost[k - 1]
+        rem_hours -= cum_hours[k - 1]
+        cand = cand[k + 1 :]
+    return np.concatenate(chosen) if chosen else np.empty(0, np.int64)
+
+
+def _dp_select(
+    value: np.ndarray, cost: np.ndarray, hours: np.ndarray, budget: float, capacity: float
+) -> np.ndarray | None:
+    """
+    Exact 0/1 knapsack over a (budget × capacity) grid; costs round up to the
+    grid so every answer is feasible. None when the grid is too large.
+    """
+    if budget <= 0 or capacity <= 0:
+        return np.empty(0, np.int64)
+    n_cost = int(budget // COST_UNIT) if np.isfinite(budget) else 0
+    n_hours = int(capacity // HOUR_UNIT) if np.isfinite(capacity) else 0
+    if len(value) > DP_MAX_ITEMS or (n_cost + 1) * (n_hours + 1) > DP_MAX_CELLS:
+        return None
+    # An unconstrained dimension collapses to a single cell
+    c_units = np.ceil(cost / COST_UNIT) if np.isfinite(budget) else np.zeros_like(cost)
+    h_units = np.ceil(hours / HOUR_UNIT) if np.isfinite(capacity) else np.zeros_like(hours)
+    c_units = c_units.astype(np.int64)
+    h_units = h_units.astype(np.int64)
+    best = np.zeros((n_cost + 1, n_hours + 1))
+    take = np.zeros((len(value), n_cost + 1, n_hours + 1), dtype=bool)
+    for i in range(len(value)):
+        c, h = c_units[i], h_units[i]
+        if value[i] <= 0 or c > n_cost or h > n_hours:
+            continue
+        with_item = np.full_like(best, -np.inf)
+        with_item[c:, h:] = best[: n_cost + 1 - c, : n_hours + 1 - h] + value[i]
+        take[i] = with_item > best
+        best = np.where(take[i], with_item, best)
+    chosen = []
+    b, h = n_cost, n_hours
+    for i in range(len(value) - 1, -1, -1):
+        if take[i, b, h]:
+            chosen.append(i)
+            b -= c_units[i]
+            h -= h_units[i]
+    return np.array(chosen[::-1], dtype=np.int64)
+
+
+def select_interventions(
+    df: pd.DataFrame,
+    budget: float | None = None,
+    capacity_hours: float | None = None,
+    method: str = "auto",
+) -> dict[str, Any]:
+    """
+    Choose the open gaps to work under an intervention budget ($) and
+    coordinator capacity (hours), maximizing total priority value
+    (star impact × ROI, as in compute_priority_scores). None = unconstrained.
+    method: "greedy", "dp" (exact; small sets only) or "auto" (DP when the
+    candidate set is small, keeping whichever of DP/greedy scores higher).
+    Returns: { selected (row positions in df, best value first), value, cost,
+    hours, method }. A budget or capacity of zero (or less) selects nothing.
+    """
+    empty = {"selected": np.empty(0, np.int64), "value": 0.0, "cost": 0.0, "hours": 0.0}
+    budget = np.inf if budget is None else float(budget)
+    capacity = np.inf if capacity_hours is None else float(capacity_hours)
+    if df.empty or "star_impact" not in df.columns or budget <= 0 or capacity <= 0:
+        return {**empty, "method": method}
+    value = priority_values(df)
+    cost, hours = intervention_costs(df)
+    if "gap_status" in df.columns:
+        value = np.where(df["gap_status"].astype(str).to_numpy() == "OPEN", value, 0.0)
+
+    picks = {}
+    if method in ("greedy", "auto"):
+        picks["greedy"] = _greedy_select(value, cost, hours, budget, capacity)
+    if method in ("dp", "auto"):
+        pool = np.flatnonzero(value > 0)
+        dp = _dp_select(value[pool], cost[pool], hours[pool], budget, capacity)
+        if dp is not None:
+            picks["dp"] = pool[dp]
+        elif method == "dp":
+            raise ValueError("Candidate set too large for exact selection; use greedy")
+    used, selected = max(picks.items(), key=lambda kv: value[kv[1]].sum())
+    selected = selected[np.argsort(-value[selected], kind="stable")]
+    return {
+        "selected": selected,
+        "value": float(value[selected].sum()),
+        "cost": float(cost[selected].sum()),
+        "hours": float(hours[selected].sum()),
+        "method": used,
+    }
+
+
 def intervention_optimizer_panel(gap_db: HedisGapDB | None = None) -> ui.div:
     """
     Drop-in panel for StarGuard Mobile: shows top interventions by priority.
@@ -53,3 +391,30 @@ def intervention_optimizer_panel(gap_db: HedisGapDB | None = None) -> ui.div:
         ui.output_text("intervention_optimizer_status"),
         class_="intervention-optimizer",
     )
+
+
+def intervention_optimizer_rows(feed: RankedGapFeed, k: int = PANEL_ROWS) -> ui.div:
+    """Ranked gap rows for the intervention_optimizer_table output."""
+    if feed.error:
+        return ui.div(f"⚠ {feed.error}", style="color:#f87171;font-size:12px;")
+    top = feed.top(k)
+    if top.empty:
+        return ui.div("No open gaps to prioritize.", class_="text-muted")
+    roi = pd.to_numeric(top.get("roi_estimate", pd.Series(0, index=top.index)), errors="coerce")
+    return ui.div(
+        *[
+            ui.div(
+                ui.div(
+                    ui.div(f"{g.get('gap_id', '')} · {g.get('measure_code', '')}"),
+                    ui.div(
+                        f"{g.get('intervention_type', '')} · ⭐ {g.get('star_impact', '')} "
+                        f"· ROI ${r:,.0f}",
+                        class_="optimizer-meta",
+                    ),
+                ),
+                ui.span(f"{g['priority_score']:.2f}", class_="optimizer-score"),
+                class_="optimizer-row",
+            )
+            for g, r in zip(top.to_dict("records"), roi.fillna(0), strict=True)
+        ]
+    )
@@ -0,0 +1,182 @@
+# measure_catalog.py
+# ─────────────────────────────────────────────────────────────
+# HEDIS / Star Measure Catalog — single source for every page
+# StarGuard Mobile | reichert-science-intelligence
+# Loaded once from data/measure_catalog.csv (or .parquet); columns held as
+# read-only NumPy arrays; one immutable object shared by all pages
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import os
+from collections.abc import Iterator, Mapping
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_CATALOG_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.environ.get("MEASURE_CATALOG_FILE", os.path.join("data", "measure_catalog.csv")),
+)
+
+TEXT_COLUMNS = ("code", "name", "care_domain", "category", "weight", "difficulty")
+NUMERIC_COLUMNS = (
+    "current_rate",
+    "benchmark",
+    "national_avg",
+    "star_impact",
+    "roi_per_point",
+    "population",
+    "impact",
+    "effort",
+    "star_weight",
+    "cut_2",
+    "cut_3",
+    "cut_4",
+    "cut_5",
+    "saturation_spend",
+)
+# Stored as float (NaN = not tracked) but surfaced as int in records
+INT_COLUMNS = frozenset({"roi_per_point", "population", "effort", "saturation_spend"})
+
+PERFORMANCE_COLUMNS = ("current_rate", "benchmark", "national_avg", "roi_per_point", "population")
+PORTFOLIO_COLUMNS = (
+    "impact",
+    "effort",
+    "current_rate",
+    "benchmark",
+    "roi_per_point",
+    "star_impact",
+    "saturation_spend",
+)
+
+# CMS Star cut points: minimum rate for 2, 3, 4 and 5 measure stars
+CUT_POINT_COLUMNS = ("cut_2", "cut_3", "cut_4", "cut_5")
+STAR_COLUMNS = ("star_weight", *CUT_POINT_COLUMNS)
+
+
+class MeasureCatalog:
+    """
+    Immutable columnar measure table.
+    column(name) returns a read-only NumPy array aligned with `codes`;
+    records gives {code: {field: value}} for page code that reads one measure.
+    """
+
+    def __init__(self, columns: Mapping[str, np.ndarray]) -> None:
+        frozen: dict[str, np.ndarray] = {}
+        for name, values in columns.items():
+            arr = np.array(values, copy=True)
+            arr.flags.writeable = False
+            frozen[name] = arr
+        self._columns = MappingProxyType(frozen)
+        self.codes: np.ndarray = frozen["code"]
+        self._index = MappingProxyType({str(c): i for i, c in enumerate(self.codes)})
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return tuple(self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def index_of(self, code: str) -> int:
+        return self._index[code]
+
+    def where(self, mask: np.ndarray) -> "MeasureCatalog":
+        """Sub-catalog of the rows where mask is True (order preserved)."""
+        return MeasureCatalog({name: arr[mask] for name, arr in self._columns.items()})
+
+    def has(self, *names: str) -> np.ndarray:
+        """Boolean mask of rows with a value in every named column."""
+        mask = np.ones(len(self), dtype=bool)
+        for name in names:
+            arr = self._columns[name]
+            if arr.dtype.kind == "f":
+                mask &= ~np.isnan(arr)
+            else:
+                mask &= arr != ""
+        return mask
+
+    @cached_property
+    def records(self) -> Mapping[str, Mapping[str, Any]]:
+        """Read-only {code: {field: value}} view; NaN → None, count columns → int."""
+        out: dict[str, Mapping[str, Any]] = {}
+        for i, code in enumerate(self.codes):
+            row: dict[str, Any] = {}
+            for name, arr in self._columns.items():
+                if name == "code":
+                    continue
+                v = arr[i]
+                if arr.dtype.kind == "f":
+                    v = None if np.isnan(v) else (int(v) if name in INT_COLUMNS else float(v))
+                else:
+                    v = str(v)
+                row[name] = v
+            out[str(code)] = MappingProxyType(row)
+        return MappingProxyType(out)
+
+    def row(self, code: str) -> Mapping[str, Any]:
+        return self.records[code]
+
+    @cached_property
+    def performance_measures(self) -> "MeasureCatalog":
+        """Measures with current rate, benchmark, national average, ROI and population."""
+        return self.where(self.has(*PERFORMANCE_COLUMNS))
+
+    @cached_property
+    def star_measures(self) -> "MeasureCatalog":
+        """Measures with a Star weight and cut points — the star prediction set."""
+        return self.where(self.has(*STAR_COLUMNS))
+
+    def cut_points(self) -> np.ndarray:
+        """(n_measures × 4) cut-point matrix, columns 2★..5★."""
+        return np.column_stack([self._columns[c] for c in CUT_POINT_COLUMNS])
+
+    @cached_property
+    def portfolio_measures(self) -> "MeasureCatalog":
+        """Measures with impact/effort scores — the ROI portfolio optimizer set."""
+        return self.where(self.has(*PORTFOLIO_COLUMNS))
+
+
+def load_measure_catalog(path: str = _CATALOG_FILE) -> MeasureCatalog:
+    """
+    Read the catalog file into a MeasureCatalog.
+    .parquet / .feather need pyarrow; .csv needs only pandas.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    elif path.endswith((".feather", ".arrow")):
+        df = pd.read_feather(path)
+    else:
+        df = pd.read_csv(path, dtype={c: str for c in TEXT_COLUMNS}, keep_default_na=False)
+    missing = [c for c in TEXT_COLUMNS + NUMERIC_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Measure catalog {path} missing columns: {', '.join(missing)}")
+    if df["code"].duplicated().any():
+        dupes = sorted(set(df.loc[df["code"].duplicated(), "code"]))
+        raise ValueError(f"Measure catalog {path} has duplicate codes: {', '.join(dupes)}")
+    columns: dict[str, np.ndarray] = {}
+    for c in TEXT_COLUMNS:
+        columns[c] = df[c].fillna("").astype(str).str.strip().to_numpy(dtype=object)
+    for c in NUMERIC_COLUMNS:
+        columns[c] = pd.to_numeric(df[c].replace("", np.nan), errors="coerce").to_numpy(
+            dtype=np.float64
+        )
+    return MeasureCatalog(columns)
+
+
+@lru_cache(maxsize=1)
+def get_measure_catalog() -> MeasureCatalog:
+    """Process-wide catalog; loaded on first use and shared by every page."""
+    return load_measure_catalog()
@@ -0,0 +1,163 @@
+# member_gap_engine.py
+# ─────────────────────────────────────────────────────────────
+# Member × Measure Gap Engine — columnar care gap queue
+# StarGuard Mobile | reichert-science-intelligence
+# Loaded once from data/member_gap_queue.csv (or .parquet); open gaps held
+# as a boolean member × measure matrix; per-priority sorted indexes built
+# at load so summary, counts and queue pages are array slices
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import os
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_QUEUE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.environ.get("MEMBER_GAP_FILE", os.path.join("data", "member_gap_queue.csv")),
+)
+
+PRIORITIES = ("High", "Medium", "Low")
+MEMBER_COLUMNS = (
+    "member_id",
+    "name",
+    "age",
+    "risk_score",
+    "priority",
+    "last_contact_days",
+    "phone",
+    "preferred_contact",
+)
+CONTACT_METHODS = ("Phone", "Mail", "Portal")
+
+
+class MemberGapEngine:
+    """
+    Care gap queue over a columnar member table.
+
+    gaps is an (n_members × n_measures) bool matrix aligned with measure_codes.
+    Queue order is priority (High → Low), then risk score descending; one
+    index array per priority holds that order, so filters never re-scan.
+    """
+
+    def __init__(self, members: pd.DataFrame, measure_codes: list[str]) -> None:
+        missing = [c for c in MEMBER_COLUMNS if c not in members.columns]
+        if missing:
+            raise ValueError(f"Member table missing columns: {', '.join(missing)}")
+        self.measure_codes: tuple[str, ...] = tuple(measure_codes)
+        self.member_id = members["member_id"].astype(str).to_numpy(dtype=object)
+        self.name = members["name"].astype(str).to_numpy(dtype=object)
+        self.age = members["age"].to_numpy(dtype=np.int16)
+        self.risk_score = members["risk_score"].to_numpy(dtype=np.float64)
+        self.last_contact_days = members["last_contact_days"].to_numpy(dtype=np.int32)
+        self.phone = members["phone"].astype(str).to_numpy(dtype=object)
+        self.preferred_contact = members["preferred_contact"].astype(str).to_numpy(dtype=object)
+
+        priority = pd.Categorical(members["priority"], categories=PRIORITIES)
+        if (priority.codes < 0).any():
+            bad = sorted(set(members["priority"][priority.codes < 0].astype(str)))
+            raise ValueError(f"Unknown priority values: {', '.join(bad)}")
+        self.priority_code = priority.codes.astype(np.int8)
+
+        self.gaps = members[list(self.measure_codes)].to_numpy(dtype=bool)
+        self.open_gaps = self.gaps.sum(axis=1, dtype=np.int32)
+
+        # lexsort: last key is primary
+        self.order = np.lexsort((-self.risk_score, self.priority_code))
+        self._priority_index = {
+            p: self.order[self.priority_code[self.order] == i] for i, p in enumerate(PRIORITIES)
+        }
+        self._summary = {
+            "total_members": len(self),
+            "total_gaps": int(self.open_gaps.sum()),
+            "high_priority": len(self._priority_index["High"]),
+            "avg_risk": float(self.risk_score.mean()) if len(self) else 0.0,
+            "by_priority": {p: len(ix) for p, ix in self._priority_index.items()},
+            "by_measure": dict(
+                zip(self.measure_codes, self.gaps.sum(axis=0).tolist(), strict=True)
+            ),
+        }
+
+    def __len__(self) -> int:
+        return len(self.member_id)
+
+    def summary(self) -> dict[str, Any]:
+        """Queue totals: members, open gaps, high-priority count, mean risk, per-priority/measure counts."""
+        return self._summary
+
+    def index(self, priority: str = "All") -> np.ndarray:
+        """Row indexes in queue order for a priority filter ("All" = every member)."""
+        if priority == "All":
+            return self.order
+        return self._priority_index[priority]
+
+    def count(self, priority: str = "All") -> int:
+        return len(self.index(priority))
+
+    def queue(self, priority: str = "All", start: int = 0, stop: int | None = None) -> list[dict[str, Any]]:
+        """Member rows [start:stop) of the filtered, sorted queue."""
+        return self.rows(self.index(priority)[start:stop])
+
+    def rows(self, idx: np.ndarray) -> list[dict[str, Any]]:
+        """Hydrate row indexes into the dicts the workflow page renders."""
+        codes = np.asarray(self.measure_codes, dtype=object)
+        return [
+            {
+                "member_id": self.member_id[i],
+                "name": self.name[i],
+                "age": int(self.age[i]),
+                "risk_score": float(self.risk_score[i]),
+                "open_gaps": int(self.open_gaps[i]),
+                "priority": PRIORITIES[self.priority_code[i]],
+                "gaps": codes[self.gaps[i]].tolist(),
+                "last_contact": f"{self.last_contact_days[i]} days ago",
+                "phone": self.phone[i],
+                "preferred_contact": self.preferred_contact[i],
+            }
+            for i in idx
+        ]
+
+
+def load_member_gap_engine(path: str = _QUEUE_FILE) -> MemberGapEngine:
+    """
+    Read a member gap table (CSV, or .parquet with pyarrow).
+    Every column after MEMBER_COLUMNS is a measure code holding 0/1 open-gap flags.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype={"member_id": str, "phone": str})
+    measure_codes = [c for c in df.columns if c not in MEMBER_COLUMNS]
+    return MemberGapEngine(df, measure_codes)
+
+
+def synthetic_member_table(n: int, measure_codes: list[str], seed: int = 0) -> pd.DataFrame:
+    """Random member gap table with the file's schema — load testing and benchmarks."""
+    rng = np.random.default_rng(seed)
+    risk = np.round(rng.gamma(2.0, 0.8, n) + 0.5, 1)
+    gaps = rng.random((n, len(measure_codes))) < 0.25
+    priority = np.where(risk >= 2.5, "High", np.where(risk >= 1.8, "Medium", "Low"))
+    df = pd.DataFrame(
+        {
+            "member_id": np.char.add("M", np.char.zfill(np.arange(n).astype(str), 7)),
+            "name": "Member",
+            "age": rng.integers(65, 95, n),
+            "risk_score": risk,
+            "priority": priority,
+            "last_contact_days": rng.integers(0, 120, n),
+            "phone": "(412) 555-0000",
+            "preferred_contact": np.asarray(CONTACT_METHODS)[rng.integers(0, 3, n)],
+        }
+    )
+    for j, code in enumerate(measure_codes):
+        df[code] = gaps[:, j].astype(np.int8)
+    return df
+
+
+@lru_cache(maxsize=1)
+def get_member_gap_engine() -> MemberGapEngine:
+    """Process-wide engine; loaded on first use and shared by every session."""
+    return load_member_gap_engine()
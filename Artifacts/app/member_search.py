@@ -0,0 +1,195 @@
+# member_search.py
+# ─────────────────────────────────────────────────────────────
+# Member Typeahead Search — prefix + trigram index over the member store
+# StarGuard Mobile | reichert-science-intelligence
+# Prefix: sorted key array (member ID, full name, surname) + searchsorted
+# Trigram: CSR posting lists over lowercase names, built on first substring
+# query; candidate rows verified against the name before ranking
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import threading
+from collections.abc import Sequence
+
+import numpy as np
+from member_store import MemberStore, get_member_store, member_label
+
+SEARCH_RESULTS = 20
+_MAX_CODEPOINT = "\U0010ffff"
+_VERIFY_CHUNK = 4096
+
+
+def _trigram_codes(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (trigram, row) pairs for a (n × width) uint32 code-point matrix (0 = padding).
+    Each trigram packs three 21-bit code points into one int64.
+    """
+    n, width = codes.shape
+    c = codes.astype(np.int64)
+    trigs = []
+    rows = []
+    row_ids = np.arange(n, dtype=np.int64)
+    for k in range(max(width - 2, 0)):
+        valid = c[:, k + 2] != 0
+        trigs.append((c[valid, k] << 42) | (c[valid, k + 1] << 21) | c[valid, k + 2])
+        rows.append(row_ids[valid])
+    if not trigs:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(trigs), np.concatenate(rows)
+
+
+def _as_codes(text: np.ndarray) -> np.ndarray:
+    """Fixed-width unicode array → (n × width) uint32 code points."""
+    width = max(text.dtype.itemsize // 4, 1)
+    return np.ascontiguousarray(text).view(np.uint32).reshape(len(text), width)
+
+
+class MemberSearchIndex:
+    """
+    Typeahead index over member IDs and names.
+
+    search(query, k) returns up to k row indexes: prefix matches on member ID,
+    full name or surname first (alphabetical), then names containing the
+    query as a substring (shortest name first). Case-insensitive; whitespace
+    in the query is collapsed.
+    """
+
+    def __init__(
+        self,
+        member_ids: Sequence[str],
+        names: Sequence[str],
+        labels: Sequence[str] | None = None,
+    ) -> None:
+        self.member_ids = np.asarray(member_ids, dtype=str)
+        self.names = np.asarray(names, dtype=str)
+        self.labels = np.asarray(labels if labels is not None else names, dtype=object)
+        self._lower_names = np.char.lower(self.names)
+        # int16 lengths keep the per-query stable (radix) sort cheap
+        self._name_len = np.char.str_len(self.names).astype(np.int16)
+
+        n = len(self.member_ids)
+        rows = np.arange(n, dtype=np.int64)
+        surnames = np.char.partition(self._lower_names, " ")[:, 2]
+        has_surname = np.char.str_len(surnames) > 0
+        keys = np.concatenate(
+            [np.char.lower(self.member_ids), self._lower_names, surnames[has_surname]]
+        )
+        key_rows = np.concatenate([rows, rows, rows[has_surname]])
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._key_rows = key_rows[order]
+        # Built on first substring query (see _ensure_trigrams)
+        self._trigram_keys: np.ndarray | None = None
+        self._trigram_offsets: np.ndarray | None = None
+        self._trigram_rows: np.ndarray | None = None
+        self._build_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.member_ids)
+
+    # ── Prefix ────────────────────────────────────────────────
+    def _prefix_rows(self, prefix: str, k: int) -> np.ndarray:
+        lo = int(np.searchsorted(self._keys, prefix, side="left"))
+        hi = int(np.searchsorted(self._keys, prefix + _MAX_CODEPOINT, side="left"))
+        # A member owns at most 3 keys, so 3k entries always yield k distinct members
+        hits = self._key_rows[lo : min(hi, lo + 3 * k)]
+        _, first = np.unique(hits, return_index=True)
+        return hits[np.sort(first)][:k]
+
+    # ── Trigram ───────────────────────────────────────────────
+    def _ensure_trigrams(self) -> None:
+        if self._trigram_keys is not None:
+            return
+        with self._build_lock:
+            if self._trigram_keys is not None:
+                return
+            trigs, rows = _trigram_codes(_as_codes(self._lower_names))
+            order = np.lexsort((rows, trigs))
+            trigs, rows = trigs[order], rows[order]
+            # Drop repeated trigrams within one name so postings are unique and sorted
+            keep = np.ones(len(trigs), dtype=bool)
+            keep[1:] = (trigs[1:] != trigs[:-1]) | (rows[1:] != rows[:-1])
+            trigs, rows = trigs[keep], rows[keep]
+            keys, starts = np.unique(trigs, return_index=True)
+            self._trigram_offsets = np.append(starts, len(trigs))
+            self._trigram_rows = rows
+            self._trigram_keys = keys
+
+    def _postings(self, trig: int) -> np.ndarray:
+        assert self._trigram_keys is not None and self._trigram_offsets is not None
+        assert self._trigram_rows is not None
+        i = int(np.searchsorted(self._trigram_keys, trig))
+        if i == len(self._trigram_keys) or self._trigram_keys[i] != trig:
+            return np.empty(0, np.int64)
+        return self._trigram_rows[self._trigram_offsets[i] : self._trigram_offsets[i + 1]]
+
+    def _substring_rows(self, query: str, k: int, exclude: np.ndarray) -> np.ndarray:
+        self._ensure_trigrams()
+        q_trigs, _ = _trigram_codes(_as_codes(np.asarray([query])))
+        postings = sorted((self._postings(int(t)) for t in np.unique(q_trigs)), key=len)
+        cand = postings[0]
+        for other in postings[1:]:
+            if not len(cand):
+                break
+            pos = np.minimum(np.searchsorted(other, cand), len(other) - 1)
+            cand = cand[other[pos] == cand] if len(other) else cand[:0]
+        if len(exclude):
+            cand = cand[~np.isin(cand, exclude)]
+        # Shortest names first (ties in member order); a trigram hit is only a
+        # candidate, so confirm the whole query in ranked chunks until k are found
+        cand = cand[np.argsort(self._name_len[cand], kind="stable")]
+        if len(query) == 3:
+            return cand[:k]
+        found = []
+        total = 0
+        for start in range(0, len(cand), _VERIFY_CHUNK):
+            chunk = cand[start : start + _VERIFY_CHUNK]
+            hits = chunk[np.char.find(self._lower_names[chunk], query) >= 0]
+            found.append(hits)
+            total += len(hits)
+            if total >= k:
+                break
+        return np.concatenate(found)[:k] if found else cand[:0]
+
+    # ── Public API ────────────────────────────────────────────
+    def search(self, query: str, k: int = SEARCH_RESULTS) -> np.ndarray:
+        """Row indexes of the top-k matches for query ([] for an empty query)."""
+        q = " ".join(query.lower().split())
+        if not q or not len(self):
+            return np.empty(0, np.int64)
+        rows = self._prefix_rows(q, k)
+        if len(rows) < k and len(q) >= 3:
+            rows = np.concatenate([rows, self._substring_rows(q, k - len(rows), rows)])
+        return rows
+
+    def choices(self, query: str, k: int = SEARCH_RESULTS) -> dict[str, str]:
+        """{member_id: label} for the top-k matches — selectize choices."""
+        return {str(self.member_ids[i]): str(self.labels[i]) for i in self.search(query, k)}
+
+
+_INDEX_LOCK = threading.Lock()
+_INDEX: tuple[int, int, MemberSearchIndex] | None = None
+
+
+def build_member_search_index(store: MemberStore) -> MemberSearchIndex:
+    """Index every member in the store; labels match the profile selector."""
+    cols = store.index_columns()
+    labels = [
+        member_label({"name": n, "age": a, "risk_tier": t})
+        for n, a, t in zip(cols["name"], cols["age"], cols["risk_tier"], strict=True)
+    ]
+    return MemberSearchIndex(cols["member_id"], cols["name"], labels)
+
+
+def get_member_search_index(store: MemberStore | None = None) -> MemberSearchIndex:
+    """
+    Process-wide search index over the member store, built on first use and
+    rebuilt when the store has been written to since.
+    """
+    global _INDEX
+    store = store or get_member_store()
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX[0] != id(store) or _INDEX[1] != store.version:
+            _INDEX = (id(store), store.version, build_member_search_index(store))
+        index: MemberSearchIndex = _INDEX[2]
+        return index
@@ -0,0 +1,328 @@
+# member_store.py
+# ─────────────────────────────────────────────────────────────
+# Member Profile Store — indexed SQLite repository + LRU of profiles
+# StarGuard Mobile | reichert-science-intelligence
+# Core fields load with the member row (primary-key lookup); sections
+# (care gaps, timeline, SDOH, ...) load on first access and stay on the
+# hydrated profile. Built from data/member_profiles.json; rebuilt whenever
+# that file's content hash differs from the one recorded in the DB.
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping
+from functools import lru_cache
+from typing import Any
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+_STORE_DB = os.path.join(
+    _APP_DIR, os.environ.get("MEMBER_STORE_DB", os.path.join("data", "member_profiles.db"))
+)
+_SEED_FILE = os.path.join(_APP_DIR, "data", "member_profiles.json")
+_PROFILE_CACHE_SIZE = int(os.environ.get("MEMBER_PROFILE_CACHE_SIZE", 256))
+
+# ── Profile layout ────────────────────────────────────────────
+# Indexed columns on the members table (also used for selector labels/search)
+INDEXED_FIELDS = ("member_id", "name", "age", "risk_tier", "risk_score")
+# Everything else in the core row is stored as one JSON blob
+CORE_FIELDS = (
+    "gender",
+    "photo",
+    "last_hospitalization",
+    "er_visits_12m",
+    "predictive_trend",
+    "closed_gaps",
+    "gap_closure_rate",
+)
+# Lazily loaded sections: {section: fields it provides}
+PROFILE_SECTIONS: dict[str, tuple[str, ...]] = {
+    "clinical": ("hcc_codes", "conditions"),
+    "care_gaps": ("open_gaps",),
+    "timeline": ("timeline",),
+    "care_team": ("pcp", "specialists"),
+    "financial_impact": (
+        "star_contribution",
+        "annual_revenue",
+        "revenue_at_risk",
+        "cost_of_care",
+        "high_utilizer",
+    ),
+    "communication": ("contact_pref", "best_time", "language", "last_contact", "response_rate"),
+    "sdoh": ("sdoh",),
+    "ai_recommendations": ("ai_recommendation", "closure_probability", "recommended_channel"),
+}
+_FIELD_SECTION = {f: s for s, fields in PROFILE_SECTIONS.items() for f in fields}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    member_id  TEXT PRIMARY KEY,
+    name       TEXT NOT NULL,
+    age        INTEGER,
+    risk_tier  TEXT,
+    risk_score REAL,
+    core       TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS member_sections (
+    member_id TEXT NOT NULL,
+    section   TEXT NOT NULL,
+    payload   TEXT NOT NULL,
+    PRIMARY KEY (member_id, section)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_members_name ON members (name);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+_GET_MEMBER_SQL = (
+    "SELECT member_id, name, age, risk_tier, risk_score, core FROM members WHERE member_id = ?"
+)
+
+
+class MemberProfile(Mapping[str, Any]):
+    """
+    Read-only member profile. Core fields are present on construction;
+    reading a section field (e.g. profile["open_gaps"]) fetches that whole
+    section once and keeps it for every later read.
+    """
+
+    def __init__(self, store: "MemberStore", core: dict[str, Any]) -> None:
+        self._store = store
+        self._fields = core
+        self._loaded: set[str] = set()
+
+    @property
+    def member_id(self) -> str:
+        return str(self._fields["member_id"])
+
+    def _apply_section(self, section: str, payload: Mapping[str, Any]) -> None:
+        for field in PROFILE_SECTIONS[section]:
+            self._fields.setdefault(field, payload.get(field))
+        self._loaded.add(section)
+
+    def _load_section(self, section: str) -> None:
+        if section in self._loaded:
+            return
+        self._apply_section(section, self._store.fetch_section(self.member_id, section))
+
+    def hydrate(self) -> "MemberProfile":
+        """Load every section not yet loaded in one query (full-profile views)."""
+        missing = [s for s in PROFILE_SECTIONS if s not in self._loaded]
+        if missing:
+            payloads = self._store.fetch_sections(self.member_id, missing)
+            for section in missing:
+                self._apply_section(section, payloads.get(section, {}))
+        return self
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            section = _FIELD_SECTION.get(key)
+            if section is None:
+                raise KeyError(key)
+            self._load_section(section)
+        return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from INDEXED_FIELDS
+        yield from CORE_FIELDS
+        yield from _FIELD_SECTION
+
+    def __len__(self) -> int:
+        return len(INDEXED_FIELDS) + len(CORE_FIELDS) + len(_FIELD_SECTION)
+
+    @property
+    def loaded_sections(self) -> frozenset[str]:
+        return frozenset(self._loaded)
+
+
+class MemberStore:
+    """
+    Member repository over a SQLite file.
+    get() is a primary-key lookup; hydrated profiles are kept in an LRU of
+    cache_size entries so repeat views and the page's outputs share one fetch.
+    Unknown member IDs return None — callers decide how to report them.
+    """
+
+    def __init__(self, db_path: str = _STORE_DB, cache_size: int = _PROFILE_CACHE_SIZE) -> None:
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._profiles: OrderedDict[str, MemberProfile] = OrderedDict()
+        self.queries = 0
+        self.hits = 0
+        # Bumped on every write so derived indexes (member_search) can rebuild
+        self.version = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM members").fetchone()[0])
+
+    def __contains__(self, member_id: object) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM members WHERE member_id = ?", (member_id,)
+            ).fetchone()
+        return row is not None
+
+    def meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM store_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else str(row[0])
+
+    # ── Writes ────────────────────────────────────────────────
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO store_meta VALUES (?, ?)", (key, value))
+
+    def load_profiles(self, profiles: Iterable[Mapping[str, Any]], replace: bool = False) -> int:
+        """
+        Insert or replace full profiles (flat dicts). Returns the number written.
+        replace=True drops every stored member first, in the same transaction.
+        """
+        members = []
+        sections = []
+        for p in profiles:
+            mid = str(p["member_id"])
+            core = {f: p.get(f) for f in CORE_FIELDS}
+            members.append(
+                (
+                    mid,
+                    p["name"],
+                    p.get("age"),
+                    p.get("risk_tier"),
+                    p.get("risk_score"),
+                    json.dumps(core),
+                )
+            )
+            for section, fields in PROFILE_SECTIONS.items():
+                payload = {f: p[f] for f in fields if f in p}
+                sections.append((mid, section, json.dumps(payload)))
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM member_sections")
+                self._conn.execute("DELETE FROM members")
+                self._profiles.clear()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?)", members
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO member_sections VALUES (?, ?, ?)", sections
+            )
+            for mid, *_ in members:
+                self._profiles.pop(mid, None)
+            self.version += 1
+        return len(members)
+
+    # ── Reads ─────────────────────────────────────────────────
+    def get(self, member_id: str) -> MemberProfile | None:
+        """Profile for member_id, or None if the member is not in the store."""
+        with self._lock:
+            profile = self._profiles.get(member_id)
+            if profile is not None:
+                self._profiles.move_to_end(member_id)
+                self.hits += 1
+                return profile
+            self.queries += 1
+            row = self._conn.execute(_GET_MEMBER_SQL, (member_id,)).fetchone()
+            if row is None:
+                return None
+            fields: dict[str, Any] = dict(zip(INDEXED_FIELDS, row[:5], strict=True))
+            fields.update(json.loads(row[5]))
+            profile = MemberProfile(self, fields)
+            self._profiles[member_id] = profile
+            while len(self._profiles) > self.cache_size:
+                self._profiles.popitem(last=False)
+            return profile
+
+    def fetch_section(self, member_id: str, section: str) -> dict[str, Any]:
+        """One section payload ({} if the member has none stored)."""
+        with self._lock:
+            self.queries += 1
+            row = self._conn.execute(
+                "SELECT payload FROM member_sections WHERE member_id = ? AND section = ?",
+                (member_id, section),
+            ).fetchone()
+        payload: dict[str, Any] = json.loads(row[0]) if row else {}
+        return payload
+
+    def fetch_sections(self, member_id: str, sections: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Several section payloads for one member in a single query."""
+        wanted = list(sections)
+        placeholders = ", ".join("?" * len(wanted))
+        with self._lock:
+            self.queries += 1
+            rows = self._conn.execute(
+                "SELECT section, payload FROM member_sections "
+                f"WHERE member_id = ? AND section IN ({placeholders})",
+                (member_id, *wanted),
+            ).fetchall()
+        return {section: json.loads(payload) for section, payload in rows}
+
+    def list_members(self, limit: int = 50) -> list[dict[str, Any]]:
+        """First `limit` members by ID with their indexed fields (selector labels)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT member_id, name, age, risk_tier, risk_score FROM members "
+                "ORDER BY member_id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(zip(INDEXED_FIELDS, r, strict=True)) for r in rows]
+
+    def index_columns(self) -> dict[str, list[Any]]:
+        """Every member's indexed fields as columns, in member_id order (search index build)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT member_id, name, age, risk_tier, risk_score FROM members ORDER BY member_id"
+            ).fetchall()
+        columns: dict[str, list[Any]] = {f: [] for f in INDEXED_FIELDS}
+        for row in rows:
+            for f, v in zip(INDEXED_FIELDS, row, strict=True):
+                columns[f].append(v)
+        return columns
+
+    def stats(self) -> dict[str, Any]:
+        return {"cached_profiles": len(self._profiles), "hits": self.hits, "queries": self.queries}
+
+
+def member_label(member: Mapping[str, Any]) -> str:
+    """Selector label, e.g. 'Patricia Anderson - Age 68, Very High Risk'."""
+    return f"{member['name']} - Age {member['age']}, {member['risk_tier']} Risk"
+
+
+def build_member_store(db_path: str = _STORE_DB, seed_file: str = _SEED_FILE) -> MemberStore:
+    """
+    Open the member store, (re)seeding it from seed_file when the DB has not
+    been built from the file's current content (sha256 kept in store_meta).
+    Falls back to an in-memory DB if db_path is not writable.
+    """
+    try:
+        store = MemberStore(db_path)
+    except sqlite3.Error:
+        store = MemberStore(":memory:")
+    if os.path.exists(seed_file):
+        with open(seed_file, "rb") as f:
+            raw = f.read()
+        seed_hash = hashlib.sha256(raw).hexdigest()
+        if store.meta("seed_sha256") != seed_hash:
+            store.load_profiles(json.loads(raw), replace=True)
+            store.set_meta("seed_sha256", seed_hash)
+    return store
+
+
+@lru_cache(maxsize=1)
+def get_member_store() -> MemberStore:
+    """Process-wide member store shared by every session."""
+    return build_member_store()
@@ -9,107 +9,8 @@ from components.mobile_layout import (
     mobile_page,
     progress_bar,
 )
-from shiny import render, ui
-
-# Sample member data with open care gaps
-MEMBER_QUEUE = [
-    {
-        "member_id": "M001847",
-        "name": "Patricia Anderson",
-        "age": 68,
-        "risk_score": 3.2,
-        "open_gaps": 3,
-        "priority": "High",
-        "gaps": ["HBD", "CBP", "BCS"],
-        "last_contact": "14 days ago",
-        "phone": "(412) 555-0198",
-        "preferred_contact": "Phone",
-    },
-    {
-        "member_id": "M002156",
-        "name": "James Martinez",
-        "age": 72,
-        "risk_score": 2.8,
-        "open_gaps": 2,
-        "priority": "High",
-        "gaps": ["CCS", "HBD"],
-        "last_contact": "8 days ago",
-        "phone": "(412) 555-0234",
-        "preferred_contact": "Phone",
-    },
-    {
-        "member_id": "M003421",
-        "name": "Mary Johnson",
-        "age": 65,
-        "risk_score": 1.9,
-        "open_gaps": 2,
-        "priority": "Medium",
-        "gaps": ["MAD", "BCS"],
-        "last_contact": "21 days ago",
-        "phone": "(412) 555-0167",
-        "preferred_contact": "Mail",
-    },
-    {
-        "member_id": "M004892",
-        "name": "Robert Chen",
-        "age": 70,
-        "risk_score": 2.5,
-        "open_gaps": 1,
-        "priority": "Medium",
-        "gaps": ["CBP"],
-        "last_contact": "6 days ago",
-        "phone": "(412) 555-0289",
-        "preferred_contact": "Portal",
-    },
-    {
-        "member_id": "M005234",
-        "name": "Linda Williams",
-        "age": 66,
-        "risk_score": 1.4,
-        "open_gaps": 1,
-        "priority": "Low",
-        "gaps": ["CCS"],
-        "last_contact": "45 days ago",
-        "phone": "(412) 555-0312",
-        "preferred_contact": "Phone",
-    },
-    {
-        "member_id": "M006745",
-        "name": "David Thompson",
-        "age": 69,
-        "risk_score": 3.5,
-        "open_gaps": 4,
-        "priority": "High",
-        "gaps": ["HBD", "CBP", "CCS", "OMW"],
-        "last_contact": "3 days ago",
-        "phone": "(412) 555-0445",
-        "preferred_contact": "Phone",
-    },
-    {
-        "member_id": "M007123",
-        "name": "Sarah Davis",
-        "age": 67,
-        "risk_score": 2.1,
-        "open_gaps": 2,
-        "priority": "Medium",
-        "gaps": ["BCS", "MAD"],
-        "last_contact": "12 days ago",
-        "phone": "(412) 555-0556",
-        "preferred_contact": "Mail",
-    },
-    {
-        "member_id": "M008901",
-        "name": "Michael Brown",
-        "age": 71,
-        "risk_score": 1.6,
-        "open_gaps": 1,
-        "priority": "Low",
-        "gaps": ["CCS"],
-        "last_contact": "30 days ago",
-        "phone": "(412) 555-0678",
-        "preferred_contact": "Portal",
-    },
-]
+from member_gap_engine import get_member_gap_engine
+from shiny import reactive, render, ui
 
 # Gap definitions
 GAP_DEFINITIONS = {
@@ -125,7 +26,7 @@ GAP_DEFINITIONS = {
         "closure_value": "$1,120",
         "difficulty": "Medium",
     },
-    "CCS": {
+    "COL": {
         "name": "Colorectal Cancer Screening",
         "due_date": "60 days",
         "closure_value": "$780",
@@ -160,6 +61,61 @@ INTERVENTION_STRATEGIES = {
     "PCP Office Visit": {"success_rate": 65, "avg_time": "21 days", "cost": "$45"},
 }
 
+# Member queue is sent in pages of QUEUE_PAGE_SIZE rows; each row is a compact
+# class-styled template so a page stays a few KB regardless of queue size
+QUEUE_PAGE_SIZE = 25
+PRIORITY_COLORS = {"High": "#dc3545", "Medium": "#ffc107", "Low": "#28a745"}
+
+MEMBER_QUEUE_CSS = (
+    ".mq-row{padding:.9rem 1rem;background:#fff;border-left:4px solid var(--mq);"
+    "border-radius:8px;margin-bottom:.75rem}"
+    + "".join(f".mq-{p}{{--mq:{c}}}" for p, c in PRIORITY_COLORS.items())
+    + ".mq-head{display:flex;justify-content:space-between;align-items:center}"
+    ".mq-name{font-weight:700;font-size:1.05rem;color:#1a1a1a}"
+    ".mq-badge{background:var(--mq);color:#fff;padding:.2rem .6rem;border-radius:4px;"
+    "font-size:.75rem;font-weight:600}"
+    ".mq-meta{color:#666;font-size:.85rem;margin:.25rem 0 .5rem}"
+    ".mq-gaps{color:#333;font-size:.9rem;padding:.4rem 0;border-top:1px solid #e0e0e0;"
+    "border-bottom:1px solid #e0e0e0}"
+    ".mq-gaps b{color:#dc3545}"
+    ".mq-contact{color:#666;font-size:.85rem;padding:.4rem 0 .6rem}"
+    ".mq-contact b{color:#7c3aed}"
+    ".mq-hint{color:#666;font-size:.75rem;font-style:italic;margin-bottom:.75rem;padding:.5rem;"
+    "background:#f5f3ff;border-radius:4px;border-left:3px solid #7c3aed}"
+)
+
+
+def member_queue_rows(members):
+    """Compact queue row per member (styles come from MEMBER_QUEUE_CSS)."""
+    return [
+        ui.div(
+            ui.div(
+                ui.tags.span(m["name"], class_="mq-name"),
+                ui.tags.span(m["priority"], class_="mq-badge"),
+                class_="mq-head",
+            ),
+            ui.div(
+                f"ID: {m['member_id']} • Age: {m['age']} • Risk Score: {m['risk_score']}",
+                class_="mq-meta",
+            ),
+            ui.div(
+                ui.tags.b(f"{m['open_gaps']} open: "),
+                " • ".join(GAP_DEFINITIONS[g]["name"] for g in m["gaps"]),
+                class_="mq-gaps",
+            ),
+            ui.div(
+                f"Last contact {m['last_contact']} • Prefers ",
+                ui.tags.b(m["preferred_contact"]),
+                class_="mq-contact",
+            ),
+            mobile_button(
+                "Assign Interventions", f"assign_btn_{m['member_id']}", "primary", icon="📋"
+            ),
+            class_=f"member-card mq-row mq-{m['priority']}",
+        )
+        for m in members
+    ]
+
 
 def care_gap_workflow_ui():
     """UI for care gap closure workflow page."""
@@ -192,12 +148,13 @@ def care_gap_workflow_ui():
                 selected="All",
                 inline=False,
             ),
-            ui.output_ui("filtered_count"),
         ),
         # Member queue
         mobile_card(
             "Member Queue",
+            ui.tags.style(MEMBER_QUEUE_CSS),
             ui.output_ui("member_queue"),
+            ui.output_ui("member_queue_footer"),
             header_color="linear-gradient(135deg, #7c3aed 0%, #6d28d9 100%)",
         ),
         # Intervention recommendations
@@ -215,6 +172,7 @@ def care_gap_workflow_ui():
 
 def care_gap_workflow_server(input, output, session, get_current_page=lambda: "star"):
     """Server logic for care gap closure workflow."""
+    engine = get_member_gap_engine()
 
     def _is_on_workflow_page():
         """Check if we're on the workflow page."""
@@ -230,10 +188,11 @@ def care_gap_workflow_server(input, output, session, get_current_page=lambda: "s
         if not _is_on_workflow_page():
             return None
 
-        total_members = len(MEMBER_QUEUE)
-        total_gaps = sum(m["open_gaps"] for m in MEMBER_QUEUE)
-        high_priority = len([m for m in MEMBER_QUEUE if m["priority"] == "High"])
-        avg_risk = sum(m["risk_score"] for m in MEMBER_QUEUE) / total_members
+        summary = engine.summary()
+        total_members = summary["total_members"]
+        total_gaps = summary["total_gaps"]
+        high_priority = summary["high_priority"]
+        avg_risk = summary["avg_risk"]
 
         return ui.div(
             metric_box("Total Members", f"{total_members}", color="#7c3aed", subtitle="In queue"),
@@ -247,131 +206,78 @@ def care_gap_workflow_server(input, output, session, get_current_page=lambda: "s
             style="display: flex; flex-direction: column; gap: 0.75rem;",
         )
 
+    # Number of queue rows currently in the browser; reset when the list re-renders
+    queue_shown = reactive.Value(QUEUE_PAGE_SIZE)
+
+    @reactive.effect
+    @reactive.event(input.priority_filter, _is_on_workflow_page)
+    def _reset_queue_shown():
+        """A new filter (or returning to the page) re-renders only the first page."""
+        queue_shown.set(QUEUE_PAGE_SIZE)
+
     @output
     @render.ui
-    def filtered_count():
-        """Show count of filtered members."""
+    def member_queue():
+        """Display the first page of the filtered member queue; later pages are appended."""
         if not _is_on_workflow_page():
             return None
 
         priority = input.priority_filter()
-
-        if priority == "All":
-            count = len(MEMBER_QUEUE)
-        else:
-            count = len([m for m in MEMBER_QUEUE if m["priority"] == priority])
+        if engine.count(priority) == 0:
+            return alert_box("No members match the selected priority filter", type="warning")
 
         return ui.div(
-            ui.tags.p(
-                f"Showing {count} member{'s' if count != 1 else ''}",
-                style="text-align: center; color: #666; margin: 0.5rem 0 0 0; font-size: 0.875rem;",
-            )
+            ui.tags.div(
+                "💡 Assign Interventions uses AI-recommended interventions for each open gap "
+                "via the member's preferred contact method",
+                class_="mq-hint",
+            ),
+            ui.div(
+                *member_queue_rows(engine.queue(priority, 0, QUEUE_PAGE_SIZE)),
+                id="member_queue_rows",
+            ),
         )
 
     @output
     @render.ui
-    def member_queue():
-        """Display filtered member queue."""
+    def member_queue_footer():
+        """Rows shown vs. total, with a Load More button while rows remain."""
         if not _is_on_workflow_page():
             return None
 
-        priority = input.priority_filter()
-
-        # Filter members
-        if priority == "All":
-            filtered_members = MEMBER_QUEUE
-        else:
-            filtered_members = [m for m in MEMBER_QUEUE if m["priority"] == priority]
-
-        # Priority colors
-        priority_colors = {"High": "#dc3545", "Medium": "#ffc107", "Low": "#28a745"}
-
+        total = engine.count(input.priority_filter())
+        shown = min(queue_shown(), total)
+        if total == 0:
+            return None
         return ui.div(
-            *[
-                ui.div(
-                    # Member header
-                    ui.div(
-                        ui.tags.div(
-                            ui.tags.span(
-                                member["name"],
-                                style="font-weight: 700; font-size: 1.1rem; color: #1a1a1a;",
-                            ),
-                            ui.tags.span(
-                                member["priority"],
-                                style=f"background: {priority_colors[member['priority']]}; color: white; padding: 0.25rem 0.75rem; border-radius: 4px; font-size: 0.75rem; font-weight: 600; margin-left: 0.5rem;",
-                            ),
-                            style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;",
-                        ),
-                        ui.tags.div(
-                            f"ID: {member['member_id']} • Age: {member['age']} • Risk Score: {member['risk_score']}",
-                            style="color: #666; font-size: 0.875rem; margin-bottom: 0.75rem;",
-                        ),
-                    ),
-                    # Gap details
-                    ui.div(
-                        ui.tags.strong("Open Gaps: ", style="color: #1a1a1a; font-weight: 700;"),
-                        ui.tags.span(
-                            f"{member['open_gaps']}",
-                            style="color: #dc3545; font-weight: 700; font-size: 1.1rem;",
-                        ),
-                        style="padding: 0.5rem 0; border-bottom: 1px solid #e0e0e0;",
-                    ),
-                    # Gap list
-                    ui.div(
-                        ui.tags.div(
-                            *[
-                                ui.tags.span(
-                                    f"• {GAP_DEFINITIONS[gap]['name']}",
-                                    style="display: block; color: #333; font-size: 0.9rem; padding: 0.25rem 0;",
-                                )
-                                for gap in member["gaps"]
-                            ]
-                        ),
-                        style="padding: 0.5rem 0; border-bottom: 1px solid #e0e0e0;",
-                    ),
-                    # Contact info
-                    ui.div(
-                        ui.tags.strong("Last Contact: ", style="color: #1a1a1a; font-weight: 700;"),
-                        ui.tags.span(member["last_contact"], style="color: #666;"),
-                        style="padding: 0.5rem 0; border-bottom: 1px solid #e0e0e0;",
-                    ),
-                    ui.div(
-                        ui.tags.strong(
-                            "Preferred Method: ", style="color: #1a1a1a; font-weight: 700;"
-                        ),
-                        ui.tags.span(
-                            member["preferred_contact"], style="color: #7c3aed; font-weight: 600;"
-                        ),
-                        style="padding: 0.5rem 0;",
-                    ),
-                    # Action button with explanation
-                    ui.div(
-                        mobile_button(
-                            "Assign Interventions",
-                            f"assign_btn_{member['member_id']}",
-                            "primary",
-                            icon="📋",
-                        ),
-                        ui.tags.div(
-                            f"💡 Assigns AI-recommended interventions for {member['open_gaps']} open gaps using member's preferred contact method ({member['preferred_contact']})",
-                            style="color: #666; font-size: 0.75rem; font-style: italic; margin-top: 0.5rem; padding: 0.5rem; background: #f5f3ff; border-radius: 4px; border-left: 3px solid #7c3aed;",
-                        ),
-                        style="margin-top: 0.75rem;",
-                    ),
-                    class_="member-card",
-                    style="padding: 1.25rem; background: white; border-left: 4px solid "
-                    + priority_colors[member["priority"]]
-                    + "; border-radius: 8px; margin-bottom: 1rem;",
-                )
-                for member in filtered_members
-            ],
             alert_box(
-                f"{len(filtered_members)} member{'s' if len(filtered_members) != 1 else ''} ready for outreach",
+                f"Showing {shown:,} of {total:,} member{'s' if total != 1 else ''} ready for outreach",
                 type="info",
+            ),
+            mobile_button(
+                f"Load {min(QUEUE_PAGE_SIZE, total - shown)} More",
+                "queue_load_more",
+                "secondary",
+                icon="⬇️",
             )
-            if len(filtered_members) > 0
-            else alert_box("No members match the selected priority filter", type="warning"),
+            if shown < total
+            else None,
+        )
+
+    @reactive.effect
+    @reactive.event(input.queue_load_more)
+    def _append_queue_page():
+        """Append the next server-side slice of the queue without re-sending earlier rows."""
+        shown = queue_shown()
+        rows = engine.queue(input.priority_filter(), shown, shown + QUEUE_PAGE_SIZE)
+        if not rows:
+            return
+        ui.insert_ui(
+            ui.TagList(*member_queue_rows(rows)),
+            selector="#member_queue_rows",
+            where="beforeEnd",
         )
+        queue_shown.set(shown + len(rows))
 
     @output
     @render.ui
@@ -11,103 +11,18 @@ from components.mobile_layout import (
     mobile_page,
     progress_bar,
 )
+from measure_catalog import get_measure_catalog
 from shiny import reactive, render, ui
 
-# HEDIS Measures Database with current performance metrics
-HEDIS_MEASURES = {
-    "CCS": {
-        "name": "Colorectal Cancer Screening",
-        "category": "Preventive Care",
-        "current_rate": 67.3,
-        "benchmark": 75.0,
-        "national_avg": 70.2,
-        "weight": "High",
-        "star_impact": 0.5,
-        "roi_per_point": 125000,
-        "population": 8450,
-        "difficulty": "Medium",
-    },
-    "HBD": {
-        "name": "Hemoglobin A1c Control for Diabetes",
-        "category": "Diabetes Care",
-        "current_rate": 58.2,
-        "benchmark": 70.0,
-        "national_avg": 64.5,
-        "weight": "High",
-        "star_impact": 0.6,
-        "roi_per_point": 95000,
-        "population": 5230,
-        "difficulty": "High",
-    },
-    "MAD": {
-        "name": "Medication Adherence - Diabetes",
-        "category": "Medication Management",
-        "current_rate": 71.5,
-        "benchmark": 80.0,
-        "national_avg": 75.8,
-        "weight": "Medium",
-        "star_impact": 0.4,
-        "roi_per_point": 110000,
-        "population": 4890,
-        "difficulty": "Low",
-    },
-    "BCS": {
-        "name": "Breast Cancer Screening",
-        "category": "Preventive Care",
-        "current_rate": 73.8,
-        "benchmark": 78.0,
-        "national_avg": 76.2,
-        "weight": "High",
-        "star_impact": 0.5,
-        "roi_per_point": 105000,
-        "population": 6720,
-        "difficulty": "Low",
-    },
-    "CBP": {
-        "name": "Controlling High Blood Pressure",
-        "category": "Chronic Disease Management",
-        "current_rate": 62.4,
-        "benchmark": 72.0,
-        "national_avg": 68.1,
-        "weight": "High",
-        "star_impact": 0.7,
-        "roi_per_point": 140000,
-        "population": 7650,
-        "difficulty": "Medium",
-    },
-    "OMW": {
-        "name": "Osteoporosis Management in Women",
-        "category": "Chronic Disease Management",
-        "current_rate": 55.6,
-        "benchmark": 68.0,
-        "national_avg": 62.3,
-        "weight": "Medium",
-        "star_impact": 0.3,
-        "roi_per_point": 85000,
-        "population": 3420,
-        "difficulty": "High",
-    },
-    "COL": {
-        "name": "Follow-Up After ED Visit - Mental Health",
-        "category": "Care Coordination",
-        "current_rate": 48.9,
-        "benchmark": 65.0,
-        "national_avg": 58.7,
-        "weight": "Medium",
-        "star_impact": 0.4,
-        "roi_per_point": 75000,
-        "population": 2180,
-        "difficulty": "High",
-    },
-}
+# HEDIS Measures Database with current performance metrics (shared measure catalog)
+_MEASURES = get_measure_catalog().performance_measures
+HEDIS_MEASURES = _MEASURES.records
 
 
 def hedis_analyzer_ui():
     """UI for HEDIS gap analyzer page."""
-    avg_gap = sum((m["benchmark"] - m["current_rate"]) for m in HEDIS_MEASURES.values()) / len(
-        HEDIS_MEASURES
-    )
-    total_pop = sum(m["population"] for m in HEDIS_MEASURES.values())
+    avg_gap = float((_MEASURES.column("benchmark") - _MEASURES.column("current_rate")).mean())
+    total_pop = int(_MEASURES.column("population").sum())
 
     return mobile_page(
         "📊 HEDIS Gap Analyzer",
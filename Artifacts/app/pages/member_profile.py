@@ -8,159 +8,9 @@ from components.mobile_layout import (
     mobile_page,
     progress_bar,
 )
-from shiny import render, ui
-
-# Sample member profiles
-MEMBER_PROFILES = {
-    "M001847": {
-        "name": "Patricia Anderson",
-        "age": 68,
-        "gender": "Female",
-        "member_id": "M001847",
-        "photo": "👤",
-        "risk_tier": "Very High",
-        "risk_score": 3.2,
-        "hcc_codes": ["HCC 18", "HCC 85", "HCC 111", "HCC 134", "HCC 96"],
-        "conditions": ["Diabetes (Type 2)", "CHF", "COPD", "CKD Stage 4", "CAD"],
-        "last_hospitalization": 45,
-        "er_visits_12m": 3,
-        "predictive_trend": "Rising",
-        "open_gaps": [
-            {
-                "code": "HBD",
-                "name": "Hemoglobin A1c Control",
-                "due_date": "30 days",
-                "overdue": 5,
-                "value": 890,
-                "intervention": "Phone + PCP",
-            },
-            {
-                "code": "CBP",
-                "name": "Controlling Blood Pressure",
-                "due_date": "45 days",
-                "overdue": 0,
-                "value": 1120,
-                "intervention": "Office Visit",
-            },
-            {
-                "code": "BCS",
-                "name": "Breast Cancer Screening",
-                "due_date": "90 days",
-                "overdue": 0,
-                "value": 650,
-                "intervention": "Direct Mail",
-            },
-        ],
-        "closed_gaps": 2,
-        "gap_closure_rate": 40.0,
-        "pcp": {"name": "Dr. Sarah Mitchell", "quality": 92.4, "last_visit": 12, "next_visit": 30},
-        "specialists": ["Cardiology - Dr. Emily Chen", "Endocrinology - Dr. Michael Thompson"],
-        "star_contribution": 0.18,
-        "annual_revenue": 2890,
-        "revenue_at_risk": 2660,
-        "cost_of_care": 45600,
-        "high_utilizer": True,
-        "contact_pref": "Phone",
-        "best_time": "Afternoons",
-        "language": "English",
-        "last_contact": 8,
-        "response_rate": 65,
-        "sdoh": {"transportation": True, "food": False, "housing": "Stable", "isolation": "Low"},
-        "ai_recommendation": "Schedule PCP visit for overdue HbA1c test. High priority intervention.",
-        "closure_probability": 78,
-        "recommended_channel": "Phone + PCP coordination",
-    },
-    "M002156": {
-        "name": "James Martinez",
-        "age": 72,
-        "gender": "Male",
-        "member_id": "M002156",
-        "photo": "👤",
-        "risk_tier": "High",
-        "risk_score": 2.8,
-        "hcc_codes": ["HCC 18", "HCC 85", "HCC 108"],
-        "conditions": ["Diabetes (Type 2)", "CHF", "Vascular Disease"],
-        "last_hospitalization": 120,
-        "er_visits_12m": 1,
-        "predictive_trend": "Stable",
-        "open_gaps": [
-            {
-                "code": "CCS",
-                "name": "Colorectal Cancer Screening",
-                "due_date": "60 days",
-                "overdue": 0,
-                "value": 780,
-                "intervention": "Patient Portal",
-            },
-            {
-                "code": "HBD",
-                "name": "Hemoglobin A1c Control",
-                "due_date": "45 days",
-                "overdue": 2,
-                "value": 890,
-                "intervention": "Phone Outreach",
-            },
-        ],
-        "closed_gaps": 3,
-        "gap_closure_rate": 60.0,
-        "pcp": {"name": "Dr. James Rodriguez", "quality": 88.6, "last_visit": 25, "next_visit": 60},
-        "specialists": ["Cardiology - Dr. Emily Chen"],
-        "star_contribution": 0.15,
-        "annual_revenue": 1815,
-        "revenue_at_risk": 1670,
-        "cost_of_care": 32400,
-        "high_utilizer": False,
-        "contact_pref": "Phone",
-        "best_time": "Mornings",
-        "language": "Spanish",
-        "last_contact": 6,
-        "response_rate": 82,
-        "sdoh": {"transportation": False, "food": False, "housing": "Stable", "isolation": "Low"},
-        "ai_recommendation": "Portal message for CCS screening. Member is portal-active.",
-        "closure_probability": 85,
-        "recommended_channel": "Patient Portal",
-    },
-}
-
-# Timeline events (MM/DD/YYYY format)
-TIMELINE_EVENTS = [
-    {
-        "date": "02/14/2026",
-        "type": "Contact",
-        "detail": "Phone outreach - Left voicemail",
-        "outcome": "Pending",
-    },
-    {
-        "date": "02/10/2026",
-        "type": "Lab",
-        "detail": "HbA1c result: 8.2% (Above target)",
-        "outcome": "Alert",
-    },
-    {
-        "date": "02/03/2026",
-        "type": "Visit",
-        "detail": "PCP Office Visit - Dr. Mitchell",
-        "outcome": "Completed",
-    },
-    {
-        "date": "01/28/2026",
-        "type": "Contact",
-        "detail": "Direct mail sent - BCS reminder",
-        "outcome": "Delivered",
-    },
-    {
-        "date": "01/15/2026",
-        "type": "Gap Closed",
-        "detail": "MAD - Medication Adherence confirmed",
-        "outcome": "Success",
-    },
-    {
-        "date": "01/08/2026",
-        "type": "Contact",
-        "detail": "Phone outreach - Spoke with member",
-        "outcome": "Success",
-    },
-]
+from member_search import SEARCH_RESULTS, get_member_search_index
+from member_store import get_member_store, member_label
+from shiny import reactive, render, req, ui
 
 
 def member_profile_ui():
@@ -170,15 +20,21 @@ def member_profile_ui():
         # Member selector
         mobile_card(
             "Select Member",
-            ui.input_select(
+            # Text inputs are debounced client-side (250 ms) before reaching the server
+            ui.input_text(
+                "member_search",
+                "",
+                placeholder="🔍 Search by name or member ID",
+                autocomplete="off",
+            ),
+            ui.input_selectize(
                 "selected_member",
                 "",
                 choices={
-                    "M001847": "Patricia Anderson - Age 68, Very High Risk",
-                    "M002156": "James Martinez - Age 72, High Risk",
+                    m["member_id"]: member_label(m) for m in get_member_store().list_members()
                 },
-                selected="M001847",
             ),
+            ui.output_ui("member_search_status"),
         ),
         # Member header
         mobile_card(
@@ -223,6 +79,47 @@ def member_profile_ui():
     )
 
 
+def build_profile_view(store, member_id):
+    """
+    Everything the profile outputs read for one member: the fully hydrated
+    profile (one section query) plus derived gap totals. member is None if
+    the ID is not in the store.
+    """
+    member = store.get(member_id)
+    if member is None:
+        return {"member_id": member_id, "member": None}
+    member.hydrate()
+    open_gaps = member["open_gaps"] or []
+    return {
+        "member_id": member_id,
+        "member": member,
+        "open_gaps": open_gaps,
+        "open_gap_count": len(open_gaps),
+        "open_gap_value": sum(g["value"] for g in open_gaps),
+        "total_gaps": len(open_gaps) + (member["closed_gaps"] or 0),
+        "revenue_at_risk": member["revenue_at_risk"] or 0,
+        "timeline": member["timeline"] or [],
+    }
+
+
+def search_choices(store, query, current=None):
+    """
+    Selector choices for a typeahead query: the top matches (first page of
+    members when the query is blank), with the current selection kept as the
+    last option so updating the list never changes which profile is shown.
+    Empty if nothing matches.
+    """
+    if query:
+        choices = dict(get_member_search_index(store).choices(query, SEARCH_RESULTS))
+    else:
+        choices = {m["member_id"]: member_label(m) for m in store.list_members()}
+    if choices and current and current not in choices:
+        member = store.get(current)
+        if member is not None:
+            choices[current] = member_label(member)
+    return choices
+
+
 def member_profile_server(input, output, session, get_current_page=lambda: "star"):
     """Server logic for member 360° profile."""
 
@@ -233,19 +130,63 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
         except Exception:
             return False
 
-    def get_member():
-        """Get selected member data."""
-        member_id = input.selected_member()
-        return MEMBER_PROFILES.get(member_id, MEMBER_PROFILES["M001847"])
+    store = get_member_store()
+    search_status = reactive.Value("")
+
+    @reactive.effect
+    @reactive.event(input.member_search, ignore_init=True)
+    def _search_members():
+        """
+        Replace the selector's choices with the top matches for the typed query.
+        The selected member (and so the profile) only changes when the user picks one.
+        """
+        query = input.member_search().strip()
+        current = input.selected_member()
+        choices = search_choices(store, query, current)
+        if not choices:
+            search_status.set(f"No members match “{query}”")
+            return
+        search_status.set("")
+        ui.update_selectize(
+            "selected_member", choices=choices, selected=current or None, session=session
+        )
 
     @output
     @render.ui
-    def member_header():
-        """Display member header card."""
+    def member_search_status():
+        msg = search_status()
+        if not msg:
+            return None
+        return ui.tags.div(msg, style="color: #666; font-size: 0.8rem; margin-top: 0.25rem;")
+
+    @reactive.calc
+    def profile_view():
+        """
+        Profile view model, computed once per selection and read by all ten
+        outputs. None when the page is not visible.
+        """
         if not _is_on_profile_page():
             return None
+        return build_profile_view(store, input.selected_member())
 
-        member = get_member()
+    def get_view():
+        """Current view model; outputs stay empty off-page or for an unknown member."""
+        view = profile_view()
+        req(view is not None and view["member"] is not None)
+        return view
+
+    @output
+    @render.ui
+    def member_header():
+        """Display member header card."""
+        view = profile_view()
+        if view is None:
+            return None
+        member = view["member"]
+        if member is None:
+            return alert_box(
+                f"Member {view['member_id']} not found in the member store", type="warning"
+            )
 
         risk_colors = {
             "Very High": "#dc3545",
@@ -309,10 +250,8 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def risk_clinical():
         """Display risk and clinical summary."""
-        if not _is_on_profile_page():
-            return None
-
-        member = get_member()
+        view = get_view()
+        member = view["member"]
 
         return ui.div(
             metric_box(
@@ -359,17 +298,15 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def care_gaps():
         """Display care gap status."""
-        if not _is_on_profile_page():
-            return None
-
-        member = get_member()
+        view = get_view()
+        member = view["member"]
 
         return ui.div(
             # Summary metrics
             ui.div(
                 metric_box(
                     "Open Gaps",
-                    f"{len(member['open_gaps'])}",
+                    f"{view['open_gap_count']}",
                     color="#dc3545",
                     subtitle="Requiring closure",
                 ),
@@ -381,7 +318,7 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
                 ),
                 metric_box(
                     "Revenue at Risk",
-                    f"${sum(g['value'] for g in member['open_gaps']):,}",
+                    f"${view['open_gap_value']:,}",
                     color="#ff6b00",
                     subtitle="Potential revenue",
                 ),
@@ -434,7 +371,7 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
                     class_="member-profile-card",
                     style="padding: 1.25rem; background: white; border-left: 4px solid #dc3545; border-radius: 8px; margin-bottom: 1rem;",
                 )
-                for gap in member["open_gaps"]
+                for gap in view["open_gaps"]
             ],
         )
 
@@ -442,8 +379,7 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def timeline():
         """Display intervention timeline."""
-        if not _is_on_profile_page():
-            return None
+        view = get_view()
 
         outcome_colors = {
             "Success": "#28a745",
@@ -455,6 +391,10 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
 
         type_icons = {"Contact": "📞", "Visit": "🏥", "Lab": "🔬", "Gap Closed": "✅"}
 
+        events = view["timeline"]
+        if not events:
+            return alert_box("No interventions recorded for this member yet", type="info")
+
         return ui.div(
             *[
                 ui.div(
@@ -485,7 +425,7 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
                     class_="member-profile-card",
                     style="padding: 1rem; background: #f8f9fa; border-left: 3px solid #7c3aed; border-radius: 8px; margin-bottom: 0.75rem;",
                 )
-                for event in TIMELINE_EVENTS
+                for event in events
             ]
         )
 
@@ -493,10 +433,8 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def care_team():
         """Display care team information."""
-        if not _is_on_profile_page():
-            return None
-
-        member = get_member()
+        view = get_view()
+        member = view["member"]
         pcp = member["pcp"]
 
         return ui.div(
@@ -556,10 +494,8 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def quality_performance():
         """Display quality measures performance."""
-        if not _is_on_profile_page():
-            return None
-
-        member = get_member()
+        view = get_view()
+        member = view["member"]
 
         return ui.div(
             metric_box(
@@ -572,7 +508,7 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
                 "Gap Closure Rate",
                 f"{member['gap_closure_rate']:.0f}%",
                 color="#7c3aed",
-                subtitle=f"{member['closed_gaps']} of {len(member['open_gaps']) + member['closed_gaps']} closed",
+                subtitle=f"{member['closed_gaps']} of {view['total_gaps']} closed",
             ),
             style="display: flex; flex-direction: column; gap: 0.75rem;",
         )
@@ -581,10 +517,8 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def financial_impact():
         """Display financial impact."""
-        if not _is_on_profile_page():
-            return None
-
-        member = get_member()
+        view = get_view()
+        member = view["member"]
 
         return ui.div(
             metric_box(
@@ -595,7 +529,7 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
             ),
             metric_box(
                 "Revenue at Risk",
-                f"${member['revenue_at_risk']:,}",
+                f"${view['revenue_at_risk']:,}",
                 color="#dc3545",
                 subtitle="Open gap opportunity",
             ),
@@ -619,10 +553,8 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def communication():
         """Display communication preferences."""
-        if not _is_on_profile_page():
-            return None
-
-        member = get_member()
+        view = get_view()
+        member = view["member"]
 
         return ui.div(
             ui.div(
@@ -672,10 +604,8 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def sdoh():
         """Display social determinants of health."""
-        if not _is_on_profile_page():
-            return None
-
-        member = get_member()
+        view = get_view()
+        member = view["member"]
         sdoh = member["sdoh"]
 
         return ui.div(
@@ -723,10 +653,8 @@ def member_profile_server(input, output, session, get_current_page=lambda: "star
     @render.ui
     def ai_recommendations():
         """Display AI-powered recommendations."""
-        if not _is_on_profile_page():
-            return None
-
-        member = get_member()
+        view = get_view()
+        member = view["member"]
 
         return ui.div(
             # Next best action
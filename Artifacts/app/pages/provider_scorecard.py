@@ -19,7 +19,7 @@ PROVIDER_NETWORK = [
         "panel_size": 847,
         "avg_risk_score": 2.3,
         "quality_score": 92.4,
-        "hedis_performance": {"HBD": 89.2, "CBP": 91.5, "CCS": 94.3, "BCS": 88.7, "MAD": 85.4},
+        "hedis_performance": {"HBD": 89.2, "CBP": 91.5, "COL": 94.3, "BCS": 88.7, "MAD": 85.4},
         "gap_closure_rate": 78.3,
         "star_contribution": 0.18,
         "peer_ranking": "Top 10%",
@@ -31,7 +31,7 @@ PROVIDER_NETWORK = [
         "panel_size": 1203,
         "avg_risk_score": 2.8,
         "quality_score": 88.6,
-        "hedis_performance": {"HBD": 85.1, "CBP": 87.9, "CCS": 91.2, "BCS": 82.4, "MAD": 79.8},
+        "hedis_performance": {"HBD": 85.1, "CBP": 87.9, "COL": 91.2, "BCS": 82.4, "MAD": 79.8},
         "gap_closure_rate": 71.5,
         "star_contribution": 0.15,
         "peer_ranking": "Top 25%",
@@ -43,7 +43,7 @@ PROVIDER_NETWORK = [
         "panel_size": 564,
         "avg_risk_score": 3.1,
         "quality_score": 95.2,
-        "hedis_performance": {"HBD": 93.7, "CBP": 96.8, "CCS": 89.5, "BCS": 91.2, "MAD": 88.9},
+        "hedis_performance": {"HBD": 93.7, "CBP": 96.8, "COL": 89.5, "BCS": 91.2, "MAD": 88.9},
         "gap_closure_rate": 84.7,
         "star_contribution": 0.22,
         "peer_ranking": "Top 5%",
@@ -55,7 +55,7 @@ PROVIDER_NETWORK = [
         "panel_size": 423,
         "avg_risk_score": 2.6,
         "quality_score": 90.1,
-        "hedis_performance": {"HBD": 94.3, "CBP": 88.2, "CCS": 87.6, "BCS": 90.5, "MAD": 92.1},
+        "hedis_performance": {"HBD": 94.3, "CBP": 88.2, "COL": 87.6, "BCS": 90.5, "MAD": 92.1},
         "gap_closure_rate": 76.8,
         "star_contribution": 0.16,
         "peer_ranking": "Top 15%",
@@ -67,7 +67,7 @@ PROVIDER_NETWORK = [
         "panel_size": 982,
         "avg_risk_score": 2.1,
         "quality_score": 86.3,
-        "hedis_performance": {"HBD": 81.4, "CBP": 84.6, "CCS": 88.9, "BCS": 85.1, "MAD": 77.3},
+        "hedis_performance": {"HBD": 81.4, "CBP": 84.6, "COL": 88.9, "BCS": 85.1, "MAD": 77.3},
         "gap_closure_rate": 68.2,
         "star_contribution": 0.12,
         "peer_ranking": "Top 35%",
@@ -79,7 +79,7 @@ PROVIDER_NETWORK = [
         "panel_size": 1156,
         "avg_risk_score": 2.4,
         "quality_score": 93.7,
-        "hedis_performance": {"HBD": 91.8, "CBP": 93.2, "CCS": 95.6, "BCS": 89.4, "MAD": 86.7},
+        "hedis_performance": {"HBD": 91.8, "CBP": 93.2, "COL": 95.6, "BCS": 89.4, "MAD": 86.7},
         "gap_closure_rate": 81.4,
         "star_contribution": 0.19,
         "peer_ranking": "Top 10%",
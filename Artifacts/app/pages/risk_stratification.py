@@ -8,6 +8,7 @@ from components.mobile_layout import (
     mobile_page,
     progress_bar,
 )
+from raf_engine import get_risk_population
 from shiny import render, ui
 
 
@@ -19,109 +20,45 @@ def _is_on_risk_page(input):
         return False
 
 
-# HCC Risk Categories and Sample Data
+# HCC Risk Categories — count / avg_raf / revenue_pmpm come from raf_engine scores
 RISK_CATEGORIES = {
     "Very High": {
         "threshold": "≥3.0",
         "color": "#dc3545",
-        "count": 1247,
-        "avg_raf": 3.84,
-        "revenue_pmpm": 2890,
         "description": "Multiple chronic conditions, high utilization",
     },
     "High": {
         "threshold": "2.0-2.99",
         "color": "#ff6b00",
-        "count": 3821,
-        "avg_raf": 2.41,
-        "revenue_pmpm": 1815,
         "description": "Complex chronic conditions, moderate utilization",
     },
     "Medium": {
         "threshold": "1.0-1.99",
         "color": "#ffc107",
-        "count": 8934,
-        "avg_raf": 1.38,
-        "revenue_pmpm": 1040,
         "description": "Stable chronic conditions, routine care",
     },
     "Low": {
         "threshold": "<1.0",
         "color": "#28a745",
-        "count": 4782,
-        "avg_raf": 0.67,
-        "revenue_pmpm": 505,
         "description": "Healthy or minimal conditions",
     },
 }
 
-# Top HCC Categories (V28 model)
-HCC_CATEGORIES = [
-    {
-        "code": "HCC 18",
-        "name": "Diabetes with Chronic Complications",
-        "prevalence": 18.7,
-        "avg_weight": 0.318,
-        "members": 3542,
-        "revenue_impact": 11264000,
-    },
-    {
-        "code": "HCC 85",
-        "name": "Congestive Heart Failure",
-        "prevalence": 14.2,
-        "avg_weight": 0.323,
-        "members": 2689,
-        "revenue_impact": 8684000,
-    },
-    {
-        "code": "HCC 111",
-        "name": "Chronic Obstructive Pulmonary Disease",
-        "prevalence": 12.8,
-        "avg_weight": 0.328,
-        "members": 2425,
-        "revenue_impact": 7952000,
-    },
-    {
-        "code": "HCC 134",
-        "name": "Chronic Kidney Disease Stage 4",
-        "prevalence": 9.3,
-        "avg_weight": 0.237,
-        "members": 1761,
-        "revenue_impact": 4174000,
-    },
-    {
-        "code": "HCC 96",
-        "name": "Ischemic Heart Disease",
-        "prevalence": 8.6,
-        "avg_weight": 0.166,
-        "members": 1629,
-        "revenue_impact": 2704000,
-    },
-    {
-        "code": "HCC 19",
-        "name": "Diabetes without Complication",
-        "prevalence": 7.4,
-        "avg_weight": 0.104,
-        "members": 1402,
-        "revenue_impact": 1458000,
-    },
-    {
-        "code": "HCC 108",
-        "name": "Vascular Disease",
-        "prevalence": 6.9,
-        "avg_weight": 0.288,
-        "members": 1307,
-        "revenue_impact": 3765000,
-    },
-    {
-        "code": "HCC 23",
-        "name": "Other Endocrine/Metabolic/Nutritional",
-        "prevalence": 5.8,
-        "avg_weight": 0.207,
-        "members": 1098,
-        "revenue_impact": 2273000,
-    },
-]
+
+def risk_categories() -> dict[str, dict]:
+    """RISK_CATEGORIES with count, avg_raf and revenue_pmpm from the scored population."""
+    stats = get_risk_population().summary()
+    return {name: {**cat, **stats[name]} for name, cat in RISK_CATEGORIES.items()}
+
+
+# Top HCC Categories (V28 model) — rows shown in the detailed analysis
+HCC_CATEGORY_ROWS = 8
+
+
+def hcc_categories(n: int = HCC_CATEGORY_ROWS) -> list[dict]:
+    """Top HCCs by revenue impact: paid-member counts and prevalence from raf_engine scores."""
+    return get_risk_population().hcc_summary()[:n]
+
 
 # Member Segments (Risk Trajectory)
 MEMBER_SEGMENTS = {
@@ -209,14 +146,13 @@ def risk_stratification_server(input, output, session, get_current_page=lambda:
     def risk_portfolio_summary():
         if not _is_on_risk_page(input):
             return None
-        total_members = sum(cat["count"] for cat in RISK_CATEGORIES.values())
+        categories = risk_categories()
+        total_members = sum(cat["count"] for cat in categories.values())
         weighted_raf = (
-            sum(cat["count"] * cat["avg_raf"] for cat in RISK_CATEGORIES.values()) / total_members
-        )
-        total_revenue = sum(
-            cat["count"] * cat["revenue_pmpm"] * 12 for cat in RISK_CATEGORIES.values()
+            sum(cat["count"] * cat["avg_raf"] for cat in categories.values()) / total_members
         )
-        high_risk_count = RISK_CATEGORIES["Very High"]["count"] + RISK_CATEGORIES["High"]["count"]
+        total_revenue = sum(cat["count"] * cat["revenue_pmpm"] * 12 for cat in categories.values())
+        high_risk_count = categories["Very High"]["count"] + categories["High"]["count"]
         high_risk_pct = (high_risk_count / total_members) * 100
         return ui.div(
             metric_box(
@@ -251,7 +187,8 @@ def risk_stratification_server(input, output, session, get_current_page=lambda:
     def risk_distribution():
         if not _is_on_risk_page(input):
             return None
-        total_members = sum(cat["count"] for cat in RISK_CATEGORIES.values())
+        categories = risk_categories()
+        total_members = sum(cat["count"] for cat in categories.values())
         return ui.div(
             *[
                 ui.div(
@@ -301,7 +238,7 @@ def risk_stratification_server(input, output, session, get_current_page=lambda:
                     class_="risk-category-card",
                     style=f"padding: 1.25rem; background: white; border-left: 4px solid {data['color']}; border-radius: 8px; margin-bottom: 1rem;",
                 )
-                for category, data in RISK_CATEGORIES.items()
+                for category, data in categories.items()
             ]
         )
 
@@ -376,7 +313,7 @@ def risk_stratification_server(input, output, session, get_current_page=lambda:
                     class_="hcc-category-card",
                     style="padding: 1rem; background: #f8f9fa; border-radius: 8px; margin-bottom: 0.75rem; border-left: 3px solid #7c3aed;",
                 )
-                for hcc in HCC_CATEGORIES[:5]
+                for hcc in hcc_categories(5)
             ]
         )
 
@@ -391,8 +328,9 @@ def risk_stratification_server(input, output, session, get_current_page=lambda:
                 return None
         except Exception:
             return None
-        total_revenue = sum(hcc["revenue_impact"] for hcc in HCC_CATEGORIES)
-        total_members_with_hcc = sum(hcc["members"] for hcc in HCC_CATEGORIES)
+        categories = hcc_categories()
+        total_revenue = sum(hcc["revenue_impact"] for hcc in categories)
+        total_members_with_hcc = sum(hcc["members"] for hcc in categories)
         return ui.div(
             mobile_card(
                 "Complete HCC Category Analysis",
@@ -467,7 +405,7 @@ def risk_stratification_server(input, output, session, get_current_page=lambda:
                             class_="hcc-detailed-tile",
                             style="padding: 1.25rem; background: white; border: 2px solid #e0e0e0; border-radius: 12px; margin-bottom: 1rem;",
                         )
-                        for hcc in HCC_CATEGORIES
+                        for hcc in categories
                     ]
                 ),
             ),
@@ -1,5 +1,6 @@
 """ROI Portfolio Optimizer - Interactive priority matrix, budget allocation, financial forecasting."""
 
+import plotly.graph_objects as go
 from components.mobile_layout import (
     alert_box,
     metric_box,
@@ -7,88 +8,32 @@ from components.mobile_layout import (
     mobile_card,
     mobile_page,
 )
+from measure_catalog import get_measure_catalog
+from plotly.offline import get_plotlyjs_version
+from portfolio_optimizer import (
+    DEFAULT_MAX_PCT,
+    DEFAULT_MIN_PCT,
+    get_budget_frontier,
+    get_portfolio_model,
+    whole_percents,
+)
+from reactive_timing import debounce
 from shiny import reactive, render, ui
 
-# 7 HEDIS Measures for portfolio optimization (Impact vs Effort)
+# HEDIS measures for portfolio optimization (Impact vs Effort), from the shared catalog
 # Impact: 1-10 scale from roi_per_point, star_impact, gap. Effort: 1-4 from difficulty
-PORTFOLIO_MEASURES = {
-    "CCS": {
-        "name": "Colorectal Cancer Screening",
-        "impact": 7.2,
-        "effort": 2,
-        "current_rate": 67.3,
-        "benchmark": 75.0,
-        "roi_per_point": 125000,
-        "star_impact": 0.5,
-        "population": 8450,
-    },
-    "HBD": {
-        "name": "Hemoglobin A1c Control",
-        "impact": 8.1,
-        "effort": 3,
-        "current_rate": 58.2,
-        "benchmark": 70.0,
-        "roi_per_point": 95000,
-        "star_impact": 0.6,
-        "population": 5230,
-    },
-    "MAD": {
-        "name": "Medication Adherence - Diabetes",
-        "impact": 6.5,
-        "effort": 1,
-        "current_rate": 71.5,
-        "benchmark": 80.0,
-        "roi_per_point": 110000,
-        "star_impact": 0.4,
-        "population": 4890,
-    },
-    "BCS": {
-        "name": "Breast Cancer Screening",
-        "impact": 6.8,
-        "effort": 1,
-        "current_rate": 73.8,
-        "benchmark": 78.0,
-        "roi_per_point": 105000,
-        "star_impact": 0.5,
-        "population": 6720,
-    },
-    "CBP": {
-        "name": "Controlling High Blood Pressure",
-        "impact": 8.7,
-        "effort": 2,
-        "current_rate": 62.4,
-        "benchmark": 72.0,
-        "roi_per_point": 140000,
-        "star_impact": 0.7,
-        "population": 7650,
-    },
-    "OMW": {
-        "name": "Osteoporosis Management",
-        "impact": 5.4,
-        "effort": 3,
-        "current_rate": 55.6,
-        "benchmark": 68.0,
-        "roi_per_point": 85000,
-        "star_impact": 0.3,
-        "population": 3420,
-    },
-    "COL": {
-        "name": "Follow-Up After ED - Mental Health",
-        "impact": 5.8,
-        "effort": 3,
-        "current_rate": 48.9,
-        "benchmark": 65.0,
-        "roi_per_point": 75000,
-        "star_impact": 0.4,
-        "population": 2180,
-    },
-}
+PORTFOLIO_MEASURES = get_measure_catalog().portfolio_measures.records
+
+# Range of the Total Budget input; the efficient frontier sweeps all of it
+BUDGET_MIN = 50_000
+BUDGET_MAX = 5_000_000
+PLOTLY_JS = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
 
 # Preset allocation scenarios (% of budget per measure)
 SCENARIOS = {
-    "Conservative": {"CCS": 15, "HBD": 10, "MAD": 20, "BCS": 15, "CBP": 20, "OMW": 10, "COL": 10},
-    "Balanced": {"CCS": 18, "HBD": 18, "MAD": 15, "BCS": 15, "CBP": 20, "OMW": 7, "COL": 7},
-    "Aggressive": {"CCS": 10, "HBD": 22, "MAD": 12, "BCS": 10, "CBP": 28, "OMW": 10, "COL": 8},
+    "Conservative": {"COL": 15, "HBD": 10, "MAD": 20, "BCS": 15, "CBP": 20, "OMW": 10, "FUM": 10},
+    "Balanced": {"COL": 18, "HBD": 18, "MAD": 15, "BCS": 15, "CBP": 20, "OMW": 7, "FUM": 7},
+    "Aggressive": {"COL": 10, "HBD": 22, "MAD": 12, "BCS": 10, "CBP": 28, "OMW": 10, "FUM": 8},
 }
 
 
@@ -112,6 +57,71 @@ def _get_quadrant(impact: float, effort: float) -> str:
     return "Hard Slogs"
 
 
+def evaluate_portfolio(
+    model, allocations: dict[str, float], total_budget: float, max_budget: float | None
+) -> dict:
+    """
+    The page's one portfolio evaluation: slider percentages of the total
+    budget, scaled down to the spendable budget (total capped at the max
+    budget) if they exceed it, priced on the response curves. Sliders summing
+    below 100% leave the rest unspent, matching the optimizer's result.
+    Every results card reads this.
+    """
+    spendable = min(total_budget, max_budget) if max_budget else total_budget
+    spend = model.spend_from_percents(
+        [allocations.get(c, 0) for c in model.codes], spendable, total_budget
+    )
+    result = model.evaluate(spend, spendable, total_budget)
+    result["allocations"] = dict(allocations)
+    return result
+
+
+def frontier_figure(frontier, current_budget: float, current_revenue: float, max_budget: float):
+    """Optimal revenue and ROI across the budget sweep, with the slider allocation marked."""
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(
+            x=frontier["budget"],
+            y=frontier["revenue"],
+            name="Optimal revenue",
+            line={"color": "#28a745", "width": 3},
+            hovertemplate="Budget $%{x:,.0f}<br>Revenue $%{y:,.0f}<extra></extra>",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=frontier["budget"],
+            y=frontier["roi"],
+            name="ROI",
+            yaxis="y2",
+            line={"color": "#ff6b00", "width": 2, "dash": "dot"},
+            hovertemplate="Budget $%{x:,.0f}<br>ROI %{y:.2f}x<extra></extra>",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=[current_budget],
+            y=[current_revenue],
+            name="Current sliders",
+            mode="markers",
+            marker={"color": "#7c3aed", "size": 12},
+            hovertemplate="Current $%{x:,.0f}<br>Revenue $%{y:,.0f}<extra></extra>",
+        )
+    )
+    if max_budget < frontier["budget"][-1]:
+        fig.add_vline(x=max_budget, line={"color": "#dc3545", "dash": "dash", "width": 1})
+    fig.update_layout(
+        height=340,
+        margin={"l": 10, "r": 10, "t": 10, "b": 10},
+        legend={"orientation": "h", "y": -0.2},
+        xaxis={"title": "Total budget ($)", "tickformat": "$~s"},
+        yaxis={"title": "Revenue ($)", "tickformat": "$~s"},
+        yaxis2={"title": "ROI (x)", "overlaying": "y", "side": "right", "showgrid": False},
+        plot_bgcolor="#ffffff",
+    )
+    return fig
+
+
 def roi_portfolio_optimizer_ui():
     """UI for ROI Portfolio Optimizer page."""
     return mobile_page(
@@ -135,8 +145,8 @@ def roi_portfolio_optimizer_ui():
                 "roi_total_budget",
                 "Total Budget ($)",
                 value=500000,
-                min=50000,
-                max=5000000,
+                min=BUDGET_MIN,
+                max=BUDGET_MAX,
                 step=25000,
             ),
             ui.output_ui("roi_total_budget_display"),
@@ -147,8 +157,10 @@ def roi_portfolio_optimizer_ui():
                 ),
                 mobile_button("Apply Balanced", "roi_scenario_balanced", "primary", icon=""),
                 mobile_button("Apply Aggressive", "roi_scenario_agg", "secondary", icon=""),
+                mobile_button("Optimize Allocation", "roi_optimize", "primary", icon=""),
                 style="display: flex; flex-direction: column; gap: 0.5rem; margin-top: 1rem;",
             ),
+            ui.output_ui("roi_optimize_status"),
             header_color="linear-gradient(135deg, #28a745 0%, #208537 100%)",
         ),
         mobile_card(
@@ -165,11 +177,19 @@ def roi_portfolio_optimizer_ui():
             ui.input_numeric(
                 "roi_min_allocation_pct",
                 "Min Allocation % per Measure",
-                value=5,
+                value=DEFAULT_MIN_PCT,
                 min=0,
                 max=30,
                 step=1,
             ),
+            ui.input_numeric(
+                "roi_max_allocation_pct",
+                "Max Allocation % per Measure",
+                value=DEFAULT_MAX_PCT,
+                min=5,
+                max=100,
+                step=1,
+            ),
             ui.output_ui("roi_constraint_status"),
         ),
         mobile_card(
@@ -178,11 +198,15 @@ def roi_portfolio_optimizer_ui():
             header_color="#8b5cf6",
         ),
         mobile_card("Portfolio Financial Forecast", ui.output_ui("roi_portfolio_forecast")),
+        mobile_card("Efficient Frontier", ui.output_ui("roi_efficient_frontier")),
+        ui.head_content(ui.tags.script(src=PLOTLY_JS)),
     )
 
 
 def roi_portfolio_optimizer_server(input, output, session, get_current_page=lambda: "star"):
     """Server logic for ROI Portfolio Optimizer."""
+    model = get_portfolio_model()
+    optimized = reactive.Value(None)
 
     def _apply_scenario(scenario_name: str):
         """Update sliders to match preset scenario."""
@@ -214,6 +238,50 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
         except Exception:
             pass
 
+    def _constraints():
+        """(total budget, max budget, min %, max %) from the inputs, with defaults."""
+        try:
+            total_budget = input.roi_total_budget() or 500000
+            max_budget = input.roi_max_budget() or 750000
+            min_pct = input.roi_min_allocation_pct()
+            max_pct = input.roi_max_allocation_pct()
+        except Exception:
+            return 500000, 750000, DEFAULT_MIN_PCT, DEFAULT_MAX_PCT
+        min_pct = DEFAULT_MIN_PCT if min_pct is None else min_pct
+        max_pct = DEFAULT_MAX_PCT if max_pct is None else max_pct
+        return total_budget, max_budget, min_pct, max_pct
+
+    @reactive.Effect
+    @reactive.event(input.roi_optimize)
+    def _on_optimize():
+        total_budget, max_budget, min_pct, max_pct = _constraints()
+        try:
+            result = model.solve(total_budget, min_pct, max_pct, max_budget)
+        except ValueError as e:
+            optimized.set({"error": str(e)})
+            return
+        optimized.set(result)
+        for code, pct in zip(model.codes, whole_percents(result["pct"]), strict=True):
+            ui.update_slider(f"roi_alloc_{code}", value=pct, session=session)
+
+    @output
+    @render.ui
+    def roi_optimize_status():
+        if not _is_on_roi_page(input):
+            return None
+        result = optimized()
+        if result is None:
+            return None
+        if "error" in result:
+            return alert_box(f"Cannot optimize: {result['error']}", type="warning")
+        capped = result["budget"] < result["total_budget"]
+        return alert_box(
+            f"Optimal allocation applied: ${result['spent']:,.0f} spent, "
+            f"${result['total_revenue']:,.0f} projected revenue "
+            f"({result['roi']:.2f}x)" + (" — capped at the max budget." if capped else "."),
+            type="success",
+        )
+
     @output
     @render.ui
     def roi_priority_matrix():
@@ -308,6 +376,19 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
                 out[code] = 100 // len(PORTFOLIO_MEASURES)
         return out
 
+    @reactive.calc
+    def _slider_allocations():
+        return _get_allocations()
+
+    # Dragging a slider or applying a preset (7 slider updates) settles into
+    # one evaluation once the sliders have been still for DEBOUNCE_SECONDS
+    allocations = debounce(_slider_allocations)
+
+    @reactive.calc
+    def portfolio():
+        total_budget, max_budget, _, _ = _constraints()
+        return evaluate_portfolio(model, allocations(), total_budget, max_budget)
+
     @output
     @render.ui
     def roi_total_budget_display():
@@ -343,13 +424,11 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
     def roi_constraint_status():
         if not _is_on_roi_page(input):
             return None
-        try:
-            total_budget = input.roi_total_budget() or 500000
-            max_budget = input.roi_max_budget() or 750000
-            min_pct = input.roi_min_allocation_pct() or 5
-        except Exception:
-            total_budget, max_budget, min_pct = 500000, 750000, 5
+        total_budget, max_budget, min_pct, max_pct = _constraints()
         over_budget = total_budget > max_budget
+        outside = [
+            c for c, pct in portfolio()["allocations"].items() if not min_pct <= pct <= max_pct
+        ]
         return ui.div(
             ui.div(
                 "Budget within limit" if not over_budget else "Exceeds max budget",
@@ -360,9 +439,15 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
                 style="font-size: 0.875rem; color: #666; margin-top: 0.5rem;",
             ),
             ui.div(
-                f"Min allocation: {min_pct}% per measure",
+                f"Allocation per measure: {min_pct}% – {max_pct}%",
                 style="font-size: 0.875rem; color: #666; margin-top: 0.25rem;",
             ),
+            ui.div(
+                f"Outside limits: {', '.join(outside)}"
+                if outside
+                else "All measures within limits",
+                style=f"font-size: 0.875rem; margin-top: 0.25rem; color: {'#842029' if outside else '#0f5132'};",
+            ),
         )
 
     @output
@@ -370,35 +455,27 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
     def roi_scenario_results():
         if not _is_on_roi_page(input):
             return None
-        try:
-            total_budget = input.roi_total_budget() or 500000
-            allocations = _get_allocations()
-        except Exception:
-            total_budget = 500000
-            allocations = {m: 100 // len(PORTFOLIO_MEASURES) for m in PORTFOLIO_MEASURES}
-        total_pct = sum(allocations.values())
-        scale = (total_pct / 100.0) if total_pct else 1.0
+        result = portfolio()
+        spend = result["spend"]
+        total_revenue = result["total_revenue"]
+        capped = result["budget"] < result["total_budget"]
         rows = []
-        total_revenue = 0
-        for code, m in PORTFOLIO_MEASURES.items():
-            pct = allocations.get(code, 0)
-            alloc_dollars = (total_budget * (pct / 100.0)) / scale if scale else 0
-            gap = m["benchmark"] - m["current_rate"]
-            rev_per_pt = m["roi_per_point"]
-            est_improvement = min(gap, 3.0)
-            rev_impact = rev_per_pt * est_improvement * (pct / 100.0)
-            total_revenue += rev_impact
+        for i, code in enumerate(model.codes):
             rows.append(
                 ui.div(
                     ui.div(
                         ui.tags.strong(code, style="color: #7c3aed;"),
-                        ui.tags.span(f" ${alloc_dollars:,.0f}", style="color: #333;"),
+                        ui.tags.span(f" ${spend[i]:,.0f}", style="color: #333;"),
                         style="margin-bottom: 0.25rem;",
                     ),
                     ui.div(
-                        f"Est. revenue impact: ${rev_impact:,.0f}",
+                        f"Est. revenue impact: ${result['revenue'][i]:,.0f}",
                         style="font-size: 0.9rem; color: #28a745; font-weight: 600;",
                     ),
+                    ui.div(
+                        f"+{result['improvement'][i]:.1f} pts of {model.gap[i]:.1f} pt gap",
+                        style="font-size: 0.8rem; color: #666;",
+                    ),
                     class_="scenario-row",
                     style="padding: 1rem; background: #f8f9fa; border-radius: 8px; margin-bottom: 0.75rem; border-left: 3px solid #7c3aed;",
                 )
@@ -406,9 +483,9 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
         return ui.div(
             metric_box(
                 "Total Budget",
-                f"${total_budget:,.0f}",
+                f"${result['budget']:,.0f}",
                 color="#7c3aed",
-                subtitle="Allocated across measures",
+                subtitle="Capped at max budget" if capped else "Allocated across measures",
             ),
             metric_box(
                 "Projected Revenue",
@@ -418,7 +495,7 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
             ),
             metric_box(
                 "ROI Ratio",
-                f"{(total_revenue / total_budget):.1f}x" if total_budget else "N/A",
+                f"{result['roi']:.1f}x" if result["spent"] else "N/A",
                 color="#ff6b00",
                 subtitle="Return on investment",
             ),
@@ -433,23 +510,11 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
     def roi_portfolio_forecast():
         if not _is_on_roi_page(input):
             return None
-        try:
-            total_budget = input.roi_total_budget() or 500000
-            allocations = _get_allocations()
-        except Exception:
-            total_budget = 500000
-            allocations = {m: 100 // len(PORTFOLIO_MEASURES) for m in PORTFOLIO_MEASURES}
-        total_pct = sum(allocations.values())
-        (total_pct / 100.0) if total_pct else 1.0
-        total_revenue = 0
-        for code, m in PORTFOLIO_MEASURES.items():
-            pct = allocations.get(code, 0)
-            gap = m["benchmark"] - m["current_rate"]
-            rev_per_pt = m["roi_per_point"]
-            est_improvement = min(gap, 3.0)
-            total_revenue += rev_per_pt * est_improvement * (pct / 100.0)
-        roi_ratio = total_revenue / total_budget if total_budget else 0
-        net_benefit = total_revenue - total_budget
+        result = portfolio()
+        investment = result["spent"]
+        total_revenue = result["total_revenue"]
+        roi_ratio = result["roi"]
+        net_benefit = total_revenue - investment
         return ui.div(
             ui.div(
                 ui.tags.h3(
@@ -459,7 +524,7 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
                 ui.div(
                     ui.div("Total Investment", style="font-size: 0.875rem; color: #666;"),
                     ui.div(
-                        f"${total_budget:,.0f}",
+                        f"${investment:,.0f}",
                         style="font-size: 2rem; font-weight: 700; color: #1a1a1a;",
                     ),
                     style="text-align: center; padding: 1rem; background: #f8f9fa; border-radius: 8px; margin-bottom: 0.75rem;",
@@ -491,10 +556,37 @@ def roi_portfolio_optimizer_server(input, output, session, get_current_page=lamb
                 style="margin-bottom: 1.5rem;",
             ),
             alert_box(
-                "Forecasts assume 1–3% improvement per measure based on allocation weight. Actual results vary by intervention execution.",
+                "Forecasts use diminishing-returns response curves: each measure's gain flattens as spend approaches its benchmark gap. Actual results vary by intervention execution.",
                 type="info",
             ),
         )
 
+    @output
+    @render.ui
+    def roi_efficient_frontier():
+        if not _is_on_roi_page(input):
+            return None
+        total_budget, max_budget, min_pct, max_pct = _constraints()
+        try:
+            frontier = get_budget_frontier(
+                BUDGET_MIN, BUDGET_MAX, float(min_pct), float(max_pct), float(max_budget)
+            )
+        except ValueError as e:
+            return alert_box(f"Cannot compute frontier: {e}", type="warning")
+        fig = frontier_figure(frontier, total_budget, portfolio()["total_revenue"], max_budget)
+        return ui.div(
+            ui.HTML(
+                fig.to_html(
+                    full_html=False, include_plotlyjs=False, config={"displayModeBar": False}
+                )
+            ),
+            ui.tags.p(
+                f"Optimal allocation at {len(frontier['budget'])} budgets from "
+                f"${BUDGET_MIN:,.0f} to ${BUDGET_MAX:,.0f}; spend above the max budget "
+                f"(${max_budget:,.0f}) is not deployed.",
+                style="font-size: 0.8rem; color: #666; margin-top: 0.5rem;",
+            ),
+        )
+
 
 __all__ = ["roi_portfolio_optimizer_ui", "roi_portfolio_optimizer_server"]
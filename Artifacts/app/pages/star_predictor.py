@@ -1,7 +1,6 @@
 """Star Rating Predictor page - Mobile optimized."""
 
-import random
-
+import numpy as np
 from components.mobile_layout import (
     alert_box,
     divider,
@@ -12,40 +11,19 @@ from components.mobile_layout import (
     mobile_page,
 )
 from shiny import reactive, render, ui
+from star_prediction_engine import (
+    CI_LEVEL,
+    SIMULATION_DRAWS,
+    SIMULATION_SEED,
+    STAR_LEVELS,
+    get_contract_predictions,
+    get_star_engine,
+)
+from star_thresholds import star_label
 
-# Sample Medicare Advantage contracts data
-SAMPLE_CONTRACTS = {
-    "H1234": {
-        "name": "BlueCross Medicare Advantage Plus",
-        "current_stars": 3.5,
-        "members": 45230,
-        "state": "Pennsylvania",
-    },
-    "H5678": {
-        "name": "UnitedHealthcare MA Premier",
-        "current_stars": 4.0,
-        "members": 78450,
-        "state": "California",
-    },
-    "H9012": {
-        "name": "Humana Gold Plus",
-        "current_stars": 4.5,
-        "members": 62180,
-        "state": "Florida",
-    },
-    "H3456": {
-        "name": "Aetna Medicare Advantage",
-        "current_stars": 3.0,
-        "members": 38920,
-        "state": "Texas",
-    },
-    "H7890": {
-        "name": "Cigna HealthSpring",
-        "current_stars": 3.5,
-        "members": 51340,
-        "state": "Arizona",
-    },
-}
+# Medicare Advantage contracts scored once by the star prediction engine
+# (data/contract_measure_rates.csv × measure catalog cut points)
+SAMPLE_CONTRACTS = get_contract_predictions()
 
 
 def star_predictor_ui():
@@ -90,6 +68,10 @@ def star_predictor_ui():
 
 def star_predictor_server(input, output, session, get_current_page=lambda: "star"):
     """Server logic for star rating predictor. get_current_page() returns active page id."""
+    # One seeded Generator per session: reproducible within the session and
+    # never shared across the threads serving other sessions
+    rng = np.random.default_rng(SIMULATION_SEED)
+    engine = get_star_engine()
 
     @output
     @render.ui
@@ -138,49 +120,35 @@ def star_predictor_server(input, output, session, get_current_page=lambda: "star
             )
 
         contract = SAMPLE_CONTRACTS[contract_id]
+        if contract["predicted_stars"] is None:
+            return mobile_card(
+                "⚠️ Not Rated",
+                alert_box(
+                    "No measure rates are on file for this contract, so it cannot be rated yet.",
+                    type="warning",
+                ),
+            )
 
-        # Mock AI prediction algorithm
+        # Deterministic CMS-style prediction: measure cut points → weighted summary
         base_stars = contract["current_stars"]
+        predicted_stars = contract["predicted_stars"]
 
-        # Generate prediction with some variance
-        random.seed(hash(contract_id))
-        trend_factor = random.uniform(-0.3, 0.6)
-        variance = random.uniform(-0.2, 0.2)
-
-        predicted_stars = base_stars + trend_factor + variance
-        predicted_stars = round(max(1.0, min(5.0, predicted_stars)), 1)
-
-        # Calculate confidence interval
-        confidence_low = round(max(1.0, predicted_stars - 0.3), 1)
-        confidence_high = round(min(5.0, predicted_stars + 0.3), 1)
+        # Monte Carlo over measure-rate uncertainty for this contract
+        rates = np.array([[contract["rates"][code] for code in engine.codes]])
+        sim = engine.simulate(rates, SIMULATION_DRAWS, rng)
+        confidence_low = float(sim["ci_low"][0])
+        confidence_high = float(sim["ci_high"][0])
+        p_at_least = dict(zip(STAR_LEVELS.tolist(), sim["p_at_least"][0].tolist(), strict=True))
 
         # Calculate change
         change = predicted_stars - base_stars
         change_text = f"+{change:.1f}" if change > 0 else f"{change:.1f}"
         change_color = "#28a745" if change > 0 else "#dc3545" if change < 0 else "#666"
 
-        # Determine rating category
-        if predicted_stars >= 4.5:
-            rating_category = "⭐⭐⭐⭐⭐ Excellent"
-            category_color = "#28a745"
-        elif predicted_stars >= 4.0:
-            rating_category = "⭐⭐⭐⭐ Very Good"
-            category_color = "#17a2b8"
-        elif predicted_stars >= 3.5:
-            rating_category = "⭐⭐⭐ Good"
-            category_color = "#ffc107"
-        elif predicted_stars >= 3.0:
-            rating_category = "⭐⭐ Fair"
-            category_color = "#ff6b00"
-        else:
-            rating_category = "⭐ Needs Improvement"
-            category_color = "#dc3545"
-
-        # Calculate bonus revenue
-        bonus_per_member = {5.0: 150, 4.5: 125, 4.0: 100, 3.5: 75, 3.0: 50}
-        star_level = round(predicted_stars * 2) / 2
-        bonus = bonus_per_member.get(star_level, 25)
-        total_bonus = contract["members"] * bonus
+        stars_glyph, category_color, category_label = star_label(predicted_stars)
+        rating_category = f"{stars_glyph} {category_label}"
+
+        total_bonus = contract["bonus_revenue"]
 
         return ui.div(
             mobile_card(
@@ -200,6 +168,11 @@ def star_predictor_server(input, output, session, get_current_page=lambda: "star
                     ),
                     style="background: #f8f9fa; padding: 1.5rem; border-radius: 12px; margin-bottom: 1.5rem;",
                 ),
+                ui.tags.div(
+                    f"Weighted summary score {contract['summary_score']:.2f} "
+                    "(rounded to the nearest half star)",
+                    style="font-size: 0.8rem; color: #666; text-align: center; margin-bottom: 1rem;",
+                ),
                 ui.div(
                     ui.tags.strong("Change from Current: "),
                     ui.tags.span(
@@ -208,19 +181,43 @@ def star_predictor_server(input, output, session, get_current_page=lambda: "star
                     ),
                     style="text-align: center; margin-bottom: 1.5rem;",
                 ),
+                ui.tags.h3(
+                    "Measure Stars",
+                    style="color: #666 !important; font-size: 0.875rem; font-weight: 600; text-transform: uppercase; margin: 1.5rem 0 1rem 0; padding-bottom: 0.5rem; border-bottom: 2px solid #e0e0e0;",
+                ),
+                ui.div(
+                    *[
+                        info_row(
+                            code,
+                            f"{'★' * stars} ({contract['rates'][code]:.1f}%)" if stars else "—",
+                        )
+                        for code, stars in contract["measure_stars"].items()
+                    ],
+                ),
                 ui.tags.h3(
                     "Confidence Interval",
                     style="color: #666 !important; font-size: 0.875rem; font-weight: 600; text-transform: uppercase; margin: 1.5rem 0 1rem 0; padding-bottom: 0.5rem; border-bottom: 2px solid #e0e0e0;",
                 ),
                 ui.div(
                     ui.tags.h4(
-                        "95% Confidence Interval",
+                        f"{CI_LEVEL:.0%} Confidence Interval",
                         style="color: #7c3aed; margin-bottom: 0.75rem; font-size: 1rem;",
                     ),
                     ui.tags.p(
                         f"{confidence_low} - {confidence_high} stars",
                         style="font-size: 1.25rem; font-weight: 600; color: #333; margin: 0;",
                     ),
+                    ui.tags.p(
+                        f"{SIMULATION_DRAWS:,} simulated measurement years",
+                        style="font-size: 0.8rem; color: #666; margin: 0.25rem 0 0 0;",
+                    ),
+                    style="margin-bottom: 1rem;",
+                ),
+                ui.div(
+                    *[
+                        info_row(f"Reach {level} ★", f"{p_at_least[level]:.0%}")
+                        for level in (3.0, 3.5, 4.0, 4.5, 5.0)
+                    ],
                     style="margin-bottom: 1.5rem;",
                 ),
                 ui.tags.h3(
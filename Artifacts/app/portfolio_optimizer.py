@@ -0,0 +1,247 @@
+# portfolio_optimizer.py
+# ─────────────────────────────────────────────────────────────
+# ROI Portfolio Optimizer — revenue model + constrained budget allocation
+# StarGuard Mobile | reichert-science-intelligence
+# Portfolio measures from the measure catalog as aligned arrays; concave
+# response curves (spend → rate points, saturating at the benchmark gap);
+# solve() finds the revenue-maximizing spend per measure under total-budget,
+# max-budget and per-measure min/max % constraints; frontier() re-solves it
+# for a whole budget sweep in one batched pass (cached per parameter set)
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+from measure_catalog import MeasureCatalog, get_measure_catalog
+
+DEFAULT_MIN_PCT = 5
+DEFAULT_MAX_PCT = 40
+# Budget points in the efficient-frontier sweep
+FRONTIER_STEPS = 200
+# Bisection steps on the marginal-return level (log space) in allocate()
+_SOLVER_STEPS = 60
+
+
+class PortfolioModel:
+    """
+    Revenue model over the portfolio measures.
+
+    Each measure has a concave response curve: spend s buys
+    gap × (1 − exp(−s / saturation_spend)) rate points, approaching the
+    benchmark gap as spend grows; each point is worth roi_per_point.
+    Spend arrays are aligned with `codes` and may carry leading batch axes.
+    """
+
+    def __init__(
+        self,
+        codes: list[str],
+        roi_per_point: np.ndarray,
+        gap: np.ndarray,
+        saturation_spend: np.ndarray,
+    ) -> None:
+        self.codes: tuple[str, ...] = tuple(codes)
+        self.roi_per_point = np.asarray(roi_per_point, dtype=np.float64)
+        self.gap = np.maximum(np.asarray(gap, dtype=np.float64), 0.0)
+        self.saturation_spend = np.asarray(saturation_spend, dtype=np.float64)
+        if (self.saturation_spend <= 0).any():
+            raise ValueError("saturation_spend must be positive")
+        # Revenue if the whole gap were closed, and marginal return at $0
+        self.full_value = self.roi_per_point * self.gap
+        self.initial_return = self.full_value / self.saturation_spend
+
+    @classmethod
+    def from_catalog(cls, catalog: MeasureCatalog) -> "PortfolioModel":
+        m = catalog.portfolio_measures
+        return cls(
+            list(m),
+            m.column("roi_per_point"),
+            m.column("benchmark") - m.column("current_rate"),
+            m.column("saturation_spend"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def improvement(self, spend: np.ndarray) -> np.ndarray:
+        """Rate points gained per measure for spend ($) of shape (..., n_measures)."""
+        spend = np.maximum(np.asarray(spend, dtype=np.float64), 0.0)
+        return self.gap * -np.expm1(-spend / self.saturation_spend)
+
+    def revenue(self, spend: np.ndarray) -> np.ndarray:
+        """Per-measure revenue for spend ($) of shape (..., n_measures)."""
+        return self.roi_per_point * self.improvement(spend)
+
+    def marginal_return(self, spend: np.ndarray) -> np.ndarray:
+        """Revenue per extra dollar on each measure at the given spend."""
+        spend = np.maximum(np.asarray(spend, dtype=np.float64), 0.0)
+        return self.initial_return * np.exp(-spend / self.saturation_spend)
+
+    def _spend_at(self, level: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """Spend where each measure's marginal return falls to `level` (…, 1), clipped."""
+        with np.errstate(divide="ignore"):
+            s = self.saturation_spend * np.log(self.initial_return / level)
+        return np.clip(s, low, high)
+
+    def bounds(
+        self, budget: float | np.ndarray, min_pct: float, max_pct: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Per-measure (low, high) spend in dollars for a budget, or (b × m) for
+        an array of b budgets; ValueError if the percentages are infeasible.
+        """
+        if min_pct < 0 or max_pct < min_pct:
+            raise ValueError("Need 0 ≤ min % ≤ max % per measure")
+        if min_pct * len(self) > 100:
+            raise ValueError(f"Min {min_pct}% × {len(self)} measures exceeds 100% of the budget")
+        b = np.asarray(budget, dtype=np.float64)[..., None]
+        ones = np.ones(len(self))
+        return b * (min_pct / 100.0) * ones, b * (max_pct / 100.0) * ones
+
+    def solve(
+        self,
+        total_budget: float,
+        min_pct: float = DEFAULT_MIN_PCT,
+        max_pct: float = DEFAULT_MAX_PCT,
+        max_budget: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Revenue-maximizing allocation. Spendable budget is total_budget capped
+        at max_budget; every measure gets at least min_pct and at most max_pct
+        of it. Returns spend ($), pct (of total_budget), revenue per measure
+        and totals.
+        """
+        budget = float(min(total_budget, max_budget)) if max_budget else float(total_budget)
+        low, high = self.bounds(budget, min_pct, max_pct)
+        spend = self.allocate(np.array([budget]), low[None, :], high[None, :])[0]
+        return self.evaluate(spend, budget, total_budget)
+
+    def allocate(self, budgets: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """
+        Optimal spend for a batch of budgets (b,) with per-measure bounds (b × m).
+        The curves are concave, so the optimum equalizes marginal return across
+        measures not held at a bound (greedy marginal-return allocation in the
+        limit of small steps). The common level is found by bisection in log
+        space for every budget at once. Budget beyond every cap stays unspent.
+        """
+        budgets = np.asarray(budgets, dtype=np.float64)[:, None]
+        lo = np.log(np.maximum(self.marginal_return(high).min(axis=1, keepdims=True), 1e-300))
+        hi = np.log(np.maximum(self.marginal_return(low).max(axis=1, keepdims=True), 1e-300))
+        lo, hi = lo - 1.0, hi + 1.0
+        for _ in range(_SOLVER_STEPS):
+            mid = (lo + hi) / 2
+            over = self._spend_at(np.exp(mid), low, high).sum(axis=1, keepdims=True) > budgets
+            lo = np.where(over, mid, lo)
+            hi = np.where(over, hi, mid)
+        spend = self._spend_at(np.exp(hi), low, high)
+        # Hand the bisection remainder to measures still below their caps
+        slack = np.maximum(budgets - spend.sum(axis=1, keepdims=True), 0.0)
+        room = high - spend
+        share = np.divide(
+            room, room.sum(axis=1, keepdims=True), where=room > 0, out=np.zeros_like(room)
+        )
+        return spend + np.minimum(room, slack * share)
+
+    def frontier(
+        self,
+        budget_min: float,
+        budget_max: float,
+        min_pct: float = DEFAULT_MIN_PCT,
+        max_pct: float = DEFAULT_MAX_PCT,
+        max_budget: float | None = None,
+        steps: int = FRONTIER_STEPS,
+    ) -> dict[str, np.ndarray]:
+        """
+        Optimal allocation at `steps` total budgets from budget_min to
+        budget_max, solved as one batch. Spend is capped at max_budget, so the
+        curve goes flat beyond it. Returns per-step budget, spent, spend
+        (steps × m), revenue, net benefit and ROI.
+        """
+        budgets = np.linspace(budget_min, budget_max, steps)
+        spendable = np.minimum(budgets, max_budget) if max_budget else budgets
+        low, high = self.bounds(spendable, min_pct, max_pct)
+        spend = self.allocate(spendable, low, high)
+        spent = spend.sum(axis=1)
+        revenue = self.revenue(spend).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            roi = np.where(spent > 0, revenue / spent, 0.0)
+        return {
+            "budget": budgets,
+            "spent": spent,
+            "spend": spend,
+            "revenue": revenue,
+            "net": revenue - spent,
+            "roi": roi,
+        }
+
+    def evaluate(
+        self, spend: np.ndarray, budget: float, total_budget: float | None = None
+    ) -> dict[str, Any]:
+        """Totals for a spend vector ($ per measure)."""
+        total_budget = budget if total_budget is None else total_budget
+        spend = np.asarray(spend, dtype=np.float64)
+        revenue = self.revenue(spend)
+        spent = float(spend.sum())
+        total_revenue = float(revenue.sum())
+        return {
+            "spend": spend,
+            "pct": spend / total_budget * 100.0 if total_budget else np.zeros(len(self)),
+            "improvement": self.improvement(spend),
+            "revenue": revenue,
+            "budget": budget,
+            "total_budget": total_budget,
+            "spent": spent,
+            "total_revenue": total_revenue,
+            "roi": total_revenue / spent if spent else 0.0,
+        }
+
+    def spend_from_percents(
+        self, pct: np.ndarray, budget: float, total_budget: float | None = None
+    ) -> np.ndarray:
+        """
+        Dollars per measure for slider percentages of total_budget (default:
+        budget). Scaled down only if they would spend more than budget; a
+        share below 100% stays unspent, as it does in solve() under tight caps.
+        """
+        total_budget = budget if total_budget is None else total_budget
+        spend = np.asarray(pct, dtype=np.float64) * (total_budget / 100.0)
+        spent = spend.sum()
+        return spend * (budget / spent) if spent > budget else spend
+
+
+def whole_percents(pct: np.ndarray) -> list[int]:
+    """Round percentages to integers (slider steps) keeping their rounded sum."""
+    pct = np.asarray(pct, dtype=np.float64)
+    floor = np.floor(pct)
+    short = int(round(pct.sum() - floor.sum()))
+    order = np.argsort(-(pct - floor), kind="stable")
+    floor[order[:short]] += 1
+    return floor.astype(int).tolist()
+
+
+@lru_cache(maxsize=1)
+def get_portfolio_model() -> PortfolioModel:
+    """Process-wide model over the shared measure catalog."""
+    return PortfolioModel.from_catalog(get_measure_catalog())
+
+
+@lru_cache(maxsize=32)
+def get_budget_frontier(
+    budget_min: float,
+    budget_max: float,
+    min_pct: float,
+    max_pct: float,
+    max_budget: float | None,
+    steps: int = FRONTIER_STEPS,
+) -> dict[str, np.ndarray]:
+    """
+    Efficient frontier of the shared model, cached per parameter set and
+    shared by every session. Arrays are read-only.
+    """
+    out = get_portfolio_model().frontier(
+        budget_min, budget_max, min_pct, max_pct, max_budget, steps
+    )
+    for arr in out.values():
+        arr.flags.writeable = False
+    return out
@@ -0,0 +1,566 @@
+# raf_engine.py
+# ─────────────────────────────────────────────────────────────
+# RAF Scoring Engine — vectorized CMS-HCC risk adjustment factors
+# StarGuard Mobile | reichert-science-intelligence
+# Members × HCCs as a sparse CSR indicator matrix (numpy indptr/indices);
+# hierarchies, disease coefficients, disease interactions, payment-HCC
+# counts and age/sex demographics are applied to every member at once
+# (boolean masks + np.bincount), so a 1M-member population scores in seconds
+# Hierarchies compile to a dominance bitmask per HCC: one bitwise-OR pass
+# gives every member's trumped-HCC bits (python raf_engine.py benchmarks it
+# against a per-member loop)
+# RiskPopulation keeps per-member HCC bits, scores and tier aggregates and
+# applies diagnosis deltas by rescoring only the members they touch
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import re
+import sys
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+# ── Model tables (community, non-dual, aged segment) ─────────
+# HCC → (label, relative factor, synthetic-population prevalence %)
+HCC_MODEL: dict[int, tuple[str, float, float]] = {
+    8: ("Metastatic Cancer and Acute Leukemia", 2.659, 1.2),
+    9: ("Lung and Other Severe Cancers", 1.024, 1.0),
+    10: ("Lymphoma and Other Cancers", 0.675, 1.1),
+    12: ("Breast, Prostate, and Other Cancers", 0.150, 4.5),
+    17: ("Diabetes with Acute Complications", 0.302, 1.5),
+    18: ("Diabetes with Chronic Complications", 0.318, 18.7),
+    19: ("Diabetes without Complication", 0.104, 7.4),
+    23: ("Other Endocrine/Metabolic/Nutritional", 0.207, 5.8),
+    40: ("Rheumatoid Arthritis and Inflammatory Connective Tissue Disease", 0.421, 3.0),
+    59: ("Major Depressive, Bipolar, and Paranoid Disorders", 0.309, 6.0),
+    84: ("Cardio-Respiratory Failure and Shock", 0.282, 3.5),
+    85: ("Congestive Heart Failure", 0.323, 14.2),
+    86: ("Acute Myocardial Infarction", 0.195, 1.4),
+    87: ("Unstable Angina and Other Acute Ischemic Heart Disease", 0.195, 1.0),
+    88: ("Angina Pectoris", 0.135, 3.0),
+    96: ("Ischemic Heart Disease", 0.166, 8.6),
+    106: ("Atherosclerosis of the Extremities with Ulceration or Gangrene", 1.488, 0.8),
+    107: ("Vascular Disease with Complications", 0.383, 2.0),
+    108: ("Vascular Disease", 0.288, 6.9),
+    110: ("Cystic Fibrosis", 0.510, 0.2),
+    111: ("Chronic Obstructive Pulmonary Disease", 0.328, 12.8),
+    112: ("Fibrosis of Lung and Other Chronic Lung Disorders", 0.219, 1.0),
+    134: ("Chronic Kidney Disease Stage 4", 0.237, 9.3),
+    135: ("Chronic Kidney Disease Stage 5", 0.289, 1.5),
+    138: ("Chronic Kidney Disease Stage 3", 0.069, 8.0),
+    189: ("Amputation Status, Lower Limb/Amputation Complications", 0.519, 0.5),
+}
+# HCC → HCCs it trumps (only the most severe HCC in a family is paid)
+HCC_HIERARCHIES: dict[int, tuple[int, ...]] = {
+    8: (9, 10, 12),
+    9: (10, 12),
+    10: (12,),
+    17: (18, 19),
+    18: (19,),
+    86: (87, 88),
+    87: (88,),
+    106: (107, 108),
+    107: (108,),
+    110: (111, 112),
+    111: (112,),
+    135: (134, 138),
+    134: (138,),
+}
+# Condition groups used by the interaction terms
+HCC_GROUPS: dict[str, tuple[int, ...]] = {
+    "DIABETES": (17, 18, 19),
+    "CHF": (85,),
+    "COPD": (110, 111, 112),
+    "RENAL": (134, 135, 138),
+}
+# (group, group) → factor added when a member has both
+INTERACTIONS: dict[tuple[str, str], float] = {
+    ("DIABETES", "CHF"): 0.121,
+    ("CHF", "COPD"): 0.155,
+    ("CHF", "RENAL"): 0.156,
+}
+# Payment-HCC count → factor (index = count; the last entry applies to 10+)
+HCC_COUNT_FACTORS = np.array([0.0, 0.0, 0.0, 0.0, 0.006, 0.042, 0.077, 0.126, 0.168, 0.204, 0.398])
+# Age band lower bounds and (female, male) demographic factors per band
+AGE_BANDS = np.array([0, 35, 45, 55, 60, 65, 70, 75, 80, 85, 90, 95])
+DEMOGRAPHIC_FACTORS = np.array(
+    [
+        [0.209, 0.280, 0.306, 0.339, 0.370, 0.323, 0.386, 0.451, 0.528, 0.643, 0.783, 0.801],
+        [0.161, 0.192, 0.259, 0.293, 0.318, 0.310, 0.389, 0.476, 0.566, 0.690, 0.871, 0.886],
+    ]
+)
+
+# ── Risk tiers ────────────────────────────────────────────────
+# Minimum RAF → tier name (same bands as the risk stratification page)
+RISK_TIERS = {3.0: "Very High", 2.0: "High", 1.0: "Medium", 0.0: "Low"}
+# Capitation $ PMPM per 1.0 RAF
+BASE_RATE_PMPM = 753.0
+
+# Synthetic scoring population for the dashboard (enrolled members)
+POPULATION_SIZE = 18_784
+POPULATION_SEED = 2026
+_POPULATION_CHUNK = 100_000
+
+_WORD_BITS = 64
+_TIER_BOUNDS = np.array(sorted(RISK_TIERS))
+_TIER_NAMES = [RISK_TIERS[t] for t in sorted(RISK_TIERS)]
+
+
+def _pack_bits(flags: np.ndarray) -> np.ndarray:
+    """(k × n) bool → (k × ceil(n/64)) uint64, bit j of word j // 64 = column j."""
+    k, n = flags.shape
+    words = -(-n // _WORD_BITS)
+    padded = np.zeros((k, words * _WORD_BITS), dtype=np.uint64)
+    padded[:, :n] = flags
+    shifts = np.arange(_WORD_BITS, dtype=np.uint64)
+    return np.bitwise_or.reduce(padded.reshape(k, words, _WORD_BITS) << shifts, axis=2)
+
+
+def _unpack_bits(words: np.ndarray, n: int) -> np.ndarray:
+    """Inverse of _pack_bits: (k × words) uint64 → (k × n) bool."""
+    cols = np.arange(n)
+    shifts = (cols % _WORD_BITS).astype(np.uint64)
+    return ((words[:, cols // _WORD_BITS] >> shifts) & np.uint64(1)).astype(bool)
+
+
+def parse_hcc(code: int | str) -> int:
+    """HCC number from 18, "18" or "HCC 18"."""
+    if isinstance(code, (int, np.integer)):
+        return int(code)
+    match = re.search(r"\d+", str(code))
+    if match is None:
+        raise ValueError(f"Not an HCC code: {code!r}")
+    return int(match.group())
+
+
+class HccMatrix:
+    """
+    Sparse members × HCC indicator matrix in CSR form: the HCC columns of
+    member i are cols[indptr[i]:indptr[i + 1]], sorted and unique.
+    """
+
+    def __init__(self, indptr: np.ndarray, cols: np.ndarray, n_hccs: int) -> None:
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int32)
+        self.n_hccs = n_hccs
+
+    @classmethod
+    def from_pairs(
+        cls, members: np.ndarray, cols: np.ndarray, n_members: int, n_hccs: int
+    ) -> "HccMatrix":
+        """Build from (member row, HCC column) pairs in any order; duplicates collapse."""
+        members = np.asarray(members, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        key = np.unique(members * n_hccs + cols)
+        rows = key // n_hccs
+        indptr = np.zeros(n_members + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_members), out=indptr[1:])
+        return cls(indptr, key % n_hccs, n_hccs)
+
+    @property
+    def n_members(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self) -> int:
+        return len(self.cols)
+
+    def row_ids(self) -> np.ndarray:
+        """Member row of every stored entry (aligned with cols)."""
+        return np.repeat(np.arange(self.n_members), np.diff(self.indptr))
+
+    def member_cols(self, i: int) -> np.ndarray:
+        return self.cols[self.indptr[i] : self.indptr[i + 1]]
+
+
+class RafModel:
+    """
+    CMS-HCC RAF model over the module tables. Columns of an HccMatrix are
+    positions in `codes`; score() applies the whole model with array ops.
+    """
+
+    def __init__(
+        self,
+        model: dict[int, tuple[str, float, float]] = HCC_MODEL,
+        hierarchies: dict[int, tuple[int, ...]] = HCC_HIERARCHIES,
+        groups: dict[str, tuple[int, ...]] = HCC_GROUPS,
+        interactions: dict[tuple[str, str], float] = INTERACTIONS,
+    ) -> None:
+        self.codes = np.array(sorted(model), dtype=np.int64)
+        self.labels = [model[c][0] for c in self.codes]
+        self.coefficients = np.array([model[c][1] for c in self.codes])
+        self.prevalence = np.array([model[c][2] for c in self.codes]) / 100.0
+        self._col_of = np.full(int(self.codes.max()) + 1, -1, dtype=np.int64)
+        self._col_of[self.codes] = np.arange(len(self.codes))
+        self.hierarchies = {
+            self.column(parent): self.columns(children) for parent, children in hierarchies.items()
+        }
+        self.trumps = np.zeros((len(self.codes), len(self.codes)), dtype=bool)
+        for parent, children in self.hierarchies.items():
+            self.trumps[parent, children] = True
+        # (n_hccs × words) uint64: bit j of row i set when HCC column i trumps
+        # column j. Like the CMS tables, each HCC lists everything it trumps;
+        # trumping is not chained through HCCs the member lacks.
+        self.dominance = _pack_bits(self.trumps)
+        self.group_names = list(groups)
+        self.group_of = np.zeros((len(groups), len(self.codes)), dtype=bool)
+        for g, members in enumerate(groups.values()):
+            self.group_of[g, self.columns(members)] = True
+        self.interaction_terms = [
+            (self.group_names.index(a), self.group_names.index(b), factor)
+            for (a, b), factor in interactions.items()
+        ]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def column(self, code: int | str) -> int:
+        """Matrix column of one HCC; ValueError if the model does not pay it."""
+        c = parse_hcc(code)
+        col = int(self._col_of[c]) if 0 <= c < len(self._col_of) else -1
+        if col < 0:
+            raise ValueError(f"HCC {c} is not in the model")
+        return col
+
+    def columns(self, codes: Iterable[int | str] | np.ndarray) -> np.ndarray:
+        """Matrix columns of many HCCs (integer arrays are looked up vectorized)."""
+        if isinstance(codes, np.ndarray) and codes.dtype.kind in "iu":
+            inside = (codes >= 0) & (codes < len(self._col_of))
+            cols = np.where(inside, self._col_of[np.where(inside, codes, 0)], -1)
+            if (cols < 0).any():
+                raise ValueError(f"HCC {codes[cols < 0][0]} is not in the model")
+            return cols.astype(np.int64)
+        return np.array([self.column(c) for c in codes], dtype=np.int64)
+
+    def matrix(self, member_hccs: Sequence[Iterable[int | str]]) -> HccMatrix:
+        """HccMatrix from one HCC list per member; codes outside the model are ignored."""
+        rows, cols = [], []
+        for i, hccs in enumerate(member_hccs):
+            for code in hccs:
+                c = parse_hcc(code)
+                if 0 <= c < len(self._col_of) and self._col_of[c] >= 0:
+                    rows.append(i)
+                    cols.append(self._col_of[c])
+        return HccMatrix.from_pairs(np.array(rows), np.array(cols), len(member_hccs), len(self))
+
+    def apply_hierarchies(self, matrix: HccMatrix) -> np.ndarray:
+        """
+        Boolean mask over matrix entries: False where a present HCC trumps it.
+        Each member's trumped set is the OR of its HCCs' dominance rows; an
+        entry is dropped when its own bit is in that set.
+        """
+        rows = matrix.row_ids()
+        cols = matrix.cols
+        trumped = np.zeros((matrix.n_members, self.dominance.shape[1]), dtype=np.uint64)
+        np.bitwise_or.at(trumped, rows, self.dominance[cols])
+        word = cols // _WORD_BITS
+        bit = np.left_shift(np.uint64(1), (cols % _WORD_BITS).astype(np.uint64))
+        return (trumped[rows, word] & bit) == 0
+
+    def member_bits(self, matrix: HccMatrix) -> np.ndarray:
+        """Present HCCs per member as packed bits (n_members × words) uint64."""
+        bits = np.zeros((matrix.n_members, self.dominance.shape[1]), dtype=np.uint64)
+        cols = matrix.cols
+        bit = np.left_shift(np.uint64(1), (cols % _WORD_BITS).astype(np.uint64))
+        np.bitwise_or.at(bits, (matrix.row_ids(), cols // _WORD_BITS), bit)
+        return bits
+
+    def demographic(self, age: np.ndarray, female: np.ndarray) -> np.ndarray:
+        band = np.searchsorted(AGE_BANDS, np.asarray(age), side="right") - 1
+        sex = np.where(np.asarray(female, dtype=bool), 0, 1)
+        return DEMOGRAPHIC_FACTORS[sex, np.clip(band, 0, len(AGE_BANDS) - 1)]
+
+    def score(
+        self, matrix: HccMatrix, age: np.ndarray, female: np.ndarray
+    ) -> dict[str, np.ndarray]:
+        """
+        RAF per member = demographic + paid HCC factors + interactions +
+        payment-HCC count factor. Returns raf and its components (n_members,).
+        """
+        n = matrix.n_members
+        keep = self.apply_hierarchies(matrix)
+        rows = matrix.row_ids()[keep]
+        cols = matrix.cols[keep]
+        disease = np.bincount(rows, weights=self.coefficients[cols], minlength=n)
+        count = np.bincount(rows, minlength=n)
+        has_group = np.zeros((len(self.group_names), n), dtype=bool)
+        for g in range(len(self.group_names)):
+            has_group[g, rows[self.group_of[g, cols]]] = True
+        interaction = np.zeros(n)
+        for a, b, factor in self.interaction_terms:
+            interaction += factor * (has_group[a] & has_group[b])
+        count_factor = HCC_COUNT_FACTORS[np.minimum(count, len(HCC_COUNT_FACTORS) - 1)]
+        demographic = self.demographic(age, female)
+        return {
+            "raf": demographic + disease + interaction + count_factor,
+            "demographic": demographic,
+            "disease": disease,
+            "interaction": interaction,
+            "count_factor": count_factor,
+            "hcc_count": count,
+        }
+
+    def paid_hccs(self, present: np.ndarray) -> np.ndarray:
+        """Dense (k × n_hccs) presence with trumped HCCs cleared (hierarchies applied)."""
+        present = np.asarray(present, dtype=bool)
+        trumped = (present.astype(np.uint8) @ self.trumps.astype(np.uint8)) > 0
+        return present & ~trumped
+
+    def score_present(
+        self, present: np.ndarray, age: np.ndarray, female: np.ndarray
+    ) -> dict[str, np.ndarray]:
+        """
+        score() for a dense (k × n_hccs) presence matrix — the path for small
+        batches of changed members; gives the same result as the sparse path.
+        """
+        paid = self.paid_hccs(present)
+        disease = paid @ self.coefficients
+        count = paid.sum(axis=1)
+        has_group = (paid.astype(np.uint8) @ self.group_of.T.astype(np.uint8)) > 0
+        interaction = np.zeros(len(present))
+        for a, b, factor in self.interaction_terms:
+            interaction += factor * (has_group[:, a] & has_group[:, b])
+        count_factor = HCC_COUNT_FACTORS[np.minimum(count, len(HCC_COUNT_FACTORS) - 1)]
+        demographic = self.demographic(age, female)
+        return {
+            "raf": demographic + disease + interaction + count_factor,
+            "demographic": demographic,
+            "disease": disease,
+            "interaction": interaction,
+            "count_factor": count_factor,
+            "hcc_count": count,
+        }
+
+    def synthetic_population(
+        self, n: int, seed: int = POPULATION_SEED
+    ) -> tuple[HccMatrix, np.ndarray, np.ndarray]:
+        """
+        Seeded population of n members: ages 65–99, sexes 50/50, HCCs drawn
+        at the model prevalences scaled by a per-member frailty (gamma, mean
+        1) so conditions cluster the way chronic multimorbidity does.
+        """
+        rng = np.random.default_rng(seed)
+        age = np.minimum(65 + rng.gamma(2.0, 6.0, n).astype(np.int64), 99)
+        female = rng.random(n) < 0.5
+        frailty = rng.gamma(0.8, 1 / 0.8, n)
+        rows, cols = [], []
+        for start in range(0, n, _POPULATION_CHUNK):
+            f = frailty[start : start + _POPULATION_CHUNK, None]
+            p = np.minimum(self.prevalence * f, 0.95)
+            r, c = np.nonzero(rng.random(p.shape) < p)
+            rows.append(r + start)
+            cols.append(c)
+        matrix = HccMatrix.from_pairs(np.concatenate(rows), np.concatenate(cols), n, len(self))
+        return matrix, age, female
+
+
+def naive_hierarchies(model: RafModel, matrix: HccMatrix) -> np.ndarray:
+    """Per-member loop reference for apply_hierarchies (benchmark baseline)."""
+    keep = np.ones(matrix.nnz, dtype=bool)
+    for i in range(matrix.n_members):
+        start, stop = matrix.indptr[i], matrix.indptr[i + 1]
+        present = set(matrix.cols[start:stop].tolist())
+        for k in range(start, stop):
+            col = int(matrix.cols[k])
+            for parent in present:
+                if parent in model.hierarchies and col in model.hierarchies[parent]:
+                    keep[k] = False
+                    break
+    return keep
+
+
+def benchmark_hierarchies(n_members: int = 100_000, seed: int = POPULATION_SEED) -> dict[str, Any]:
+    """
+    Time bitmask hierarchy resolution against the per-member loop on a
+    synthetic population; both must drop exactly the same entries.
+    """
+    model = get_raf_model()
+    matrix, _, _ = model.synthetic_population(n_members, seed)
+    start = time.perf_counter()
+    fast = model.apply_hierarchies(matrix)
+    bitmask_s = time.perf_counter() - start
+    start = time.perf_counter()
+    slow = naive_hierarchies(model, matrix)
+    naive_s = time.perf_counter() - start
+    if not np.array_equal(fast, slow):
+        raise AssertionError("bitmask and per-member hierarchies disagree")
+    return {
+        "members": n_members,
+        "entries": matrix.nnz,
+        "dropped": int((~fast).sum()),
+        "bitmask_s": bitmask_s,
+        "naive_s": naive_s,
+        "speedup": naive_s / bitmask_s if bitmask_s else float("inf"),
+    }
+
+
+def risk_tiers(raf: np.ndarray) -> np.ndarray:
+    """Tier index per member (0 = Low … 3 = Very High)."""
+    return np.searchsorted(_TIER_BOUNDS, np.asarray(raf, dtype=np.float64), side="right") - 1
+
+
+def _tier_totals(raf: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(member count, RAF sum) per tier index."""
+    tiers = np.clip(risk_tiers(raf), 0, len(_TIER_NAMES) - 1)
+    counts = np.bincount(tiers, minlength=len(_TIER_NAMES))
+    sums = np.bincount(tiers, weights=raf, minlength=len(_TIER_NAMES))
+    return counts, sums
+
+
+def tier_summary(raf: np.ndarray, base_rate: float = BASE_RATE_PMPM) -> dict[str, dict[str, Any]]:
+    """
+    Per tier (highest first): count, avg_raf and revenue_pmpm (avg RAF ×
+    base rate), aggregated with one bincount pass.
+    """
+    return _summarize(*_tier_totals(np.asarray(raf, dtype=np.float64)), base_rate)
+
+
+def _summarize(
+    counts: np.ndarray, sums: np.ndarray, base_rate: float = BASE_RATE_PMPM
+) -> dict[str, dict[str, Any]]:
+    out = {}
+    for t in range(len(_TIER_NAMES) - 1, -1, -1):
+        avg = sums[t] / counts[t] if counts[t] else 0.0
+        out[_TIER_NAMES[t]] = {
+            "count": int(counts[t]),
+            "avg_raf": round(float(avg), 2),
+            "revenue_pmpm": int(round(avg * base_rate)),
+        }
+    return out
+
+
+@lru_cache(maxsize=1)
+def get_raf_model() -> RafModel:
+    """Process-wide RAF model over the module tables."""
+    return RafModel()
+
+
+class RiskPopulation:
+    """
+    Scored population that follows diagnosis changes.
+
+    Keeps each member's HCCs (packed bits), RAF and tier, plus per-tier
+    member counts and RAF sums. apply_deltas() rescores only the members a
+    batch touches and moves them between the tier totals, so a claim feed
+    costs O(changed members) rather than a full rescore. `version` bumps on
+    every applied batch. Thread-safe.
+    """
+
+    def __init__(
+        self, model: RafModel, matrix: HccMatrix, age: np.ndarray, female: np.ndarray
+    ) -> None:
+        self.model = model
+        self.age = np.asarray(age)
+        self.female = np.asarray(female, dtype=bool)
+        self.bits = model.member_bits(matrix)
+        self.raf = model.score(matrix, self.age, self.female)["raf"]
+        self.tier = np.clip(risk_tiers(self.raf), 0, len(_TIER_NAMES) - 1)
+        self._counts, self._sums = _tier_totals(self.raf)
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.raf)
+
+    def apply_deltas(
+        self, members: np.ndarray, hccs: Sequence[int | str] | np.ndarray, added: np.ndarray
+    ) -> np.ndarray:
+        """
+        Apply diagnosis deltas: member row i gains (added) or loses HCC hccs[i].
+        When a batch touches the same member/HCC twice the last entry wins.
+        Returns the member rows whose scores were recomputed. An empty batch
+        changes nothing (version included); rows outside [0, len) raise ValueError.
+        """
+        members = np.asarray(members, dtype=np.int64)
+        if not len(members):
+            return np.empty(0, dtype=np.int64)
+        if members.min() < 0 or members.max() >= len(self):
+            raise ValueError(f"Member rows must be in [0, {len(self)})")
+        cols = self.model.columns(hccs)
+        added = np.asarray(added, dtype=bool)
+        # Last entry per (member, HCC)
+        key = members * len(self.model) + cols
+        _, last = np.unique(key[::-1], return_index=True)
+        last = len(key) - 1 - last
+        members, cols, added = members[last], cols[last], added[last]
+        word = cols // _WORD_BITS
+        bit = np.left_shift(np.uint64(1), (cols % _WORD_BITS).astype(np.uint64))
+        changed = np.unique(members)
+        with self._lock:
+            np.bitwise_and.at(self.bits, (members[~added], word[~added]), ~bit[~added])
+            np.bitwise_or.at(self.bits, (members[added], word[added]), bit[added])
+            present = _unpack_bits(self.bits[changed], len(self.model))
+            raf = self.model.score_present(present, self.age[changed], self.female[changed])["raf"]
+            tier = np.clip(risk_tiers(raf), 0, len(_TIER_NAMES) - 1)
+            np.subtract.at(self._counts, self.tier[changed], 1)
+            np.subtract.at(self._sums, self.tier[changed], self.raf[changed])
+            np.add.at(self._counts, tier, 1)
+            np.add.at(self._sums, tier, raf)
+            self.raf[changed] = raf
+            self.tier[changed] = tier
+            self.version += 1
+        return changed
+
+    def summary(self, base_rate: float = BASE_RATE_PMPM) -> dict[str, dict[str, Any]]:
+        """tier_summary() of the current scores, from the running tier totals."""
+        with self._lock:
+            return _summarize(self._counts.copy(), self._sums.copy(), base_rate)
+
+    def hcc_summary(self, base_rate: float = BASE_RATE_PMPM) -> list[dict[str, Any]]:
+        """
+        Per model HCC, highest revenue first: members paid the HCC after
+        hierarchies, prevalence (% of members), weight and annual revenue
+        impact (members × weight × base rate × 12), from the current bits.
+        """
+        with self._lock:
+            paid = self.model.paid_hccs(_unpack_bits(self.bits, len(self.model)))
+        members = paid.sum(axis=0)
+        revenue = members * self.model.coefficients * base_rate * 12
+        return [
+            {
+                "code": f"HCC {self.model.codes[j]}",
+                "name": self.model.labels[j],
+                "prevalence": round(float(members[j] / len(self) * 100), 1) if len(self) else 0.0,
+                "avg_weight": float(self.model.coefficients[j]),
+                "members": int(members[j]),
+                "revenue_impact": int(round(revenue[j])),
+            }
+            for j in np.argsort(-revenue, kind="stable")
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_risk_population() -> RiskPopulation:
+    """Dashboard population, scored once per process and kept current by deltas."""
+    model = get_raf_model()
+    return RiskPopulation(model, *model.synthetic_population(POPULATION_SIZE))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI: benchmark hierarchy resolution and full scoring on a synthetic population."""
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized RAF engine.")
+    parser.add_argument("--members", type=int, default=100_000, help="synthetic population size")
+    parser.add_argument("--seed", type=int, default=POPULATION_SEED, help="population seed")
+    args = parser.parse_args(argv)
+
+    b = benchmark_hierarchies(args.members, args.seed)
+    print(
+        f"Hierarchies · {b['members']:,} members, {b['entries']:,} HCCs, {b['dropped']:,} trumped\n"
+        f"  bitmask         {b['bitmask_s'] * 1000:9.1f} ms\n"
+        f"  per-member loop {b['naive_s'] * 1000:9.1f} ms  ({b['speedup']:,.0f}× slower)"
+    )
+    model = get_raf_model()
+    matrix, age, female = model.synthetic_population(args.members, args.seed)
+    start = time.perf_counter()
+    raf = model.score(matrix, age, female)["raf"]
+    print(f"Full RAF score · {time.perf_counter() - start:.3f} s · mean RAF {raf.mean():.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
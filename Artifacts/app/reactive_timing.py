@@ -0,0 +1,61 @@
+# reactive_timing.py
+# ─────────────────────────────────────────────────────────────
+# Reactive Rate Limiting — debounce bursts of input changes per session
+# StarGuard Mobile | reichert-science-intelligence
+# A debounced calc follows its source only once the source has been quiet
+# for the delay, so slider drags and multi-input updates (presets,
+# optimizer) cost one downstream evaluation instead of one per change
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+from shiny import reactive
+
+T = TypeVar("T")
+
+DEBOUNCE_SECONDS = 0.3
+
+
+def debounce(source: Callable[[], T], delay_secs: float = DEBOUNCE_SECONDS) -> Callable[[], T]:
+    """
+    Session-scoped reactive.calc over `source` that re-evaluates only after
+    `source` has stopped changing for delay_secs. The first read returns the
+    current value immediately; the timer is armed only when the value
+    actually changes, so an idle source never re-evaluates.
+    """
+    deadline: reactive.Value[float | None] = reactive.Value(None)
+    fired = reactive.Value(0)
+    last: list[T] = []
+
+    @reactive.effect(priority=1)
+    def _on_change() -> None:
+        value = source()
+        if not last:
+            last.append(value)
+        elif value != last[0]:
+            last[0] = value
+            deadline.set(time.monotonic() + delay_secs)
+
+    @reactive.effect
+    def _on_deadline() -> None:
+        due = deadline()
+        if due is None:
+            return
+        remaining = due - time.monotonic()
+        if remaining > 0:
+            reactive.invalidate_later(remaining)
+            return
+        deadline.set(None)
+        with reactive.isolate():
+            fired.set(fired() + 1)
+
+    @reactive.calc
+    def _debounced() -> T:
+        fired()
+        with reactive.isolate():
+            return source()
+
+    return _debounced
@@ -0,0 +1,78 @@
+# shared_data_cache.py
+# ─────────────────────────────────────────────────────────────
+# Cross-Session Data Cache — one fetch per data change, all users
+# StarGuard Mobile | reichert-science-intelligence
+# Process-level, versioned; writes call invalidate(), sessions poll version()
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+# ── Dataset keys ──────────────────────────────────────────────
+GAPS_KEY = "hedis_gaps"
+FORECASTS_KEY = "star_forecasts"
+
+
+class SharedDataCache:
+    """
+    Process-wide cache for read-mostly datasets shared by every Shiny session.
+
+    Each key has a monotonically increasing version. Writers call
+    invalidate(key) after a successful write; readers call get(key, loader)
+    and only the first reader after an invalidation runs the loader.
+    Sessions watch version(key) (cheap int read) to refresh reactively.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._versions: dict[str, int] = {}
+        self._entries: dict[str, tuple[int, Any]] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def version(self, key: str) -> int:
+        """Current data version for key; changes on every invalidate()."""
+        return self._versions.get(key, 0)
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, running loader() on a miss.
+        A load that races an invalidation is returned to its caller but not
+        stored, so the next reader fetches the newer data.
+        """
+        with self._key_lock(key):
+            version = self.version(key)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            value = loader()
+            self.loads += 1
+            with self._lock:
+                if self.version(key) == version:
+                    self._entries[key] = (version, value)
+            return value
+
+    def invalidate(self, key: str) -> int:
+        """Drop the cached value and bump the version. Returns the new version."""
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._entries.pop(key, None)
+            return self._versions[key]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "hits": self.hits,
+            "versions": dict(self._versions),
+        }
+
+
+shared_cache = SharedDataCache()
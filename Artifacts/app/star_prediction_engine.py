@@ -0,0 +1,371 @@
+# star_prediction_engine.py
+# ─────────────────────────────────────────────────────────────
+# Star Rating Prediction Engine — vectorized CMS-style scoring
+# StarGuard Mobile | reichert-science-intelligence
+# Contract × measure rate matrix → measure stars (cut points from the
+# measure catalog) → weighted summary score → half-star rating.
+# Deterministic: same rates give the same rating in every worker.
+# Batch: score_contracts() / `python star_prediction_engine.py FILE` score a
+# whole contract file in one pass (CIs, bonus revenue, forecast cache rows).
+# Simulation: simulate() draws year-end measure rates around each contract's
+# current rates and reports the empirical star interval and P(≥ level).
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from measure_catalog import MeasureCatalog, get_measure_catalog
+from star_thresholds import label_ratings
+
+_CONTRACTS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.environ.get("CONTRACT_RATES_FILE", os.path.join("data", "contract_measure_rates.csv")),
+)
+
+CONTRACT_COLUMNS = ("contract_id", "name", "state", "members", "current_stars")
+
+# Monte Carlo settings: draws per contract on the page / in batch scoring,
+# and the default seed for per-session and batch Generators
+SIMULATION_DRAWS = 10_000
+BATCH_SIMULATION_DRAWS = 1_000
+SIMULATION_SEED = int(os.environ.get("STAR_SIMULATION_SEED", 2026))
+# Year-end drift of a measure rate around today's rate (percentage points),
+# on top of binomial sampling error over the measure's eligible population
+PROJECTION_SD = 2.0
+CI_LEVEL = 0.95
+STAR_LEVELS = np.arange(1.0, 5.01, 0.5)
+# Bound on contracts × draws × measures per simulation chunk
+_SIMULATION_CHUNK = 2_000_000
+# star_label for contracts with no scored measure (no rating, no bonus)
+UNSCORED_LABEL = "N/A"
+
+
+def measure_stars(rates: np.ndarray, cut_points: np.ndarray) -> np.ndarray:
+    """
+    Measure-level stars (1–5) for rates of shape (..., n_measures).
+    cut_points is (n_measures × 4): the minimum rate for 2, 3, 4 and 5 stars.
+    Missing rates (NaN) score 0 and are left out of the summary.
+    """
+    stars = 1 + (rates[..., None] >= cut_points).sum(axis=-1, dtype=np.int8)
+    return np.where(np.isnan(rates), 0, stars).astype(np.int8)
+
+
+def summary_scores(stars: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted mean of measure stars over scored measures (last axis)."""
+    w = np.where(stars > 0, weights, 0.0)
+    total = w.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, (stars * w).sum(axis=-1) / total, np.nan)
+
+
+def round_half_star(score: np.ndarray) -> np.ndarray:
+    """
+    CMS rounding of a summary score to the nearest half star (x.25 / x.75 round up).
+    Unscored contracts (NaN summary score) stay NaN — callers must mask them.
+    """
+    return np.clip(np.floor(np.asarray(score) * 2 + 0.5) / 2, 1.0, 5.0)
+
+
+class StarPredictionEngine:
+    """
+    Scores contracts against one measure set.
+    score(rates) takes an (n_contracts × n_measures) matrix aligned with
+    `codes` and returns measure stars, summary scores and half-star ratings
+    for every contract in one pass.
+    """
+
+    def __init__(
+        self,
+        codes: list[str],
+        weights: np.ndarray,
+        cut_points: np.ndarray,
+        denominators: np.ndarray | None = None,
+    ) -> None:
+        self.codes: tuple[str, ...] = tuple(codes)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.cut_points = np.asarray(cut_points, dtype=np.float64)
+        if self.cut_points.shape != (len(self.codes), 4):
+            raise ValueError("cut_points must be (n_measures × 4)")
+        # Eligible members per measure (binomial sampling error); None = drift only
+        self.denominators = (
+            None if denominators is None else np.asarray(denominators, dtype=np.float64)
+        )
+
+    @classmethod
+    def from_catalog(cls, catalog: MeasureCatalog) -> "StarPredictionEngine":
+        stars = catalog.star_measures
+        return cls(
+            list(stars), stars.column("star_weight"), stars.cut_points(), stars.column("population")
+        )
+
+    def rate_matrix(self, frame: pd.DataFrame) -> np.ndarray:
+        """Pull the engine's measure columns from a frame (absent measures → NaN)."""
+        cols = [
+            pd.to_numeric(frame[c], errors="coerce").to_numpy(dtype=np.float64)
+            if c in frame.columns
+            else np.full(len(frame), np.nan)
+            for c in self.codes
+        ]
+        return np.column_stack(cols) if cols else np.empty((len(frame), 0))
+
+    def score(self, rates: np.ndarray) -> dict[str, np.ndarray]:
+        stars = measure_stars(np.asarray(rates, dtype=np.float64), self.cut_points)
+        summary = summary_scores(stars, self.weights)
+        return {
+            "measure_stars": stars,
+            "summary_score": summary,
+            "predicted_stars": round_half_star(summary),
+        }
+
+    def rate_sd(self, rates: np.ndarray) -> np.ndarray:
+        """Per-measure SD (percentage points) of the year-end rate around `rates`."""
+        var = np.full(np.shape(rates), PROJECTION_SD**2)
+        if self.denominators is not None:
+            p = np.clip(np.asarray(rates, dtype=np.float64), 0.0, 100.0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                binomial = np.where(self.denominators > 0, p * (100 - p) / self.denominators, 0.0)
+            var = var + np.nan_to_num(binomial)
+        return np.sqrt(var)
+
+    def simulate(
+        self,
+        rates: np.ndarray,
+        draws: int = SIMULATION_DRAWS,
+        rng: np.random.Generator | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Monte Carlo over measure-rate uncertainty for (n_contracts × n_measures)
+        rates: each draw is scored through the cut points to a half-star rating.
+        Returns per contract the CI_LEVEL interval of simulated ratings, the
+        mean summary score and p_at_least (n × len(STAR_LEVELS)): the share of
+        draws reaching each star level. Missing measures stay missing in every draw.
+        """
+        rng = rng if rng is not None else np.random.default_rng(SIMULATION_SEED)
+        rates = np.atleast_2d(np.asarray(rates, dtype=np.float64))
+        n, m = rates.shape
+        sd = self.rate_sd(rates)
+        alpha = (1 - CI_LEVEL) / 2
+        ci_low = np.full(n, np.nan)
+        ci_high = np.full(n, np.nan)
+        mean_score = np.full(n, np.nan)
+        p_at_least = np.zeros((n, len(STAR_LEVELS)))
+        step = max(1, _SIMULATION_CHUNK // max(draws * max(m, 1), 1))
+        for lo in range(0, n, step):
+            hi = min(n, lo + step)
+            noise = rng.standard_normal((hi - lo, draws, m))
+            sims = np.clip(rates[lo:hi, None, :] + sd[lo:hi, None, :] * noise, 0.0, 100.0)
+            summary = summary_scores(measure_stars(sims, self.cut_points), self.weights)
+            predicted = round_half_star(summary)
+            scored = ~np.isnan(predicted[:, 0])
+            if scored.any():
+                q = np.quantile(
+                    predicted[scored], [alpha, 1 - alpha], axis=1, method="inverted_cdf"
+                )
+                ci_low[lo:hi][scored], ci_high[lo:hi][scored] = q
+                mean_score[lo:hi][scored] = summary[scored].mean(axis=1)
+            p_at_least[lo:hi] = (predicted[:, :, None] >= STAR_LEVELS).mean(axis=1)
+        return {
+            "ci_low": ci_low,
+            "ci_high": ci_high,
+            "mean_score": mean_score,
+            "p_at_least": p_at_least,
+        }
+
+    def top_gaps(self, stars: np.ndarray) -> np.ndarray:
+        """
+        Per contract, the scored measure with the most weighted headroom
+        (weight × stars short of 5); "" when no measure is scored.
+        """
+        headroom = np.where(stars > 0, self.weights * (5 - stars), -1.0)
+        if not headroom.shape[-1]:
+            return np.full(len(stars), "", dtype=object)
+        best = headroom.argmax(axis=-1)
+        codes = np.asarray(self.codes, dtype=object)[best]
+        return np.where(headroom.max(axis=-1) > 0, codes, "")
+
+
+def load_contract_rates(path: str = _CONTRACTS_FILE) -> pd.DataFrame:
+    """Contract table: CONTRACT_COLUMNS plus one rate column per measure code."""
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype={"contract_id": str})
+    missing = [c for c in CONTRACT_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Contract file {path} missing columns: {', '.join(missing)}")
+    return df
+
+
+@lru_cache(maxsize=1)
+def get_star_engine() -> StarPredictionEngine:
+    """Process-wide engine over the shared measure catalog."""
+    return StarPredictionEngine.from_catalog(get_measure_catalog())
+
+
+def score_contracts(
+    contracts: pd.DataFrame,
+    engine: StarPredictionEngine | None = None,
+    draws: int = BATCH_SIMULATION_DRAWS,
+    rng: np.random.Generator | None = None,
+) -> pd.DataFrame:
+    """
+    Score every contract in a contract table in one vectorized pass.
+    One row per contract: predicted stars, simulated CI (`draws` per contract),
+    bonus revenue, the measure with the most star headroom and how many
+    measures were scored. Contracts with no scored measure keep NaN
+    summary/predicted stars and CI, are labelled UNSCORED_LABEL and earn no bonus.
+    """
+    engine = engine or get_star_engine()
+    rates = engine.rate_matrix(contracts)
+    scored = engine.score(rates)
+    stars = scored["measure_stars"]
+    predicted = scored["predicted_stars"]
+    sim = engine.simulate(rates, draws, rng)
+    members = pd.to_numeric(contracts["members"], errors="coerce").fillna(0).to_numpy(np.int64)
+    current = pd.to_numeric(contracts["current_stars"], errors="coerce").to_numpy(np.float64)
+    unscored = np.isnan(predicted)
+    labels = label_ratings(predicted)
+    bonus = np.where(unscored, 0, labels["bonus_per_member"])
+    return pd.DataFrame(
+        {
+            "contract_id": contracts["contract_id"].astype(str).to_numpy(),
+            "name": contracts["name"].to_numpy(),
+            "members": members,
+            "current_stars": current,
+            "summary_score": np.round(scored["summary_score"], 3),
+            "predicted_stars": predicted,
+            "star_label": np.where(unscored, UNSCORED_LABEL, labels["label"]),
+            "ci_low": sim["ci_low"],
+            "ci_high": sim["ci_high"],
+            "star_delta": np.round(predicted - current, 2),
+            "bonus_per_member": bonus,
+            "bonus_revenue": members * bonus,
+            "top_gap_measure": engine.top_gaps(stars),
+            "measures_scored": (stars > 0).sum(axis=1),
+        }
+    )
+
+
+def forecast_records(
+    scored: pd.DataFrame, measurement_year: int | None = None, n_measures: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    score_contracts() output as star_rating_cache forecast dicts.
+    Confidence is HIGH when every measure was scored, MEDIUM for at least
+    half of them, LOW otherwise. Unscored contracts have no projected rating
+    and are left out.
+    """
+    year = measurement_year or datetime.now().year
+    n = n_measures or len(get_star_engine().codes)
+    scored = scored[scored["predicted_stars"].notna()]
+    coverage = scored["measures_scored"].to_numpy() / max(n, 1)
+    confidence = np.where(coverage >= 1, "HIGH", np.where(coverage >= 0.5, "MEDIUM", "LOW"))
+    return [
+        {
+            "contract_id": row["contract_id"],
+            "plan_name": row["name"],
+            "measurement_year": year,
+            "current_star_rating": row["current_stars"],
+            "projected_star_rating": row["predicted_stars"],
+            "top_gap_measure": row["top_gap_measure"],
+            "roi_projection": float(row["bonus_revenue"]),
+            "confidence_level": str(level),
+            "claude_narrative": (
+                f"Batch score {row['summary_score']:.2f} (CI {row['ci_low']}–{row['ci_high']}★)"
+            ),
+            "cached_by": "StarGuard batch scoring",
+        }
+        for row, level in zip(scored.to_dict("records"), confidence, strict=True)
+    ]
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+@lru_cache(maxsize=1)
+def get_contract_predictions() -> dict[str, dict[str, Any]]:
+    """
+    Every contract in the contract file scored in one pass, keyed by contract_id:
+    contract fields, per-measure rates/stars and the score_contracts() columns.
+    summary_score, predicted_stars and the CI are None for an unscored contract.
+    """
+    engine = get_star_engine()
+    contracts = load_contract_rates()
+    rates = engine.rate_matrix(contracts)
+    stars = engine.score(rates)["measure_stars"]
+    scored = score_contracts(contracts, engine)
+    out: dict[str, dict[str, Any]] = {}
+    for i, (row, res) in enumerate(
+        zip(contracts.to_dict("records"), scored.to_dict("records"), strict=True)
+    ):
+        out[str(row["contract_id"])] = {
+            "name": row["name"],
+            "state": row["state"],
+            "members": int(row["members"]),
+            "current_stars": float(row["current_stars"]),
+            "rates": dict(zip(engine.codes, rates[i].tolist(), strict=True)),
+            "measure_stars": dict(zip(engine.codes, stars[i].tolist(), strict=True)),
+            "summary_score": _optional(res["summary_score"]),
+            "predicted_stars": _optional(res["predicted_stars"]),
+            "ci_low": _optional(res["ci_low"]),
+            "ci_high": _optional(res["ci_high"]),
+            "bonus_per_member": int(res["bonus_per_member"]),
+            "bonus_revenue": int(res["bonus_revenue"]),
+        }
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI: score a contract file (CSV/Parquet) and write or cache the results."""
+    parser = argparse.ArgumentParser(
+        description="Batch-score Medicare Advantage contracts with the star prediction engine."
+    )
+    parser.add_argument("contracts", nargs="?", default=_CONTRACTS_FILE, help="CSV or .parquet")
+    parser.add_argument("-o", "--output", help="write scored contracts here (CSV or .parquet)")
+    parser.add_argument("--year", type=int, help="measurement year for cached forecasts")
+    parser.add_argument(
+        "--draws", type=int, default=BATCH_SIMULATION_DRAWS, help="simulation draws per contract"
+    )
+    parser.add_argument("--seed", type=int, default=SIMULATION_SEED, help="simulation seed")
+    parser.add_argument(
+        "--cache", action="store_true", help="write forecasts to the star rating cache sheet"
+    )
+    args = parser.parse_args(argv)
+
+    scored = score_contracts(
+        load_contract_rates(args.contracts),
+        draws=args.draws,
+        rng=np.random.default_rng(args.seed),
+    )
+    if args.output:
+        if args.output.endswith(".parquet"):
+            scored.to_parquet(args.output, index=False)
+        else:
+            scored.to_csv(args.output, index=False)
+    else:
+        scored.to_csv(sys.stdout, index=False)
+    print(
+        f"Scored {len(scored):,} contracts · bonus revenue ${scored['bonus_revenue'].sum():,}",
+        file=sys.stderr,
+    )
+    if args.cache:
+        from star_rating_cache import StarRatingCacheDB, cache_forecasts
+
+        result = cache_forecasts(StarRatingCacheDB(), forecast_records(scored, args.year))
+        if not result["success"]:
+            print(f"Forecast cache write failed: {result['error']}", file=sys.stderr)
+            return 1
+        print(f"Cached {result['cached']:,} forecasts", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
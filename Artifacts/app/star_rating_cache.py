@@ -13,6 +13,8 @@ from datetime import datetime, timedelta, timezone
 import gspread
 import pandas as pd
 from google.oauth2.service_account import Credentials
+from shared_data_cache import FORECASTS_KEY, shared_cache
+from star_thresholds import label_ratings
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
 
@@ -39,22 +41,6 @@ FORECAST_COLUMNS = [
     "last_updated",
 ]
 
-STAR_THRESHOLDS = {
-    5.0: ("⭐⭐⭐⭐⭐", "#D4AF37", "Excellent"),
-    4.5: ("⭐⭐⭐⭐½", "#D4AF37", "Superior"),
-    4.0: ("⭐⭐⭐⭐", "#10b981", "Above Average"),
-    3.5: ("⭐⭐⭐½", "#60a5fa", "Average"),
-    3.0: ("⭐⭐⭐", "#f59e0b", "Below Average"),
-    0.0: ("⭐⭐", "#f87171", "Low Performing"),
-}
-
-
-def star_label(rating: float) -> tuple:
-    for threshold, info in sorted(STAR_THRESHOLDS.items(), reverse=True):
-        if rating >= threshold:
-            return info
-    return ("⭐", "#f87171", "Low Performing")
-
 
 class StarRatingCacheDB:
     def __init__(self):
@@ -108,6 +94,33 @@ class StarRatingCacheDB:
         }
 
 
+def _forecast_row(forecast: dict, forecast_id: str, now: datetime) -> list:
+    current = float(forecast.get("current_star_rating", 0))
+    projected = float(forecast.get("projected_star_rating", 0))
+    return [
+        forecast_id,
+        now.strftime("%Y-%m-%d %H:%M:%S"),
+        forecast.get("contract_id", ""),
+        forecast.get("plan_name", ""),
+        forecast.get("measurement_year", datetime.now().year),
+        current,
+        projected,
+        round(projected - current, 2),
+        forecast.get("top_gap_measure", ""),
+        forecast.get("gaps_open", 0),
+        forecast.get("gaps_closed", 0),
+        forecast.get("hedis_completion_rate", 0.0),
+        forecast.get("hcc_risk_score", 0.0),
+        forecast.get("cahps_score", 0.0),
+        forecast.get("roi_projection", 0.0),
+        forecast.get("confidence_level", "MEDIUM"),
+        forecast.get("claude_narrative", "")[:500],
+        "FRESH",
+        forecast.get("cached_by", "StarGuard AI"),
+        now.strftime("%Y-%m-%d %H:%M:%S"),
+    ]
+
+
 def cache_forecast(db: StarRatingCacheDB, forecast: dict) -> dict:
     if not db.connected:
         return {"success": False, "error": f"Cloud disconnected: {db.last_error}"}
@@ -115,43 +128,59 @@ def cache_forecast(db: StarRatingCacheDB, forecast: dict) -> dict:
         _mark_prior_stale(db, forecast.get("contract_id", ""))
         now = datetime.now(timezone(timedelta(hours=-5)))
         forecast_id = f"FCST-{now.strftime('%Y%m%d-%H%M%S')}"
-        current = float(forecast.get("current_star_rating", 0))
-        projected = float(forecast.get("projected_star_rating", 0))
-        row = [
-            forecast_id,
-            now.strftime("%Y-%m-%d %H:%M:%S"),
-            forecast.get("contract_id", ""),
-            forecast.get("plan_name", ""),
-            forecast.get("measurement_year", datetime.now().year),
-            current,
-            projected,
-            round(projected - current, 2),
-            forecast.get("top_gap_measure", ""),
-            forecast.get("gaps_open", 0),
-            forecast.get("gaps_closed", 0),
-            forecast.get("hedis_completion_rate", 0.0),
-            forecast.get("hcc_risk_score", 0.0),
-            forecast.get("cahps_score", 0.0),
-            forecast.get("roi_projection", 0.0),
-            forecast.get("confidence_level", "MEDIUM"),
-            forecast.get("claude_narrative", "")[:500],
-            "FRESH",
-            forecast.get("cached_by", "StarGuard AI"),
-            now.strftime("%Y-%m-%d %H:%M:%S"),
-        ]
+        row = _forecast_row(forecast, forecast_id, now)
         db.sheet.append_row(row)
         db.cache_count += 1
+        shared_cache.invalidate(FORECASTS_KEY)
         db.last_cached_at = now.strftime("%Y-%m-%d %H:%M:%S")
+        star_delta = row[FORECAST_COLUMNS.index("star_delta")]
         return {
             "success": True,
             "forecast_id": forecast_id,
             "timestamp": now.strftime("%I:%M:%S %p EST"),
-            "star_delta": round(projected - current, 2),
+            "star_delta": star_delta,
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def cache_forecasts(db: StarRatingCacheDB, forecasts: list[dict]) -> dict:
+    """
+    Cache many forecasts (batch contract scoring) with two Sheets calls:
+    one batch_update marking prior FRESH rows STALE, one append_rows.
+    Returns: { success, cached, marked_stale, error }
+    """
+    if not db.connected or db.sheet is None:
+        return {
+            "success": False,
+            "cached": 0,
+            "marked_stale": 0,
+            "error": f"Cloud disconnected: {db.last_error}",
+        }
+    if not forecasts:
+        return {"success": True, "cached": 0, "marked_stale": 0, "error": None}
+    try:
+        now = datetime.now(timezone(timedelta(hours=-5)))
+        contracts = {f.get("contract_id", "") for f in forecasts} - {""}
+        cache_col = FORECAST_COLUMNS.index("cache_status") + 1
+        stale = [
+            {"range": gspread.utils.rowcol_to_a1(i, cache_col), "values": [["STALE"]]}
+            for i, rec in enumerate(db.sheet.get_all_records(), start=2)
+            if rec.get("contract_id") in contracts and rec.get("cache_status") == "FRESH"
+        ]
+        if stale:
+            db.sheet.batch_update(stale)
+        stamp = now.strftime("%Y%m%d-%H%M%S")
+        rows = [_forecast_row(f, f"FCST-{stamp}-{i:05d}", now) for i, f in enumerate(forecasts, 1)]
+        db.sheet.append_rows(rows)
+        db.cache_count += len(rows)
+        db.last_cached_at = now.strftime("%Y-%m-%d %H:%M:%S")
+        shared_cache.invalidate(FORECASTS_KEY)
+        return {"success": True, "cached": len(rows), "marked_stale": len(stale), "error": None}
+    except Exception as e:
+        return {"success": False, "cached": 0, "marked_stale": 0, "error": str(e)}
+
+
 def _mark_prior_stale(db: StarRatingCacheDB, contract_id: str):
     if not contract_id or not db.connected:
         return
@@ -161,16 +190,34 @@ def _mark_prior_stale(db: StarRatingCacheDB, contract_id: str):
         for i, rec in enumerate(records, start=2):
             if rec.get("contract_id") == contract_id and rec.get("cache_status") == "FRESH":
                 db.sheet.update_cell(i, cache_col, "STALE")
+                shared_cache.invalidate(FORECASTS_KEY)
     except Exception:
         pass
 
 
-def fetch_latest_forecast(db: StarRatingCacheDB, contract_id: str = ""):
+def load_forecast_snapshot(db: StarRatingCacheDB) -> dict:
+    """
+    Read every cached forecast once; the freshness banner, hero card, KPI row
+    and history table all derive from this snapshot.
+    Returns: { connected, records: DataFrame, error: str | None }
+    """
     if not db.connected:
+        return {"connected": False, "records": pd.DataFrame(), "error": None}
+    try:
+        return {
+            "connected": True,
+            "records": pd.DataFrame(db.sheet.get_all_records()),
+            "error": None,
+        }
+    except Exception as e:
+        return {"connected": True, "records": pd.DataFrame(), "error": str(e)}
+
+
+def select_latest_forecast(snapshot: dict, contract_id: str = ""):
+    if not snapshot["connected"] or snapshot["error"]:
         return None
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
+        df = snapshot["records"]
         if df.empty:
             return None
         df = df[df["cache_status"] == "FRESH"]
@@ -184,14 +231,13 @@ def fetch_latest_forecast(db: StarRatingCacheDB, contract_id: str = ""):
         return None
 
 
-def fetch_forecast_history(
-    db: StarRatingCacheDB, contract_id: str = "", n: int = 12
-) -> pd.DataFrame:
-    if not db.connected:
+def select_forecast_history(snapshot: dict, contract_id: str = "", n: int = 12) -> pd.DataFrame:
+    if not snapshot["connected"]:
         return pd.DataFrame()
+    if snapshot["error"]:
+        return pd.DataFrame({"Error": [snapshot["error"]]})
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
+        df = snapshot["records"]
         if df.empty:
             return df
         if contract_id:
@@ -209,17 +255,23 @@ def fetch_forecast_history(
             "cache_status",
         ]
         available = [c for c in cols if c in df.columns]
-        return df[available].reset_index(drop=True)
+        out = df[available].reset_index(drop=True)
+        if "projected_star_rating" in out.columns:
+            projected = pd.to_numeric(out["projected_star_rating"], errors="coerce")
+            label = label_ratings(projected.to_numpy())["label"]
+            out.insert(out.columns.get_loc("projected_star_rating") + 1, "projected_label", label)
+        return out
     except Exception as e:
         return pd.DataFrame({"Error": [str(e)]})
 
 
-def fetch_cache_summary(db: StarRatingCacheDB) -> dict:
-    if not db.connected:
+def summarize_forecast_snapshot(snapshot: dict) -> dict:
+    if not snapshot["connected"]:
         return {}
+    if snapshot["error"]:
+        return {"error": snapshot["error"]}
     try:
-        records = db.sheet.get_all_records()
-        df = pd.DataFrame(records)
+        df = snapshot["records"]
         if df.empty:
             return {
                 "total": 0,
@@ -240,3 +292,17 @@ def fetch_cache_summary(db: StarRatingCacheDB) -> dict:
         }
     except Exception as e:
         return {"error": str(e)}
+
+
+def fetch_latest_forecast(db: StarRatingCacheDB, contract_id: str = ""):
+    return select_latest_forecast(load_forecast_snapshot(db), contract_id)
+
+
+def fetch_forecast_history(
+    db: StarRatingCacheDB, contract_id: str = "", n: int = 12
+) -> pd.DataFrame:
+    return select_forecast_history(load_forecast_snapshot(db), contract_id, n)
+
+
+def fetch_cache_summary(db: StarRatingCacheDB) -> dict:
+    return summarize_forecast_snapshot(load_forecast_snapshot(db))
@@ -0,0 +1,69 @@
+# star_thresholds.py
+# ─────────────────────────────────────────────────────────────
+# Star Level Lookup — one threshold table for labels, colours, bonus
+# StarGuard Mobile | reichert-science-intelligence
+# Ascending rating thresholds built once at import; a rating's level is a
+# binary search (bisect for one value, np.searchsorted for whole columns)
+# Brand: Purple #4A3E8F | Gold #D4AF37 | Green #10b981
+# ─────────────────────────────────────────────────────────────
+
+from bisect import bisect_right
+from math import isnan
+
+import numpy as np
+
+# Minimum rating → (stars, colour, label, quality bonus $/member)
+STAR_THRESHOLDS = {
+    5.0: ("⭐⭐⭐⭐⭐", "#D4AF37", "Excellent", 150),
+    4.5: ("⭐⭐⭐⭐½", "#D4AF37", "Superior", 125),
+    4.0: ("⭐⭐⭐⭐", "#10b981", "Above Average", 100),
+    3.5: ("⭐⭐⭐½", "#60a5fa", "Average", 75),
+    3.0: ("⭐⭐⭐", "#f59e0b", "Below Average", 50),
+    0.0: ("⭐⭐", "#f87171", "Low Performing", 25),
+}
+# Ratings below every threshold (negative or missing)
+UNRATED = ("⭐", "#f87171", "Low Performing", 25)
+
+# Level 0 = UNRATED, level i = i-th threshold ascending
+_THRESHOLDS = sorted(STAR_THRESHOLDS)
+_THRESHOLD_ARRAY = np.array(_THRESHOLDS)
+_LEVELS = [UNRATED] + [STAR_THRESHOLDS[t] for t in _THRESHOLDS]
+STARS = np.array([lvl[0] for lvl in _LEVELS], dtype=object)
+COLORS = np.array([lvl[1] for lvl in _LEVELS], dtype=object)
+LABELS = np.array([lvl[2] for lvl in _LEVELS], dtype=object)
+BONUS_PER_MEMBER = np.array([lvl[3] for lvl in _LEVELS], dtype=np.int64)
+
+
+def star_level(rating: float) -> int:
+    """Table level for one rating (0 = below every threshold or NaN)."""
+    if rating is None or isnan(rating):
+        return 0
+    return bisect_right(_THRESHOLDS, rating)
+
+
+def star_levels(ratings: np.ndarray) -> np.ndarray:
+    """Table levels for an array of ratings; NaN maps to level 0."""
+    r = np.asarray(ratings, dtype=np.float64)
+    levels = np.searchsorted(_THRESHOLD_ARRAY, r, side="right")
+    return np.where(np.isnan(r), 0, levels)
+
+
+def star_label(rating: float) -> tuple:
+    """(stars, colour, label) for one rating."""
+    return _LEVELS[star_level(rating)][:3]
+
+
+def label_ratings(ratings: np.ndarray) -> dict[str, np.ndarray]:
+    """stars / color / label / bonus_per_member columns for an array of ratings."""
+    levels = star_levels(ratings)
+    return {
+        "stars": STARS[levels],
+        "color": COLORS[levels],
+        "label": LABELS[levels],
+        "bonus_per_member": BONUS_PER_MEMBER[levels],
+    }
+
+
+def bonus_per_member(ratings: np.ndarray) -> np.ndarray:
+    """Quality bonus $/member for each rating."""
+    return BONUS_PER_MEMBER[star_levels(ratings)]
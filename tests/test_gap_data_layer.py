@@ -0,0 +1,276 @@
+"""
+Unit tests — gap_data_layer (session snapshot calc over the shared cache)
+Harness: a counting fake sheet + reactive effects standing in for the KPI
+cards and gap table; each simulated click must cost exactly one fetch, and
+sessions sharing a cache must share that fetch.
+No live DB/API calls.
+"""
+import asyncio
+import os
+import sys
+
+import pandas as pd
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+import gap_data_layer  # noqa: E402
+from gap_data_layer import RankedGapFeedCalc, SharedVersion, gap_snapshot_calc  # noqa: E402
+from gap_recommendation import gap_prompt_from_row  # noqa: E402
+from shared_data_cache import GAPS_KEY, SharedDataCache  # noqa: E402
+from shiny import reactive  # noqa: E402
+
+import hedis_gap_trail  # noqa: E402
+import intervention_optimizer  # noqa: E402
+
+
+class CountingSheet:
+    """Fake gspread worksheet that counts backend reads."""
+
+    def __init__(self, records):
+        self.records = records
+        self.reads = 0
+
+    def get_all_records(self):
+        self.reads += 1
+        return [dict(r) for r in self.records]
+
+
+class FakeGapDB:
+    connected = True
+
+    def __init__(self, records):
+        self.sheet = CountingSheet(records)
+
+
+def _records():
+    return [
+        {"gap_id": "GAP-1", "timestamp": "2026-01-01 10:00:00", "member_id": "M1",
+         "measure_code": "CBP", "gap_status": "OPEN", "star_impact": 3, "roi_estimate": 100},
+        {"gap_id": "GAP-2", "timestamp": "2026-01-02 10:00:00", "member_id": "M2",
+         "measure_code": "BCS", "gap_status": "CLOSED", "star_impact": 5, "roi_estimate": 300},
+    ]
+
+
+class Harness:
+    """Wires a snapshot calc to two consumer effects (KPI row + table) and counts reads."""
+
+    def __init__(self, records, db=None, cache=None):
+        self.db = db or FakeGapDB(records)
+        self.cache = cache or SharedDataCache()
+        self.version = SharedVersion(GAPS_KEY, self.cache, interval_secs=None)
+        self.snapshot = gap_snapshot_calc(self.db, self.version, cache=self.cache)
+        self.kpi = None
+        self.table = None
+        self.renders = 0
+
+        @reactive.effect
+        def _kpi_cards():
+            self.renders += 1
+            self.kpi = hedis_gap_trail.summarize_gap_snapshot(self.snapshot())
+
+        @reactive.effect
+        def _gap_table():
+            self.table = hedis_gap_trail.select_gap_rows(self.snapshot(), n=15)
+
+        self._effects = (_kpi_cards, _gap_table)
+
+    def refresh(self):
+        """btn_refresh_gaps: invalidate shared data, re-read this session."""
+        self.cache.invalidate(GAPS_KEY)
+        self.version.changed()
+
+    def poll(self):
+        """What the SharedVersion timer does every interval."""
+        self.version.check()
+
+    def interact(self, action=None):
+        """Run one user action + flush; return backend reads it caused."""
+        before = self.db.sheet.reads
+
+        async def _go():
+            if action is not None:
+                with reactive.isolate():
+                    action()
+            await reactive.flush()
+
+        asyncio.run(_go())
+        return self.db.sheet.reads - before
+
+
+def test_initial_render_fetches_once(monkeypatch):
+    """KPI cards and table share one fetch on first render."""
+    monkeypatch.setattr(hedis_gap_trail, "get_gap_suppressions", lambda: [])
+    h = Harness(_records())
+    assert h.interact() == 1
+    assert h.kpi["total"] == 2 and h.kpi["open"] == 1
+    assert list(h.table["gap_id"]) == ["GAP-2", "GAP-1"]
+
+
+def test_each_click_fetches_exactly_once(monkeypatch):
+    """Refresh clicks and write-version bumps each cost one fetch, not one per output."""
+    monkeypatch.setattr(hedis_gap_trail, "get_gap_suppressions", lambda: [])
+    h = Harness(_records())
+    h.interact()
+    assert h.interact(h.refresh) == 1
+    h.db.sheet.records.append(
+        {"gap_id": "GAP-3", "timestamp": "2026-01-03 10:00:00", "member_id": "M3",
+         "measure_code": "CBP", "gap_status": "OPEN", "star_impact": 4, "roi_estimate": 50}
+    )
+    assert h.interact(h.refresh) == 1
+    assert h.kpi["total"] == 3
+
+
+def test_no_trigger_no_fetch(monkeypatch):
+    """A flush with no trigger change does not touch the backend."""
+    monkeypatch.setattr(hedis_gap_trail, "get_gap_suppressions", lambda: [])
+    h = Harness(_records())
+    h.interact()
+    assert h.interact() == 0
+
+
+def test_sessions_share_one_fetch_per_version(monkeypatch):
+    """N sessions × 2 outputs → one backend read per data version."""
+    monkeypatch.setattr(hedis_gap_trail, "get_gap_suppressions", lambda: [])
+    cache = SharedDataCache()
+    db = FakeGapDB(_records())
+    sessions = [Harness(None, db=db, cache=cache) for _ in range(5)]
+    assert sum(s.interact() for s in sessions) == 1
+    # Session 0 writes; the rest pick it up through their version poll
+    assert sessions[0].interact(sessions[0].refresh) == 1
+    assert sum(s.interact(s.poll) for s in sessions[1:]) == 0
+    assert all(s.kpi["total"] == 2 for s in sessions)
+
+
+def test_own_write_renders_once(monkeypatch):
+    """The poll after this session's own write does not render the outputs again."""
+    monkeypatch.setattr(hedis_gap_trail, "get_gap_suppressions", lambda: [])
+    cache = SharedDataCache()
+    db = FakeGapDB(_records())
+    a, b = Harness(None, db=db, cache=cache), Harness(None, db=db, cache=cache)
+    a.interact(), b.interact()
+    a.interact(a.refresh)
+    assert a.renders == 2
+    a.interact(a.poll)
+    assert a.renders == 2
+    # Another session's write still reaches this one through the poll
+    b.interact(b.refresh)
+    a.interact(a.poll)
+    assert a.renders == 3
+
+
+def test_snapshot_error_surfaces_in_both_views():
+    """A failed read shows as an error in KPI summary and table."""
+    snap = {"records": None, "error": "quota exceeded"}
+    assert hedis_gap_trail.summarize_gap_snapshot(snap) == {"error": "quota exceeded"}
+    assert list(hedis_gap_trail.select_gap_rows(snap)["Error"]) == ["quota exceeded"]
+
+
+def test_batch_records_keep_member_name(monkeypatch):
+    """Batch rows are full OPEN, unsuppressed records, so prompts carry member_name."""
+    monkeypatch.setattr(hedis_gap_trail, "get_gap_suppressions", lambda: [{"gap_id": "GAP-3"}])
+    records = _records() + [
+        {"gap_id": "GAP-3", "timestamp": "2026-01-03 10:00:00", "member_id": "M3",
+         "measure_code": "CBP", "gap_status": "OPEN", "star_impact": 2, "roi_estimate": 50},
+    ]
+    for r in records:
+        r["member_name"] = f"Name {r['member_id']}"
+    snap = {"records": pd.DataFrame(records), "error": None}
+    rows = hedis_gap_trail.select_open_gap_records(snap)
+    assert rows["gap_id"].tolist() == ["GAP-1"]
+    assert "Member: M1 — Name M1" in gap_prompt_from_row(rows.iloc[0].to_dict())
+    assert hedis_gap_trail.select_open_gap_records(snap, filter_measure="BCS").empty
+
+
+class FeedHarness(Harness):
+    """Intervention-optimizer feed as the only consumer of the shared gap data."""
+
+    def __init__(self, records, db=None, cache=None):
+        self.db = db or FakeGapDB(records)
+        self.cache = cache or SharedDataCache()
+        self.version = SharedVersion(GAPS_KEY, self.cache, interval_secs=None)
+        self.feed = RankedGapFeedCalc(self.db, self.version, cache=self.cache)
+        self.ranked = None
+
+        @reactive.effect
+        def _optimizer_table():
+            self.ranked = self.feed()
+
+        self._effects = (_optimizer_table,)
+
+    def push(self, record):
+        """_push_gap: sheet append + invalidate (push_hedis_gap), patch, bump."""
+        self.db.sheet.records.append(record)
+        self.cache.invalidate(GAPS_KEY)
+        self.feed.pushed(record)
+        self.version.changed()
+
+    def close(self, gap_id):
+        """_close_gap: sheet update + invalidate (close_hedis_gap), patch, bump."""
+        for r in self.db.sheet.records:
+            if r["gap_id"] == gap_id:
+                r["gap_status"] = "CLOSED"
+        self.cache.invalidate(GAPS_KEY)
+        self.feed.closed(gap_id)
+        self.version.changed()
+
+
+def _gap(i, star, roi, status="OPEN"):
+    return {"gap_id": f"GAP-{i}", "timestamp": f"2026-01-{i:02d} 10:00:00", "member_id": f"M{i}",
+            "measure_code": "CBP", "gap_status": status, "star_impact": star, "roi_estimate": roi}
+
+
+def test_feed_patched_by_local_writes_without_fetch(monkeypatch):
+    """This session's push/close updates the ranking with no reload or re-rank."""
+    monkeypatch.setattr(intervention_optimizer, "get_gap_suppressions", lambda: [])
+    h = FeedHarness(_records())
+    assert h.interact() == 1
+    assert list(h.ranked.rows["gap_id"]) == ["GAP-1"]
+    assert h.interact(lambda: h.push(_gap(3, 5, 900))) == 0
+    assert list(h.ranked.rows["gap_id"]) == ["GAP-3", "GAP-1"]
+    assert h.ranked.open_count == 2
+    assert h.interact(lambda: h.close("GAP-1")) == 0
+    assert list(h.ranked.rows["gap_id"]) == ["GAP-3"]
+    assert h.ranked.open_count == 1
+    # The shared poll sees the version this feed already reflects
+    assert h.interact(h.poll) == 0
+
+
+def test_feed_rebuilt_when_close_leaves_panel_short(monkeypatch):
+    """Closing a ranked gap re-ranks from the snapshot once the feed cannot fill the panel."""
+    monkeypatch.setattr(intervention_optimizer, "get_gap_suppressions", lambda: [])
+    size = intervention_optimizer.FEED_SIZE
+    monkeypatch.setattr(gap_data_layer, "PANEL_ROWS", size)
+    h = FeedHarness([_gap(i, 3, i) for i in range(1, size + 2)])
+    assert h.interact() == 1
+    assert "GAP-1" not in set(h.ranked.rows["gap_id"])
+    assert h.interact(lambda: h.close(f"GAP-{size + 1}")) == 1
+    assert len(h.ranked.rows) == size and "GAP-1" in set(h.ranked.rows["gap_id"])
+    # Every open gap is ranked now, so a further close is patched
+    assert h.interact(lambda: h.close("GAP-1")) == 0
+    assert len(h.ranked.rows) == h.ranked.open_count == size - 1
+
+
+def test_feed_rebuilt_after_other_session_write(monkeypatch):
+    """A write elsewhere since the feed was built forces one reload, not a stale patch."""
+    monkeypatch.setattr(intervention_optimizer, "get_gap_suppressions", lambda: [])
+    cache = SharedDataCache()
+    db = FakeGapDB(_records())
+    a, b = FeedHarness(None, db=db, cache=cache), FeedHarness(None, db=db, cache=cache)
+    assert a.interact() + b.interact() == 1
+    assert a.interact(lambda: a.push(_gap(3, 4, 50))) == 0
+    assert b.interact(lambda: b.push(_gap(4, 2, 10))) == 1
+    assert list(b.ranked.rows["gap_id"]) == ["GAP-3", "GAP-1", "GAP-4"]
+    assert a.interact(a.poll) == 0
+    assert a.ranked is b.ranked
+
+
+def test_feed_excludes_suppressed_gaps(monkeypatch):
+    monkeypatch.setattr(
+        intervention_optimizer, "get_gap_suppressions", lambda: [{"gap_id": "GAP-1"}]
+    )
+    h = FeedHarness(_records() + [_gap(3, 2, 0)])
+    h.interact()
+    assert list(h.ranked.rows["gap_id"]) == ["GAP-3"]
+    assert h.ranked.open_count == 1
@@ -0,0 +1,291 @@
+"""
+Unit tests — gap_recommendation (Claude streaming helpers)
+Fake async client only; no live API calls.
+"""
+import asyncio
+import os
+import sys
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+import gap_recommendation  # noqa: E402
+
+
+class _FakeStream:
+    def __init__(self, deltas):
+        self._deltas = deltas
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        async def _gen():
+            for d in self._deltas:
+                yield d
+
+        return _gen()
+
+
+class _FakeMessages:
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.calls = []
+
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        return _FakeStream(self.deltas)
+
+
+class _FakeClient:
+    def __init__(self, deltas):
+        self.messages = _FakeMessages(deltas)
+
+
+def _collect(prompt, client):
+    async def _run():
+        return [t async for t in gap_recommendation.stream_gap_recommendation(prompt, client)]
+
+    return asyncio.run(_run())
+
+
+def test_build_gap_prompt_includes_gap_fields():
+    """build_gap_prompt embeds member, measure, intervention and star impact."""
+    p = gap_recommendation.build_gap_prompt("MBR-1", "Jane Doe", "CBP", "Clinical", 4)
+    assert "MBR-1 — Jane Doe" in p
+    assert "HEDIS Measure: CBP" in p
+    assert "Intervention: Clinical" in p
+    assert "Star Impact: 4" in p
+
+
+def test_row_prompt_matches_single_gap_prompt():
+    """Snapshot floats, NaN and blanks give the single-gap form's whole-star prompt."""
+    single = gap_recommendation.build_gap_prompt("M1", "Jane Doe", "CBP", "Clinical", 4)
+    row = {"member_id": "M1", "member_name": "Jane Doe", "measure_code": "CBP",
+           "intervention_type": "Clinical"}
+    assert gap_recommendation.gap_prompt_from_row({**row, "star_impact": 4.0}) == single
+    assert gap_recommendation.gap_prompt_from_row({**row, "star_impact": "4"}) == single
+    default = gap_recommendation.build_gap_prompt("M1", "Jane Doe", "CBP", "Clinical", 3)
+    for missing in (float("nan"), None, "", "n/a"):
+        assert gap_recommendation.gap_prompt_from_row({**row, "star_impact": missing}) == default
+
+
+def test_stream_yields_accumulated_text():
+    """stream_gap_recommendation yields growing text, one item per delta."""
+    client = _FakeClient(["Call ", "member ", "today."])
+    chunks = _collect("prompt", client)
+    assert chunks == ["Call", "Call member", "Call member today."]
+    call = client.messages.calls[0]
+    assert call["model"] == gap_recommendation.GAP_REC_MODEL
+    assert call["max_tokens"] == gap_recommendation.GAP_REC_MAX_TOKENS
+    assert call["messages"][0]["content"] == "prompt"
+
+
+def test_get_async_client_is_shared(monkeypatch):
+    """get_async_client builds the client once and reuses it."""
+    sentinel = object()
+    monkeypatch.setattr(gap_recommendation, "_ASYNC_CLIENT", sentinel)
+    assert gap_recommendation.get_async_client("k1") is sentinel
+    assert gap_recommendation.get_async_client("k2") is sentinel
+
+
+def test_describe_anthropic_error_missing_key():
+    """Missing-key errors collapse to the setup hint; others pass through."""
+    e = RuntimeError("The api_key client option must be set")
+    assert gap_recommendation.describe_anthropic_error(e) == gap_recommendation.API_KEY_MISSING_MSG
+    assert gap_recommendation.describe_anthropic_error(ValueError("boom")) == "boom"
+
+
+# ── Recommendation cache ────────────────────────────────────────────────────
+
+def test_prompt_key_is_content_addressed():
+    """Same prompt → same key; any change in prompt text changes the key."""
+    a = gap_recommendation.prompt_key("Member: M1 CBP")
+    assert a == gap_recommendation.prompt_key("Member: M1 CBP")
+    assert a != gap_recommendation.prompt_key("Member: M2 CBP")
+
+
+def test_cache_hit_miss_and_disk_roundtrip(tmp_path):
+    """put → get hits; a fresh cache on the same file sees the entry."""
+    path = str(tmp_path / "rec_cache.json")
+    cache = gap_recommendation.RecommendationCache(path=path, ttl_seconds=3600, max_entries=10)
+    assert cache.get("p1") is None
+    cache.put("p1", "Schedule a BP check.", latency_ms=1200.0)
+    assert cache.get("p1") == "Schedule a BP check."
+    s = cache.stats()
+    assert (s["hits"], s["misses"], s["hit_rate"]) == (1, 1, 0.5)
+    assert s["saved_seconds"] == 1.2
+    reloaded = gap_recommendation.RecommendationCache(path=path, ttl_seconds=3600)
+    assert reloaded.get("p1") == "Schedule a BP check."
+
+
+def test_cache_coalesces_writes_and_persists_recency(tmp_path, monkeypatch):
+    """Writes inside flush_seconds are batched; flush() saves hit recency for reload."""
+    path = str(tmp_path / "rec_cache.json")
+    cache = gap_recommendation.RecommendationCache(path=path, flush_seconds=60, max_entries=2)
+    saves = []
+    real_save = cache._save
+    monkeypatch.setattr(cache, "_save", lambda: saves.append(1) or real_save())
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # b becomes LRU, in memory only so far
+    assert len(saves) == 1
+    cache.flush()
+    cache.flush()
+    assert len(saves) == 2
+    reloaded = gap_recommendation.RecommendationCache(path=path, max_entries=2)
+    reloaded.put("c", "C")
+    assert reloaded.get("b") is None
+    assert reloaded.get("a") == "A"
+
+
+def test_cache_ttl_expiry(tmp_path, monkeypatch):
+    """Entries older than ttl_seconds are misses and dropped."""
+    cache = gap_recommendation.RecommendationCache(path=None, ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr(gap_recommendation.time, "time", lambda: now[0])
+    cache.put("p", "text")
+    now[0] += 11
+    assert cache.get("p") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_lru_eviction():
+    """Least-recently-used entry is evicted once max_entries is exceeded."""
+    cache = gap_recommendation.RecommendationCache(path=None, max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # touch a → b becomes LRU
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+# ── Batch generation ────────────────────────────────────────────────────────
+
+class _FakeBatchMessages:
+    """messages.create fake: tracks peak concurrency, fails prompts containing 'FAIL'."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        prompt = kwargs["messages"][0]["content"]
+        if "FAIL" in prompt:
+            raise RuntimeError("rate limited")
+
+        class _Block:
+            text = f" rec for {prompt.splitlines()[1]} "
+
+        class _Resp:
+            content = [_Block()]
+
+        return _Resp()
+
+
+class _FakeBatchClient:
+    def __init__(self):
+        self.messages = _FakeBatchMessages()
+
+
+def _gap_frame(n, fail_ids=()):
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "gap_id": [f"GAP-{i}" for i in range(n)],
+            "member_id": [("FAIL" if f"GAP-{i}" in fail_ids else f"M{i}") for i in range(n)],
+            "measure_code": ["CBP"] * n,
+            "intervention_type": ["Outreach"] * n,
+            "star_impact": [3] * n,
+        }
+    )
+
+
+def test_batch_bounded_concurrency_and_order():
+    """Batch keeps ≤ concurrency calls in flight and returns results in input order."""
+    client = _FakeBatchClient()
+    cache = gap_recommendation.RecommendationCache(path=None)
+    results = asyncio.run(
+        gap_recommendation.generate_batch_recommendations(
+            _gap_frame(12), client, concurrency=3, cache=cache
+        )
+    )
+    assert [r["gap_id"] for r in results] == [f"GAP-{i}" for i in range(12)]
+    assert all(r["success"] for r in results)
+    assert results[0]["recommendation"] == "rec for Member: M0 — N/A"
+    assert client.messages.peak <= 3
+
+
+def test_batch_reports_failures_and_progress():
+    """Failed gaps are reported per gap; progress fires once per gap."""
+    client = _FakeBatchClient()
+    cache = gap_recommendation.RecommendationCache(path=None)
+    progress = []
+
+    async def _on_progress(p):
+        progress.append(p)
+
+    results = asyncio.run(
+        gap_recommendation.generate_batch_recommendations(
+            _gap_frame(4, fail_ids={"GAP-2"}), client, on_progress=_on_progress, cache=cache
+        )
+    )
+    failed = [r for r in results if not r["success"]]
+    assert [r["gap_id"] for r in failed] == ["GAP-2"]
+    assert failed[0]["error"] == "rate limited"
+    assert len(progress) == 4
+    assert progress[-1]["done"] == 4 and progress[-1]["failed"] == 1
+
+
+def test_batch_uses_cache():
+    """Second batch over the same gaps is served from cache without API calls."""
+    client = _FakeBatchClient()
+    cache = gap_recommendation.RecommendationCache(path=None)
+    asyncio.run(gap_recommendation.generate_batch_recommendations(_gap_frame(3), client, cache=cache))
+    calls = client.messages.calls
+    again = asyncio.run(
+        gap_recommendation.generate_batch_recommendations(_gap_frame(3), client, cache=cache)
+    )
+    assert client.messages.calls == calls
+    assert all(r["cached"] for r in again)
+
+
+def test_update_gap_recommendations_single_batch_update():
+    """update_gap_recommendations issues one batch_update and reports unknown gap_ids."""
+    import hedis_gap_trail
+
+    class _Sheet:
+        def __init__(self):
+            self.batches = []
+
+        def col_values(self, col):
+            return ["gap_id", "GAP-1", "GAP-2"]
+
+        def batch_update(self, updates):
+            self.batches.append(updates)
+
+    class _DB:
+        connected = True
+        sheet = _Sheet()
+
+    db = _DB()
+    r = hedis_gap_trail.update_gap_recommendations(db, {"GAP-2": "Call member", "GAP-9": "x"})
+    assert r["success"] is True
+    assert r["updated"] == 1
+    assert r["missing"] == ["GAP-9"]
+    assert len(db.sheet.batches) == 1
+    assert {"range": "N3", "values": [["Call member"]]} in db.sheet.batches[0]
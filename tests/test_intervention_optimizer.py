@@ -0,0 +1,191 @@
+"""
+Unit tests — intervention_optimizer (budget/capacity-constrained gap selection)
+No live DB/API calls.
+"""
+
+import itertools
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+import intervention_optimizer  # noqa: E402
+from intervention_optimizer import (  # noqa: E402
+    FEED_SIZE,
+    compute_priority_scores,
+    intervention_costs,
+    priority_values,
+    ranked_gap_feed,
+    select_interventions,
+    snapshot_priority_scores,
+    top_priority_gaps,
+)
+
+TYPES = ["Outreach", "Clinical", "Administrative"]
+
+
+def _gaps(n, seed=0, whole_dollars=True):
+    rng = np.random.default_rng(seed)
+    cost = rng.integers(2, 40, n) * 5.0 if whole_dollars else rng.uniform(10, 200, n)
+    return pd.DataFrame(
+        {
+            "gap_id": [f"G{i}" for i in range(n)],
+            "gap_status": "OPEN",
+            "intervention_type": rng.choice(TYPES, n),
+            "star_impact": rng.integers(1, 6, n),
+            "roi_estimate": rng.uniform(0, 2000, n).round(0),
+            "intervention_cost": cost,
+            "coordinator_hours": rng.integers(1, 9, n) * 0.25,
+        }
+    )
+
+
+def _brute_force(df, budget, capacity):
+    value = priority_values(df)
+    cost, hours = intervention_costs(df)
+    best = 0.0
+    for r in range(len(df) + 1):
+        for combo in itertools.combinations(range(len(df)), r):
+            idx = list(combo)
+            if cost[idx].sum() <= budget and hours[idx].sum() <= capacity:
+                best = max(best, value[idx].sum())
+    return best
+
+
+def test_priority_values_match_scores():
+    df = _gaps(50)
+    scored = compute_priority_scores(df)
+    np.testing.assert_allclose(
+        scored["priority_score"].to_numpy(), np.sort(priority_values(df))[::-1]
+    )
+
+
+def test_costs_default_by_intervention_type():
+    df = pd.DataFrame(
+        {"intervention_type": ["Clinical", "Administrative", "Unknown"], "star_impact": 3}
+    )
+    cost, hours = intervention_costs(df)
+    assert cost.tolist() == [150.0, 15.0, 40.0]
+    assert hours.tolist() == [1.0, 0.25, 0.5]
+
+
+@pytest.mark.parametrize("method", ["greedy", "dp", "auto"])
+def test_selection_is_feasible(method):
+    df = _gaps(40, seed=3)
+    r = select_interventions(df, budget=1_000, capacity_hours=8, method=method)
+    cost, hours = intervention_costs(df)
+    assert r["cost"] <= 1_000 and r["hours"] <= 8
+    assert r["cost"] == pytest.approx(cost[r["selected"]].sum())
+    assert len(set(r["selected"].tolist())) == len(r["selected"])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dp_is_exact_on_small_sets(seed):
+    df = _gaps(12, seed=seed)
+    r = select_interventions(df, budget=400, capacity_hours=4, method="auto")
+    assert r["method"] in ("dp", "greedy")
+    assert r["value"] == pytest.approx(_brute_force(df, 400, 4))
+
+
+def test_auto_never_worse_than_greedy():
+    for seed in range(10):
+        df = _gaps(30, seed=seed, whole_dollars=False)
+        auto = select_interventions(df, budget=900, capacity_hours=6)
+        greedy = select_interventions(df, budget=900, capacity_hours=6, method="greedy")
+        assert auto["value"] >= greedy["value"] - 1e-9
+
+
+def test_closed_gaps_and_unconstrained():
+    df = _gaps(20)
+    df.loc[:9, "gap_status"] = "CLOSED"
+    r = select_interventions(df)
+    assert sorted(r["selected"].tolist()) == list(range(10, 20))
+
+
+@pytest.mark.parametrize("method", ["greedy", "dp", "auto"])
+@pytest.mark.parametrize("limits", [(0, 8), (1_000, 0), (-5, 8), (1_000, -1)])
+def test_no_budget_or_capacity_selects_nothing(method, limits):
+    """Non-positive limits short-circuit before any cost/budget ratio is computed."""
+    df = _gaps(40, seed=4)
+    df.loc[:4, "intervention_cost"] = 0.0
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        r = select_interventions(df, budget=limits[0], capacity_hours=limits[1], method=method)
+    assert len(r["selected"]) == 0 and r["value"] == r["cost"] == r["hours"] == 0.0
+
+
+def test_dp_rejects_large_sets():
+    with pytest.raises(ValueError):
+        select_interventions(_gaps(500), budget=5_000, capacity_hours=40, method="dp")
+
+
+def test_100k_gaps_greedy_matches_item_loop():
+    """The cumsum prefix rounds pick exactly what an item-by-item greedy pass picks."""
+    df = _gaps(100_000)
+    budget, capacity = 250_000.0, 2_000.0
+    r = select_interventions(df, budget=budget, capacity_hours=capacity)
+    assert r["method"] == "greedy"
+    assert r["cost"] <= budget and r["hours"] <= capacity
+
+    value = priority_values(df)
+    cost, hours = intervention_costs(df)
+    ratio = value / (cost / budget + hours / capacity)
+    expected = []
+    for i in np.argsort(-ratio, kind="stable"):
+        if value[i] > 0 and cost[i] <= budget and hours[i] <= capacity:
+            expected.append(i)
+            budget -= cost[i]
+            capacity -= hours[i]
+    assert sorted(r["selected"].tolist()) == sorted(expected)
+
+
+def test_top_priority_gaps_matches_full_sort():
+    df = _gaps(5_000, seed=7)
+    full = compute_priority_scores(df).head(25)
+    top = top_priority_gaps(df, 25)
+    assert len(top) == 25
+    np.testing.assert_allclose(top["priority_score"].to_numpy(), full["priority_score"].to_numpy())
+    assert "priority_score" not in df.columns
+
+
+def test_top_priority_gaps_mask_and_small_frames():
+    df = _gaps(30, seed=1)
+    mask = np.arange(30) % 2 == 0
+    top = top_priority_gaps(df, 100, mask=mask)
+    assert len(top) == 15
+    assert (top.index % 2 == 0).all()
+    assert top_priority_gaps(df.iloc[:0], 5).empty
+
+
+def test_snapshot_scores_cached_until_reload():
+    snapshot = {"records": _gaps(100), "error": None}
+    first = snapshot_priority_scores(snapshot)
+    assert snapshot_priority_scores(snapshot) is first
+    np.testing.assert_allclose(first, priority_values(snapshot["records"]))
+    reloaded = {"records": snapshot["records"], "error": None}
+    assert snapshot_priority_scores(reloaded) is not first
+
+
+def test_feed_patches_keep_size_and_order(monkeypatch):
+    monkeypatch.setattr(intervention_optimizer, "get_gap_suppressions", lambda: [])
+    snapshot = {"records": _gaps(500, seed=2), "error": None}
+    feed = ranked_gap_feed(snapshot, version=0)
+    assert ranked_gap_feed(snapshot, version=0) is feed
+    assert len(feed.rows) == FEED_SIZE and feed.open_count == 500
+    best = {"gap_id": "NEW", "gap_status": "OPEN", "star_impact": 5, "roi_estimate": 99_999}
+    worst = {"gap_id": "LOW", "gap_status": "OPEN", "star_impact": 1, "roi_estimate": 0}
+    patched = feed.pushed(best, 1).pushed(worst, 2)
+    assert patched.rows["gap_id"].iat[0] == "NEW"
+    assert "LOW" not in set(patched.rows["gap_id"]) and len(patched.rows) == FEED_SIZE
+    assert patched.open_count == 502
+    closed = patched.closed("NEW", 3).closed("NEW", 4)
+    assert closed.open_count == 501 and closed.version == 4
+    assert "NEW" not in set(closed.rows["gap_id"])
+    assert len(feed.rows) == FEED_SIZE  # original feed untouched
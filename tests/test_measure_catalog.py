@@ -0,0 +1,69 @@
+"""
+Unit tests — measure_catalog (shared HEDIS measure catalog)
+No live DB/API calls.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+from measure_catalog import get_measure_catalog, load_measure_catalog  # noqa: E402
+
+
+def test_catalog_is_shared_and_read_only():
+    """One process-wide instance; columns and records cannot be mutated."""
+    catalog = get_measure_catalog()
+    assert get_measure_catalog() is catalog
+    rates = catalog.column("current_rate")
+    with pytest.raises(ValueError):
+        rates[0] = 0.0
+    with pytest.raises(TypeError):
+        catalog.records["CBP"]["benchmark"] = 0.0  # type: ignore[index]
+
+
+def test_subsets_align_pages_on_one_code_set():
+    """Analyzer and ROI optimizer read the same codes; COL is colorectal, FUM is ED follow-up."""
+    catalog = get_measure_catalog()
+    perf = catalog.performance_measures
+    port = catalog.portfolio_measures
+    assert list(perf) == list(port) == ["COL", "HBD", "MAD", "BCS", "CBP", "OMW", "FUM"]
+    assert catalog.row("COL")["name"] == "Colorectal Cancer Screening"
+    assert catalog.row("FUM")["name"].startswith("Follow-Up After ED Visit")
+    assert catalog.row("CBP")["population"] == 7650
+    assert catalog.row("GSD")["current_rate"] is None
+    gap = perf.column("benchmark") - perf.column("current_rate")
+    assert np.isclose(gap[perf.index_of("FUM")], 16.1)
+
+
+def test_pages_derive_from_catalog():
+    """hedis_gap_trail, hedis_analyzer and roi_portfolio_optimizer share the catalog rows."""
+    import hedis_gap_trail
+    import pages.hedis_analyzer
+    from pages.roi_portfolio_optimizer import PORTFOLIO_MEASURES, SCENARIOS
+
+    catalog = get_measure_catalog()
+    gap_measures = hedis_gap_trail.HEDIS_MEASURES
+    assert gap_measures["COL"] == ("Colorectal Cancer Screening", "Effectiveness")
+    assert set(gap_measures) == set(catalog)
+    analyzer_row = pages.hedis_analyzer.HEDIS_MEASURES["COL"]
+    assert analyzer_row == PORTFOLIO_MEASURES["COL"] == catalog.row("COL")
+    for allocation in SCENARIOS.values():
+        assert set(allocation) == set(PORTFOLIO_MEASURES)
+
+
+def test_load_rejects_missing_columns_and_duplicates(tmp_path):
+    bad = tmp_path / "bad.csv"
+    bad.write_text("code,name\nCBP,Blood Pressure\n")
+    with pytest.raises(ValueError, match="missing columns"):
+        load_measure_catalog(str(bad))
+
+    header = open(os.path.join(app_path, "data", "measure_catalog.csv")).readline()
+    dup = tmp_path / "dup.csv"
+    dup.write_text(header + "CBP,A,Effectiveness,,,,,,,,,,,\nCBP,B,Effectiveness,,,,,,,,,,,\n")
+    with pytest.raises(ValueError, match="duplicate codes: CBP"):
+        load_measure_catalog(str(dup))
@@ -0,0 +1,86 @@
+"""
+Unit tests — member_gap_engine (columnar care gap queue)
+No live DB/API calls.
+"""
+import os
+import sys
+
+import numpy as np
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+from member_gap_engine import (  # noqa: E402
+    MemberGapEngine,
+    get_member_gap_engine,
+    synthetic_member_table,
+)
+
+CODES = ["HBD", "CBP", "COL", "BCS", "MAD", "OMW"]
+
+
+def test_shipped_queue_summary_and_order():
+    """data/member_gap_queue.csv: totals match the sample queue; High first, riskiest first."""
+    engine = get_member_gap_engine()
+    summary = engine.summary()
+    assert summary["total_members"] == 8
+    assert summary["total_gaps"] == 16
+    assert summary["high_priority"] == 3
+    assert summary["by_priority"] == {"High": 3, "Medium": 3, "Low": 2}
+    queue = engine.queue()
+    assert [m["member_id"] for m in queue[:3]] == ["M006745", "M001847", "M002156"]
+    assert queue[0]["gaps"] == ["HBD", "CBP", "COL", "OMW"]
+    assert queue[0]["last_contact"] == "3 days ago"
+    assert [m["priority"] for m in engine.queue("Low")] == ["Low", "Low"]
+    assert engine.count("Medium") == 3
+
+
+def test_queue_slices_match_bruteforce():
+    """Per-priority indexes agree with a Python filter + sort over the same rows."""
+    df = synthetic_member_table(2_000, CODES, seed=3)
+    engine = MemberGapEngine(df, CODES)
+    rows = df.to_dict("records")
+    for priority in ("High", "Medium", "Low"):
+        expected = sorted(
+            (i for i, r in enumerate(rows) if r["priority"] == priority),
+            key=lambda i: -rows[i]["risk_score"],
+        )
+        assert engine.index(priority).tolist() == expected
+        page = engine.queue(priority, start=10, stop=20)
+        assert [m["member_id"] for m in page] == [rows[i]["member_id"] for i in expected[10:20]]
+    assert engine.summary()["total_gaps"] == int(df[CODES].to_numpy().sum())
+
+
+def test_500k_members_queries_are_index_lookups(monkeypatch):
+    """Summary, counts and queue pages read indexes built at load; a page hydrates only its rows."""
+    engine = MemberGapEngine(synthetic_member_table(500_000, CODES), CODES)
+    hydrated = []
+    rows = engine.rows
+    monkeypatch.setattr(engine, "rows", lambda idx: hydrated.append(len(idx)) or rows(idx))
+    for priority in ("All", "High", "Medium", "Low"):
+        assert engine.summary() is engine.summary()
+        assert engine.index(priority) is engine.index(priority)
+        assert engine.count(priority) == len(engine.index(priority))
+        assert len(engine.queue(priority, 0, 25)) == 25
+    assert hydrated == [25, 25, 25, 25]
+    assert sum(engine.count(p) for p in ("High", "Medium", "Low")) == len(engine)
+    assert np.all(np.diff(engine.risk_score[engine.index("High")]) <= 0)
+
+
+def test_queue_page_payload_is_bounded():
+    """One rendered queue page stays well under 50 KB however large the queue is."""
+    from shiny import ui
+
+    from pages.care_gap_workflow import QUEUE_PAGE_SIZE, member_queue_rows
+
+    engine = MemberGapEngine(synthetic_member_table(100_000, CODES, seed=1), CODES)
+    first = engine.queue("All", 0, QUEUE_PAGE_SIZE)
+    last = engine.queue("All", len(engine) - QUEUE_PAGE_SIZE, None)
+    for page in (first, last):
+        html = str(ui.TagList(*member_queue_rows(page)))
+        assert len(page) == QUEUE_PAGE_SIZE
+        assert len(html.encode()) < 50_000
+    assert "style=" not in str(ui.TagList(*member_queue_rows(first))).replace(
+        'style="width: 100%;"', ""
+    )
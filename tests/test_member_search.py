@@ -0,0 +1,96 @@
+"""
+Unit tests — member_search (typeahead prefix/trigram index)
+No live DB/API calls.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+import member_search  # noqa: E402
+from member_search import MemberSearchIndex, get_member_search_index  # noqa: E402
+from member_store import build_member_store  # noqa: E402
+
+IDS = ["M001847", "M002156", "M003421", "M004892", "M005234"]
+NAMES = ["Patricia Anderson", "James Martinez", "Mary Johnson", "Robert Chen", "Linda Williams"]
+
+
+def _names(idx, rows):
+    return [str(idx.names[i]) for i in rows]
+
+
+def test_prefix_matches_id_full_name_and_surname():
+    idx = MemberSearchIndex(IDS, NAMES)
+    assert _names(idx, idx.search("M0021")) == ["James Martinez"]
+    assert _names(idx, idx.search("pat")) == ["Patricia Anderson"]
+    assert _names(idx, idx.search("  MARY   john ")) == ["Mary Johnson"]
+    assert _names(idx, idx.search("chen")) == ["Robert Chen"]
+    assert _names(idx, idx.search("m00", k=2)) == ["Patricia Anderson", "James Martinez"]
+    assert len(idx.search("")) == 0 and len(idx.search("zz")) == 0
+
+
+def test_substring_fallback_after_prefix_hits():
+    """Trigram hits are verified against the full query and follow prefix hits."""
+    idx = MemberSearchIndex(IDS + ["M009999"], NAMES + ["Sonia Park"])
+    assert _names(idx, idx.search("son")) == ["Sonia Park", "Mary Johnson", "Patricia Anderson"]
+    assert _names(idx, idx.search("tricia and")) == ["Patricia Anderson"]
+    # every trigram present, but not as one substring
+    assert len(idx.search("artinez james")) == 0
+
+
+def test_index_built_from_store_and_rebuilt_on_write(tmp_path):
+    store = build_member_store(str(tmp_path / "members.db"))
+    idx = get_member_search_index(store)
+    assert idx.choices("anders") == {"M001847": "Patricia Anderson - Age 68, Very High Risk"}
+    assert get_member_search_index(store) is idx
+    store.load_profiles([{"member_id": "M777777", "name": "Andrea Lopez", "age": 70}])
+    rebuilt = get_member_search_index(store)
+    assert rebuilt is not idx
+    assert list(rebuilt.choices("andr")) == ["M777777"]
+
+
+def test_typeahead_choices_keep_current_selection(tmp_path):
+    """Typing only refreshes the options; the selected member stays selectable."""
+    from pages.member_profile import search_choices
+
+    store = build_member_store(str(tmp_path / "members.db"))
+    assert list(search_choices(store, "james", "M001847")) == ["M002156", "M001847"]
+    assert list(search_choices(store, "anders", "M001847")) == ["M001847"]
+    assert list(search_choices(store, "", None)) == ["M001847", "M002156"]
+    assert search_choices(store, "zzz", "M001847") == {}
+
+
+def test_topk_verifies_candidates_not_whole_index():
+    """Prefix hits need no scan; substring hits verify at most one chunk of trigram candidates."""
+    rng = np.random.default_rng(0)
+    first = np.array(["Patricia", "James", "Mary", "Robert", "Linda", "David", "Sarah", "Li"])
+    last = np.array(["Anderson", "Martinez", "Johnson", "Chen", "Williams", "Nelson", "Wu"])
+    n = 200_000
+    names = np.char.add(
+        np.char.add(first[rng.integers(0, len(first), n)], " "),
+        last[rng.integers(0, len(last), n)],
+    )
+    ids = np.char.add("M", np.char.zfill(np.arange(n).astype(str), 7))
+    idx = MemberSearchIndex(ids, names)
+    idx.search("son")  # builds the trigram postings once
+    verified = []
+
+    class _CountingNames(np.ndarray):
+        def __getitem__(self, key):
+            if isinstance(key, np.ndarray):
+                verified.append(len(key))
+            return super().__getitem__(key)
+
+    idx._lower_names = idx._lower_names.view(_CountingNames)
+    for query in ("M01234", "patr", "mary joh", "son", "tinez", "ia wi"):
+        verified.clear()
+        rows = idx.search(query)
+        assert sum(verified) <= member_search._VERIFY_CHUNK
+        assert len(rows) == 20
+        for i in rows:
+            assert query.lower() in f"{idx.member_ids[i]} {idx.names[i]}".lower()
@@ -0,0 +1,125 @@
+"""
+Unit tests — member_store (indexed member profile repository)
+No live DB/API calls.
+"""
+
+import json
+import os
+import sys
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+from member_store import (  # noqa: E402
+    _GET_MEMBER_SQL,
+    PROFILE_SECTIONS,
+    MemberStore,
+    build_member_store,
+    member_label,
+)
+
+
+def _synthetic_profiles(n):
+    for i in range(n):
+        yield {
+            "member_id": f"M{i:07d}",
+            "name": f"Member {i}",
+            "age": 65 + i % 30,
+            "risk_tier": "High",
+            "risk_score": 1.0 + (i % 40) / 10,
+            "gender": "Female",
+            "open_gaps": [{"code": "CBP", "value": 1120}],
+            "timeline": [],
+        }
+
+
+def test_seeded_store_lookup_and_unknown_member(tmp_path):
+    """Seed JSON builds the DB; unknown IDs return None instead of another member."""
+    store = build_member_store(str(tmp_path / "members.db"))
+    assert len(store) == 2
+    member = store.get("M001847")
+    assert member is not None and member["name"] == "Patricia Anderson"
+    assert member_label(member) == "Patricia Anderson - Age 68, Very High Risk"
+    assert store.get("M999999") is None
+    assert "M002156" in store and "M999999" not in store
+    assert [m["member_id"] for m in store.list_members()] == ["M001847", "M002156"]
+
+
+def test_sections_load_lazily_once(tmp_path):
+    """Core row first; each section is fetched on first read and reused after."""
+    store = build_member_store(str(tmp_path / "members.db"))
+    member = store.get("M001847")
+    assert member.loaded_sections == frozenset()
+    queries = store.queries
+    assert len(member["open_gaps"]) == 3
+    assert member["open_gaps"][0]["code"] == "HBD"
+    assert member.loaded_sections == {"care_gaps"}
+    assert store.queries == queries + 1
+    assert store.get("M001847") is member
+    assert member["open_gaps"] is member["open_gaps"]
+    assert store.queries == queries + 1
+    assert member["timeline"][0]["type"] == "Contact"
+    assert store.get("M002156")["timeline"] == []
+
+
+def test_lru_bounds_hydrated_profiles(tmp_path):
+    store = MemberStore(str(tmp_path / "members.db"), cache_size=2)
+    store.load_profiles(_synthetic_profiles(5))
+    for mid in ("M0000000", "M0000001", "M0000002"):
+        store.get(mid)
+    assert store.stats()["cached_profiles"] == 2
+    queries = store.queries
+    store.get("M0000002")
+    assert store.queries == queries
+    store.get("M0000000")
+    assert store.queries == queries + 1
+
+
+def test_lookup_is_one_primary_key_search(tmp_path):
+    """get() is a single indexed search, never a scan, however many members are stored."""
+    store = MemberStore(str(tmp_path / "members.db"), cache_size=0)
+    store.load_profiles(_synthetic_profiles(50_000))
+    plan = store._conn.execute(f"EXPLAIN QUERY PLAN {_GET_MEMBER_SQL}", ("M0000050",)).fetchall()
+    assert [row[-1] for row in plan] == ["SEARCH members USING PRIMARY KEY (member_id=?)"]
+    queries = store.queries
+    for i in range(0, 50_000, 50):
+        assert store.get(f"M{i:07d}")["age"] == 65 + i % 30
+    assert store.queries == queries + 1_000
+
+
+def test_seed_file_change_rebuilds_store(tmp_path):
+    """Editing the seed JSON reseeds an existing DB; an unchanged file is not reloaded."""
+    seed = tmp_path / "members.json"
+    db = str(tmp_path / "members.db")
+    profiles = list(_synthetic_profiles(3))
+    seed.write_text(json.dumps(profiles))
+    assert len(build_member_store(db, str(seed))) == 3
+    store = build_member_store(db, str(seed))
+    assert store.version == 0
+    profiles[0]["name"] = "Renamed"
+    seed.write_text(json.dumps(profiles[:2]))
+    store = build_member_store(db, str(seed))
+    assert len(store) == 2 and store.version == 1
+    assert store.get("M0000000")["name"] == "Renamed"
+    assert store.get("M0000002") is None
+
+
+def test_profile_view_hydrates_in_one_query(tmp_path):
+    """The profile page view model costs one row lookup plus one section query."""
+    from pages.member_profile import build_profile_view
+
+    store = build_member_store(str(tmp_path / "members.db"))
+    queries = store.queries
+    view = build_profile_view(store, "M001847")
+    assert store.queries == queries + 2
+    assert view["member"].loaded_sections == set(PROFILE_SECTIONS)
+    assert view["open_gap_count"] == 3
+    assert view["open_gap_value"] == 890 + 1120 + 650
+    assert view["total_gaps"] == 5
+    assert view["revenue_at_risk"] == 2660
+    assert len(view["timeline"]) == 6
+    # Reading every field afterwards needs no more queries
+    dict(view["member"])
+    assert store.queries == queries + 2
+    assert build_profile_view(store, "M404")["member"] is None
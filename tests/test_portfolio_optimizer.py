@@ -0,0 +1,154 @@
+"""
+Unit tests — portfolio_optimizer (ROI budget allocation)
+No live DB/API calls.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+from portfolio_optimizer import (  # noqa: E402
+    get_budget_frontier,
+    get_portfolio_model,
+    whole_percents,
+)
+
+
+def _random_feasible(model, budget, min_pct, max_pct, n, seed=0):
+    """Random allocations inside the per-measure bounds spending the whole budget."""
+    low, high = model.bounds(budget, min_pct, max_pct)
+    rng = np.random.default_rng(seed)
+    out = []
+    while len(out) < n:
+        w = rng.dirichlet(np.ones(len(model)))
+        spend = low + w * (budget - low.sum())
+        if (spend <= high + 1e-6).all():
+            out.append(spend)
+    return np.array(out)
+
+
+def test_solution_respects_constraints():
+    model = get_portfolio_model()
+    r = model.solve(1_000_000, min_pct=5, max_pct=30, max_budget=800_000)
+    assert r["budget"] == 800_000
+    assert r["spent"] == pytest.approx(800_000)
+    assert (r["spend"] >= 0.05 * 800_000 - 1e-6).all()
+    assert (r["spend"] <= 0.30 * 800_000 + 1e-6).all()
+    assert sum(whole_percents(r["pct"])) == round(r["pct"].sum())
+
+
+def test_solution_beats_random_feasible_allocations():
+    model = get_portfolio_model()
+    r = model.solve(500_000, min_pct=5, max_pct=40)
+    others = _random_feasible(model, 500_000, 5, 40, 2_000)
+    best_other = model.revenue(others).sum(axis=1).max()
+    assert r["total_revenue"] >= best_other - 1e-6
+
+
+def test_response_curves_are_concave_and_capped_at_gap():
+    model = get_portfolio_model()
+    spend = np.linspace(0, 20_000_000, 401)[:, None] * np.ones(len(model))
+    gain = model.improvement(spend)
+    assert (gain[0] == 0).all()
+    assert (np.diff(gain, axis=0) >= 0).all()
+    assert (np.diff(gain, n=2, axis=0) <= 1e-9).all()
+    assert (gain <= model.gap).all()
+    assert np.allclose(gain[-1], model.gap, rtol=1e-3)
+
+
+def test_interior_measures_share_one_marginal_return():
+    """At the optimum every measure strictly inside its bounds earns the same last dollar."""
+    model = get_portfolio_model()
+    r = model.solve(2_000_000, min_pct=2, max_pct=60)
+    low, high = model.bounds(2_000_000, 2, 60)
+    interior = (r["spend"] > low + 1) & (r["spend"] < high - 1)
+    assert interior.sum() >= 2
+    mr = model.marginal_return(r["spend"])[interior]
+    assert np.allclose(mr, mr[0], rtol=1e-6)
+
+
+def test_batched_allocation_matches_single_solves():
+    model = get_portfolio_model()
+    budgets = np.array([100_000.0, 750_000.0, 3_000_000.0])
+    low = np.outer(budgets, np.full(len(model), 0.05))
+    high = np.outer(budgets, np.full(len(model), 0.40))
+    batch = model.allocate(budgets, low, high)
+    for b, spend in zip(budgets, batch, strict=True):
+        assert np.allclose(spend, model.solve(b, 5, 40)["spend"])
+
+
+def test_infeasible_minimum_raises():
+    with pytest.raises(ValueError):
+        get_portfolio_model().solve(500_000, min_pct=20, max_pct=40)
+
+
+def test_solve_is_one_vectorized_allocation(monkeypatch):
+    """solve() is a single batched allocate() call, never a per-step greedy loop."""
+    model = get_portfolio_model()
+    calls = []
+    allocate = type(model).allocate
+
+    def _counting(self, budgets, low, high):
+        calls.append(np.shape(budgets))
+        return allocate(self, budgets, low, high)
+
+    monkeypatch.setattr(type(model), "allocate", _counting)
+    model.solve(500_000, 5, 40, 750_000)
+    assert calls == [(1,)]
+
+
+def test_frontier_matches_point_solves_and_is_cached():
+    model = get_portfolio_model()
+    f = get_budget_frontier(50_000.0, 5_000_000.0, 5.0, 40.0, 750_000.0)
+    assert len(f["budget"]) == 200
+    assert f["spend"].shape == (200, len(model))
+    assert (np.diff(f["revenue"]) >= -1e-6).all()
+    assert f["spent"].max() == pytest.approx(750_000)
+    for i in (0, 57, 199):
+        single = model.solve(f["budget"][i], 5, 40, 750_000)
+        assert f["revenue"][i] == pytest.approx(single["total_revenue"], rel=1e-9)
+    assert get_budget_frontier(50_000.0, 5_000_000.0, 5.0, 40.0, 750_000.0) is f
+    assert not f["revenue"].flags.writeable
+
+
+def test_frontier_figure_marks_current_allocation():
+    from pages.roi_portfolio_optimizer import frontier_figure
+
+    f = get_budget_frontier(50_000.0, 5_000_000.0, 5.0, 40.0, 750_000.0)
+    fig = frontier_figure(f, 500_000, 900_000, 750_000)
+    assert [t.name for t in fig.data] == ["Optimal revenue", "ROI", "Current sliders"]
+    assert len(fig.data[0].x) == 200
+
+
+def test_page_evaluation_caps_spend_at_max_budget():
+    """Every ROI card reads one evaluation; spend never exceeds the max budget."""
+    from pages.roi_portfolio_optimizer import evaluate_portfolio
+
+    model = get_portfolio_model()
+    allocations = dict.fromkeys(model.codes, 10)
+    r = evaluate_portfolio(model, allocations, 1_000_000, 600_000)
+    assert r["spent"] == pytest.approx(600_000)
+    assert r["total_budget"] == 1_000_000
+    assert np.allclose(r["spend"], 600_000 / len(model))
+    assert r["total_revenue"] == pytest.approx(model.revenue(r["spend"]).sum())
+    assert r["allocations"] == allocations
+
+
+def test_page_evaluation_keeps_optimizer_unspent_share():
+    """Caps that cannot reach 100% leave budget unspent; the cards show what solve() spent."""
+    from pages.roi_portfolio_optimizer import evaluate_portfolio
+
+    model = get_portfolio_model()
+    r = model.solve(1_000_000, 0, 10, None)
+    assert r["spent"] == pytest.approx(100_000 * len(model))
+    sliders = dict(zip(model.codes, whole_percents(r["pct"]), strict=True))
+    cards = evaluate_portfolio(model, sliders, 1_000_000, None)
+    assert cards["spent"] == pytest.approx(r["spent"])
+    assert cards["total_revenue"] == pytest.approx(r["total_revenue"])
+    assert np.allclose(cards["spend"], r["spend"])
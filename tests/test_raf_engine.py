@@ -0,0 +1,226 @@
+"""
+Unit tests — raf_engine (vectorized CMS-HCC RAF scoring)
+No live DB/API calls.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+from raf_engine import (  # noqa: E402
+    BASE_RATE_PMPM,
+    HCC_MODEL,
+    HccMatrix,
+    RafModel,
+    RiskPopulation,
+    get_raf_model,
+    get_risk_population,
+    naive_hierarchies,
+    parse_hcc,
+    risk_tiers,
+    tier_summary,
+)
+
+
+def test_parse_hcc_forms():
+    assert parse_hcc(18) == parse_hcc("18") == parse_hcc("HCC 18") == 18
+    with pytest.raises(ValueError):
+        parse_hcc("none")
+
+
+def test_from_pairs_sorts_and_dedupes():
+    m = HccMatrix.from_pairs(np.array([2, 0, 2, 2]), np.array([5, 1, 3, 5]), 4, 10)
+    assert m.indptr.tolist() == [0, 1, 1, 3, 3]
+    assert m.member_cols(2).tolist() == [3, 5]
+    assert m.row_ids().tolist() == [0, 2, 2]
+
+
+def test_hand_scored_member():
+    """Diabetes (18 trumps 19) + CHF + CKD 4: hierarchy, interactions, demographics."""
+    model = get_raf_model()
+    matrix = model.matrix([["HCC 18", "HCC 19", "HCC 85", "HCC 134", "HCC 999"], []])
+    s = model.score(matrix, age=np.array([68, 72]), female=np.array([True, False]))
+    disease = HCC_MODEL[18][1] + HCC_MODEL[85][1] + HCC_MODEL[134][1]
+    interaction = 0.121 + 0.156  # DIABETES×CHF, CHF×RENAL
+    assert s["hcc_count"].tolist() == [3, 0]
+    assert s["disease"][0] == pytest.approx(disease)
+    assert s["interaction"][0] == pytest.approx(interaction)
+    assert s["raf"][0] == pytest.approx(0.323 + disease + interaction)
+    assert s["raf"][1] == pytest.approx(0.389)
+
+
+def test_hierarchy_chain_keeps_only_top():
+    model = get_raf_model()
+    matrix = model.matrix([[8, 9, 10, 12], [9, 12], [12], [135, 134, 138]])
+    keep = model.apply_hierarchies(matrix)
+    paid = [set(model.codes[matrix.cols[keep & (matrix.row_ids() == i)]]) for i in range(4)]
+    assert paid == [{8}, {9}, {12}, {135}]
+
+
+def test_tier_summary_aggregates():
+    raf = np.array([0.5, 0.7, 1.5, 2.5, 3.5, 4.5])
+    assert risk_tiers(raf).tolist() == [0, 0, 1, 2, 3, 3]
+    s = tier_summary(raf)
+    assert list(s) == ["Very High", "High", "Medium", "Low"]
+    assert s["Very High"] == {
+        "count": 2,
+        "avg_raf": 4.0,
+        "revenue_pmpm": round(4.0 * BASE_RATE_PMPM),
+    }
+    assert s["Low"]["count"] == 2 and s["Low"]["avg_raf"] == 0.6
+
+
+def test_risk_population_cached_with_tier_totals():
+    population = get_risk_population()
+    assert get_risk_population() is population
+    assert sum(t["count"] for t in population.summary().values()) == len(population)
+    assert (population.raf > 0).all()
+
+
+def test_score_components_add_up_per_member():
+    model = get_raf_model()
+    matrix, age, female = model.synthetic_population(10_000, seed=7)
+    s = model.score(matrix, age, female)
+    assert all(col.shape == (10_000,) for col in s.values())
+    parts = s["demographic"] + s["disease"] + s["interaction"] + s["count_factor"]
+    np.testing.assert_allclose(s["raf"], parts)
+    keep = model.apply_hierarchies(matrix)
+    np.testing.assert_array_equal(
+        s["hcc_count"], np.bincount(matrix.row_ids()[keep], minlength=10_000)
+    )
+
+
+def test_dominance_follows_table_and_spans_words():
+    """Only listed pairs trump (1 does not drop 80 without 70); bits past 64 work."""
+    model_table = {c: (f"HCC {c}", 0.1, 1.0) for c in range(1, 81)}
+    model = RafModel(model_table, hierarchies={1: (70,), 70: (80,)}, groups={}, interactions={})
+    assert model.dominance.shape == (80, 2)
+    matrix = model.matrix([[1, 80], [70, 80], [80, 2]])
+    keep = model.apply_hierarchies(matrix)
+    assert keep.tolist() == [True, True, True, False, True, True]
+    np.testing.assert_array_equal(keep, naive_hierarchies(model, matrix))
+
+
+def test_bitmask_hierarchies_match_per_member_loop():
+    """Both paths drop the same entries; speed is left to `python raf_engine.py`."""
+    model = get_raf_model()
+    matrix, _, _ = model.synthetic_population(20_000, seed=3)
+    keep = model.apply_hierarchies(matrix)
+    assert (~keep).sum() > 0
+    np.testing.assert_array_equal(keep, naive_hierarchies(model, matrix))
+
+
+def _rescored(model, bits, age, female):
+    """Full sparse rescore from packed member bits (reference for deltas)."""
+    present = [model.codes[np.flatnonzero(row)] for row in _unpack(model, bits)]
+    return model.score(model.matrix(present), age, female)["raf"]
+
+
+def _unpack(model, bits):
+    cols = np.arange(len(model))
+    return ((bits[:, cols // 64] >> (cols % 64).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+
+def test_dense_path_matches_sparse_path():
+    model = get_raf_model()
+    matrix, age, female = model.synthetic_population(5_000, seed=11)
+    present = _unpack(model, model.member_bits(matrix))
+    np.testing.assert_allclose(
+        model.score_present(present, age, female)["raf"], model.score(matrix, age, female)["raf"]
+    )
+
+
+def test_deltas_match_full_rescore():
+    model = get_raf_model()
+    matrix, age, female = model.synthetic_population(3_000, seed=5)
+    population = RiskPopulation(model, matrix, age, female)
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        members = rng.integers(0, 3_000, 200)
+        hccs = rng.choice(model.codes, 200)
+        changed = population.apply_deltas(members, hccs, rng.random(200) < 0.6)
+        assert set(changed.tolist()) == set(members.tolist())
+    assert population.version == 5
+    np.testing.assert_allclose(population.raf, _rescored(model, population.bits, age, female))
+    assert population.summary() == tier_summary(population.raf)
+
+
+def test_delta_last_entry_wins_and_tiers_move():
+    model = get_raf_model()
+    population = RiskPopulation(model, model.matrix([[], [85]]), np.array([70, 70]), np.ones(2))
+    assert population.summary()["Low"]["count"] == 2
+    population.apply_deltas(
+        np.array([0, 0, 0, 0]), ["HCC 8", "HCC 9", "HCC 106", "HCC 9"], np.array([1, 1, 1, 0])
+    )
+    raf = population.raf[0]
+    assert raf == pytest.approx(0.386 + HCC_MODEL[8][1] + HCC_MODEL[106][1])
+    assert population.summary()["Very High"] == {
+        "count": 1,
+        "avg_raf": round(raf, 2),
+        "revenue_pmpm": round(raf * BASE_RATE_PMPM),
+    }
+    population.apply_deltas(np.array([1]), [85], np.array([False]))
+    assert population.raf[1] == pytest.approx(0.386)
+    with pytest.raises(ValueError):
+        population.apply_deltas(np.array([0]), [999], np.array([True]))
+
+
+def test_hcc_summary_counts_paid_hccs_after_hierarchies():
+    model = get_raf_model()
+    matrix = model.matrix([[17, 18], [18, 85], [85], []])
+    population = RiskPopulation(model, matrix, np.full(4, 70), np.ones(4))
+    rows = {r["code"]: r for r in population.hcc_summary()}
+    assert len(rows) == len(model)
+    assert [rows[f"HCC {c}"]["members"] for c in (17, 18, 19, 85)] == [1, 1, 0, 2]
+    assert rows["HCC 85"] == {
+        "code": "HCC 85",
+        "name": HCC_MODEL[85][0],
+        "prevalence": 50.0,
+        "avg_weight": HCC_MODEL[85][1],
+        "members": 2,
+        "revenue_impact": round(2 * HCC_MODEL[85][1] * BASE_RATE_PMPM * 12),
+    }
+    revenue = [r["revenue_impact"] for r in population.hcc_summary()]
+    assert revenue == sorted(revenue, reverse=True)
+    population.apply_deltas(np.array([3]), [19], np.array([True]))
+    assert {r["code"]: r for r in population.hcc_summary()}["HCC 19"]["members"] == 1
+
+
+def test_delta_rejects_bad_rows_and_skips_empty_batches():
+    model = get_raf_model()
+    population = RiskPopulation(model, model.matrix([[], [85]]), np.array([70, 70]), np.ones(2))
+    for rows in ([2], [-1], [0, 5]):
+        with pytest.raises(ValueError):
+            population.apply_deltas(np.array(rows), [85] * len(rows), np.ones(len(rows)))
+    empty = population.apply_deltas(np.array([], dtype=np.int64), [], np.array([], dtype=bool))
+    assert len(empty) == 0
+    assert population.version == 0
+    assert population.raf[1] == pytest.approx(0.386 + HCC_MODEL[85][1])
+
+
+def test_delta_batch_rescores_changed_members_only(monkeypatch):
+    model = get_raf_model()
+    population = RiskPopulation(model, *model.synthetic_population(200_000, seed=9))
+    before = population.raf.copy()
+    rescored = []
+    score_present = model.score_present
+
+    def _counting(present, age, female):
+        rescored.append(len(present))
+        return score_present(present, age, female)
+
+    monkeypatch.setattr(model, "score_present", _counting)
+    rng = np.random.default_rng(1)
+    members = rng.integers(0, 200_000, 1_000)
+    hccs = rng.choice(model.codes, 1_000)
+    changed = population.apply_deltas(members, hccs, np.ones(1_000, dtype=bool))
+    assert rescored == [len(np.unique(members))] == [len(changed)]
+    untouched = np.setdiff1d(np.arange(len(population)), changed)
+    np.testing.assert_array_equal(population.raf[untouched], before[untouched])
+    assert sum(t["count"] for t in population.summary().values()) == 200_000
@@ -0,0 +1,57 @@
+"""
+Unit tests — reactive_timing (debounced reactive calcs)
+No live DB/API calls.
+"""
+
+import asyncio
+import os
+import sys
+
+from shiny import reactive
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+from reactive_timing import debounce  # noqa: E402
+
+
+def test_burst_of_changes_settles_into_one_evaluation():
+    async def run() -> list[int]:
+        source = reactive.Value(0)
+        debounced = debounce(source, 0.1)
+        seen: list[int] = []
+
+        @reactive.effect
+        def _consumer():
+            seen.append(debounced())
+
+        await reactive.flush()
+        for v in range(1, 6):
+            source.set(v)
+            await reactive.flush()
+            await asyncio.sleep(0.02)
+        assert seen == [0]
+        await asyncio.sleep(0.25)
+        await reactive.flush()
+        return seen
+
+    assert asyncio.run(run()) == [0, 5]
+
+
+def test_unchanged_source_never_re_evaluates():
+    async def run() -> list[int]:
+        source = reactive.Value(0)
+        debounced = debounce(source, 0.05)
+        seen: list[int] = []
+
+        @reactive.effect
+        def _consumer():
+            seen.append(debounced())
+
+        await reactive.flush()
+        await asyncio.sleep(0.15)
+        await reactive.flush()
+        return seen
+
+    assert asyncio.run(run()) == [0]
@@ -0,0 +1,65 @@
+"""
+Unit tests — shared_data_cache (process-level dataset cache)
+No live DB/API calls.
+"""
+import os
+import sys
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+from shared_data_cache import GAPS_KEY, SharedDataCache, shared_cache  # noqa: E402
+
+
+def test_get_loads_once_until_invalidated():
+    """Loader runs on first get only; invalidate forces exactly one reload."""
+    cache = SharedDataCache()
+    calls = []
+
+    def _loader():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get("k", _loader) == 1
+    assert cache.get("k", _loader) == 1
+    assert cache.invalidate("k") == 1
+    assert cache.get("k", _loader) == 2
+    assert cache.get("k", _loader) == 2
+    assert cache.stats()["loads"] == 2 and cache.stats()["hits"] == 2
+
+
+def test_keys_are_independent():
+    """Invalidating one dataset leaves the others cached."""
+    cache = SharedDataCache()
+    cache.get("a", lambda: "A1")
+    cache.get("b", lambda: "B1")
+    cache.invalidate("a")
+    assert cache.get("a", lambda: "A2") == "A2"
+    assert cache.get("b", lambda: "B2") == "B1"
+    assert cache.version("b") == 0
+
+
+def test_load_racing_invalidation_is_not_stored():
+    """A write landing mid-load must not leave the pre-write data cached."""
+    cache = SharedDataCache()
+
+    def _loader():
+        cache.invalidate("k")  # another session writes while we read
+        return "stale"
+
+    assert cache.get("k", _loader) == "stale"
+    assert cache.get("k", lambda: "fresh") == "fresh"
+
+
+def test_gap_suppression_change_invalidates_gaps(tmp_path, monkeypatch):
+    """Suppression writes publish a gaps invalidation."""
+    import hedis_gap_trail
+
+    monkeypatch.setattr(hedis_gap_trail, "_SUPPRESSION_FILE", str(tmp_path / "s.json"))
+    hedis_gap_trail._GAP_SUPPRESSIONS_CACHE = None
+    before = shared_cache.version(GAPS_KEY)
+    hedis_gap_trail.add_gap_suppression("GAP-X", "test")
+    assert shared_cache.version(GAPS_KEY) == before + 1
+    hedis_gap_trail.remove_gap_suppression("GAP-X")
+    assert shared_cache.version(GAPS_KEY) == before + 2
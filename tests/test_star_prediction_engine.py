@@ -0,0 +1,217 @@
+"""
+Unit tests — star_prediction_engine (vectorized CMS-style star scoring)
+No live DB/API calls.
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+from star_prediction_engine import (  # noqa: E402
+    SIMULATION_DRAWS,
+    STAR_LEVELS,
+    UNSCORED_LABEL,
+    StarPredictionEngine,
+    forecast_records,
+    get_contract_predictions,
+    get_star_engine,
+    main,
+    measure_stars,
+    round_half_star,
+    score_contracts,
+)
+
+CUTS = np.array([[40.0, 60.0, 70.0, 80.0], [20.0, 30.0, 40.0, 50.0]])
+
+
+def test_measure_stars_cut_point_boundaries():
+    """A rate equal to a cut point earns that star; NaN rates score 0."""
+    rates = np.array([[39.9, 20.0], [60.0, 49.9], [80.0, np.nan]])
+    assert measure_stars(rates, CUTS).tolist() == [[1, 2], [3, 4], [5, 0]]
+
+
+def test_summary_weights_missing_measures_and_rounding():
+    engine = StarPredictionEngine(["A", "B"], np.array([3.0, 1.0]), CUTS)
+    out = engine.score(np.array([[80.0, 20.0], [np.nan, 45.0], [np.nan, np.nan]]))
+    assert np.allclose(out["summary_score"][:2], [(5 * 3 + 2) / 4, 4.0])
+    assert np.isnan(out["summary_score"][2])
+    assert out["predicted_stars"][:2].tolist() == [4.5, 4.0]
+    assert round_half_star(np.array([3.24, 3.25, 3.74, 3.75, 0.2])).tolist() == [
+        3.0,
+        3.5,
+        3.5,
+        4.0,
+        1.0,
+    ]
+
+
+def test_batch_matches_row_by_row_and_is_deterministic():
+    engine = get_star_engine()
+    rng = np.random.default_rng(7)
+    rates = rng.uniform(20, 95, (5_000, len(engine.codes)))
+    batch = engine.score(rates)["predicted_stars"]
+    single = np.array([engine.score(r[None, :])["predicted_stars"][0] for r in rates[:200]])
+    assert np.array_equal(batch[:200], single)
+    assert np.array_equal(batch, engine.score(rates)["predicted_stars"])
+
+
+def test_contract_predictions_stable_across_processes():
+    """No hash()-seeded randomness: a fresh interpreter with another hash seed agrees."""
+    ours = {k: v["predicted_stars"] for k, v in get_contract_predictions().items()}
+    code = (
+        "from star_prediction_engine import get_contract_predictions as g;"
+        "print({k: v['predicted_stars'] for k, v in g().items()})"
+    )
+    env = {**os.environ, "PYTHONHASHSEED": "12345", "PYTHONPATH": os.path.abspath(app_path)}
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+    assert out.stdout.strip() == str(ours)
+    assert set(ours) == {"H1234", "H5678", "H9012", "H3456", "H7890"}
+
+
+def test_simulation_interval_and_level_probabilities():
+    engine = get_star_engine()
+    c = get_contract_predictions()["H9012"]
+    rates = np.array([[c["rates"][code] for code in engine.codes], [np.nan] * len(engine.codes)])
+    sim = engine.simulate(rates, rng=np.random.default_rng(3))
+    assert sim["ci_low"][0] <= c["predicted_stars"] <= sim["ci_high"][0]
+    assert sim["ci_low"][0] in STAR_LEVELS and sim["ci_high"][0] in STAR_LEVELS
+    p = sim["p_at_least"][0]
+    assert p[0] == 1.0
+    assert np.all(np.diff(p) <= 0)
+    # A contract with no scored measures has no interval and reaches no level
+    assert np.isnan(sim["ci_low"][1]) and not sim["p_at_least"][1].any()
+    again = engine.simulate(rates, rng=np.random.default_rng(3))
+    assert np.array_equal(p, again["p_at_least"][0])
+
+
+def test_simulation_draws_in_one_vectorized_batch():
+    """All draws for one contract come from a single (1 × draws × measures) normal sample."""
+    engine = get_star_engine()
+    c = get_contract_predictions()["H1234"]
+    rates = np.array([[c["rates"][code] for code in engine.codes]])
+
+    class CountingRng:
+        def __init__(self):
+            self.rng = np.random.default_rng(0)
+            self.shapes = []
+
+        def standard_normal(self, size):
+            self.shapes.append(size)
+            return self.rng.standard_normal(size)
+
+    rng = CountingRng()
+    sim = engine.simulate(rates, SIMULATION_DRAWS, rng)
+    assert rng.shapes == [(1, SIMULATION_DRAWS, len(engine.codes))]
+    again = engine.simulate(rates, SIMULATION_DRAWS, np.random.default_rng(0))
+    assert np.array_equal(sim["p_at_least"], again["p_at_least"])
+
+
+def _contract_table(n: int, seed: int = 0) -> pd.DataFrame:
+    codes = get_star_engine().codes
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "contract_id": [f"H{i:05d}" for i in range(n)],
+            "name": "Plan",
+            "state": "PA",
+            "members": rng.integers(1_000, 100_000, n),
+            "current_stars": rng.choice([3.0, 3.5, 4.0, 4.5], n),
+        }
+    )
+    for code in codes:
+        df[code] = rng.uniform(20, 95, n).round(1)
+    return df
+
+
+def test_score_contracts_batch_columns_and_bonus():
+    contracts = _contract_table(5_000)
+    scored = score_contracts(contracts, draws=200)
+    assert len(scored) == 5_000
+    engine = get_star_engine()
+    expected = engine.score(engine.rate_matrix(contracts))["predicted_stars"]
+    assert np.array_equal(scored["predicted_stars"].to_numpy(), expected)
+    assert (scored["ci_low"] <= scored["predicted_stars"]).all()
+    assert (scored["ci_high"] >= scored["predicted_stars"]).all()
+    assert (scored["bonus_revenue"] == scored["members"] * scored["bonus_per_member"]).all()
+    h9012 = get_contract_predictions()["H9012"]
+    assert h9012["bonus_per_member"] == 100
+    assert h9012["bonus_revenue"] == h9012["members"] * 100
+
+
+def test_unscored_contract_has_no_rating_or_bonus():
+    """A contract with every rate missing is masked, not rated 'nan★' with a bonus."""
+    contracts = _contract_table(3)
+    codes = list(get_star_engine().codes)
+    contracts.loc[1, codes] = np.nan
+    with np.errstate(all="raise"):
+        scored = score_contracts(contracts, draws=100)
+    unscored = scored.iloc[1]
+    assert np.isnan(unscored["predicted_stars"]) and np.isnan(unscored["ci_low"])
+    assert unscored["star_label"] == UNSCORED_LABEL
+    assert unscored["bonus_per_member"] == 0 and unscored["bonus_revenue"] == 0
+    assert unscored["measures_scored"] == 0 and unscored["top_gap_measure"] == ""
+    assert scored["predicted_stars"].notna().sum() == 2
+    records = forecast_records(scored, 2026)
+    assert [r["contract_id"] for r in records] == scored["contract_id"].iloc[[0, 2]].tolist()
+    assert all("nan" not in r["claude_narrative"] for r in records)
+
+
+def test_cli_writes_scored_csv(tmp_path):
+    src = tmp_path / "contracts.csv"
+    out = tmp_path / "scored.csv"
+    _contract_table(50).to_csv(src, index=False)
+    assert main([str(src), "-o", str(out), "--draws", "500"]) == 0
+    scored = pd.read_csv(out)
+    assert len(scored) == 50
+    assert {"predicted_stars", "ci_low", "ci_high", "bonus_revenue"} <= set(scored.columns)
+
+
+def test_cache_forecasts_one_stale_update_and_one_append():
+    """Batch results go to the forecast cache in two Sheets calls, however many contracts."""
+    import star_rating_cache
+
+    class _Sheet:
+        def __init__(self):
+            self.batches = []
+            self.appends = []
+
+        def get_all_records(self):
+            return [
+                {"contract_id": "H00001", "cache_status": "FRESH"},
+                {"contract_id": "H99999", "cache_status": "FRESH"},
+                {"contract_id": "H00002", "cache_status": "STALE"},
+            ]
+
+        def batch_update(self, updates):
+            self.batches.append(updates)
+
+        def append_rows(self, rows):
+            self.appends.append(rows)
+
+    class _DB:
+        connected = True
+        sheet = _Sheet()
+        cache_count = 0
+        last_cached_at = None
+
+    db = _DB()
+    records = forecast_records(score_contracts(_contract_table(300), draws=100), 2026)
+    r = star_rating_cache.cache_forecasts(db, records)
+    assert r["success"] is True
+    assert r["cached"] == 300
+    assert r["marked_stale"] == 1
+    assert db.sheet.batches == [[{"range": "R2", "values": [["STALE"]]}]]
+    assert len(db.sheet.appends) == 1
+    rows = db.sheet.appends[0]
+    assert len(rows) == 300
+    assert len(rows[0]) == len(star_rating_cache.FORECAST_COLUMNS)
+    assert len({row[0] for row in rows}) == 300
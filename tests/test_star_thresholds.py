@@ -0,0 +1,61 @@
+"""
+Unit tests — star_thresholds (star level lookup table)
+No live DB/API calls.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+app_path = os.path.join(os.path.dirname(__file__), "..", "Artifacts", "app")
+if app_path not in sys.path:
+    sys.path.insert(0, app_path)
+
+import star_thresholds  # noqa: E402
+from star_thresholds import (  # noqa: E402
+    STAR_THRESHOLDS,
+    UNRATED,
+    bonus_per_member,
+    label_ratings,
+    star_label,
+)
+
+
+def _reference_label(rating: float) -> tuple:
+    for threshold, info in sorted(STAR_THRESHOLDS.items(), reverse=True):
+        if rating >= threshold:
+            return info[:3]
+    return UNRATED[:3]
+
+
+def test_scalar_and_array_lookup_agree_with_threshold_scan():
+    ratings = np.array([-1.0, 0.0, 2.9, 3.0, 3.49, 3.5, 4.0, 4.25, 4.5, 4.99, 5.0, np.nan])
+    labels = label_ratings(ratings)
+    for i, r in enumerate(ratings):
+        expected = _reference_label(r)
+        assert star_label(r) == expected
+        assert (labels["stars"][i], labels["color"][i], labels["label"][i]) == expected
+
+
+def test_bonus_per_member_by_level():
+    ratings = np.array([5.0, 4.5, 4.0, 3.5, 3.0, 2.5, np.nan])
+    assert bonus_per_member(ratings).tolist() == [150, 125, 100, 75, 50, 25, 25]
+
+
+def test_labels_rows_in_one_array_pass(monkeypatch):
+    """label_ratings indexes the table arrays; it never falls back to per-row star_label."""
+    ratings = np.random.default_rng(0).choice(np.arange(1.0, 5.01, 0.5), 10_000)
+    expected = {r: _reference_label(r) for r in np.unique(ratings)}
+
+    def _per_row(rating):
+        raise AssertionError("per-row lookup")
+
+    monkeypatch.setattr(star_thresholds, "star_label", _per_row)
+    labels = label_ratings(ratings)
+    assert all(isinstance(col, np.ndarray) and len(col) == 10_000 for col in labels.values())
+    for r, (stars, color, label) in expected.items():
+        rows = ratings == r
+        assert set(labels["stars"][rows]) == {stars}
+        assert set(labels["color"][rows]) == {color}
+        assert set(labels["label"][rows]) == {label}